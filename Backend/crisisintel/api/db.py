@@ -13,6 +13,22 @@ Design notes:
         - None when the statement produced no result set (e.g. UPDATE w/o RETURNING)
     * `execute` is for INSERT / UPDATE / DELETE where returned rows are not needed;
       it returns the DB driver's `lastrowid` (useful after INSERT with auto PK).
+    * `execute_rowcount` is the same but returns the matched/affected row count, for
+      conditional UPDATE/DELETE statements whose WHERE clause carries the business rule.
+    * `execute_many` runs one INSERT for a sequence of parameter rows; mysqlclient
+      rewrites `INSERT ... VALUES (...)` into a single multi-row statement.
+    * `query(..., using=READ_ALIAS)` runs a read on the optional 'replica' database
+      (settings: CRISISINTEL_DB_REPLICA_HOST); without one it is the default DB.
+      Only use it for list/browse reads that tolerate replication lag.
+    * No server-side prepared statements: mysqlclient binds %s parameters on the
+      client and sends one text query. Emulating PREPARE via SQL (SET @p..; EXECUTE)
+      would add round trips per call, which costs more than the parse it saves on
+      the short single-row INSERT/UPDATE statements used here.
+    * Connection reuse comes from Django's persistent connections (CONN_MAX_AGE,
+      CONN_HEALTH_CHECKS in settings): each worker thread keeps its MySQL session
+      warm across requests, which is the pool for a thread-per-request server. An
+      external pool (Django's built-in one is PostgreSQL-only) would add a dependency
+      without removing any handshake that persistent connections do not already skip.
 
 Edge cases / cautions:
     * If you expect possibly zero or more rows, call with `many=True` to avoid
@@ -21,11 +37,15 @@ Edge cases / cautions:
     * Always validate untrusted user input before forming dynamic SQL fragments.
 """
 
-from django.db import connection
+from django.conf import settings
+from django.db import connection, connections
 from typing import Any, Iterable, List, Dict, Union, Optional
 
+# Alias for lag-tolerant reads: the replica when one is configured, else the primary.
+READ_ALIAS = 'replica' if 'replica' in settings.DATABASES else 'default'
 
-def query(sql: str, params: Optional[Iterable[Any]] = None, many: bool = False) -> Union[Dict[str, Any], List[Dict[str, Any]], None]:
+
+def query(sql: str, params: Optional[Iterable[Any]] = None, many: bool = False, using: Optional[str] = None) -> Union[Dict[str, Any], List[Dict[str, Any]], None]:
     """Execute a SELECT (or any statement returning rows) and shape rows as dicts.
 
     Args:
@@ -33,13 +53,15 @@ def query(sql: str, params: Optional[Iterable[Any]] = None, many: bool = False)
         params: Iterable of parameter values (None => empty list).
         many: If True, always return a list; if False and exactly one row was
               returned, return that single row dict directly.
+        using: Database alias to run on (None => default connection).
 
     Returns:
         dict: Single row (when one row AND many=False)
         list[dict]: List of row dicts (many=True OR result size != 1)
         None: When the executed statement produced no cursor.description (e.g. DDL)
     """
-    with connection.cursor() as cur:
+    conn = connections[using] if using else connection
+    with conn.cursor() as cur:
         cur.execute(sql, params or [])
         if cur.description:  # Cursor has a result set
             rows = cur.fetchall()
@@ -66,3 +88,28 @@ def execute(sql: str, params: Optional[Iterable[Any]] = None) -> int:
     with connection.cursor() as cur:
         cur.execute(sql, params or [])
         return cur.lastrowid
+
+
+def execute_rowcount(sql: str, params: Optional[Iterable[Any]] = None) -> int:
+    """Execute a data-modifying statement and return the driver's rowcount.
+
+    Django's MySQL backend connects with CLIENT.FOUND_ROWS, so for UPDATE this is
+    the number of rows matched by the WHERE clause (even if values were unchanged).
+    """
+    with connection.cursor() as cur:
+        cur.execute(sql, params or [])
+        return cur.rowcount
+
+
+def execute_many(sql: str, seq_params: Iterable[Iterable[Any]]) -> int:
+    """Execute one statement for each parameter row (batched by the driver for INSERT).
+
+    Returns:
+        int: Total affected row count reported by the driver.
+    """
+    seq_params = list(seq_params)
+    if not seq_params:
+        return 0
+    with connection.cursor() as cur:
+        cur.executemany(sql, seq_params)
+        return cur.rowcount
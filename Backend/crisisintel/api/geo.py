@@ -0,0 +1,62 @@
+"""Great-circle (haversine) helpers shared by the proximity features.
+
+Fire dispatch, nearby users/crises and the crisis proximity notify all compare one
+query point against many stored coordinates. These helpers keep that math in one place.
+
+Design notes:
+    * Points are converted once to (lat_rad, lng_rad, cos_lat) with `to_point`, so a
+      comparison against a fixed query point costs two sin() calls per candidate.
+    * Ranking and radius tests use the haversine term h = sin²(Δlat/2) +
+      cos(lat1)·cos(lat2)·sin²(Δlng/2), which is monotonic in distance. `h_to_km`
+      (asin + sqrt) only runs for rows that are actually reported.
+    * The SQL counterparts (`_haversine_h_sql` / `_haversine_sql` in views) use the same
+      formula and Earth radius.
+"""
+import math
+
+EARTH_RADIUS_KM = 6371.0
+
+
+def to_point(lat, lng):
+    """Return (lat_rad, lng_rad, cos_lat) for a coordinate given in degrees."""
+    lat_r = math.radians(float(lat))
+    return lat_r, math.radians(float(lng)), math.cos(lat_r)
+
+
+def haversine_h(a, b):
+    """Haversine term h between two `to_point` tuples."""
+    return (math.sin((b[0] - a[0]) / 2) ** 2
+            + a[2] * b[2] * math.sin((b[1] - a[1]) / 2) ** 2)
+
+
+def h_to_km(h):
+    """Great-circle distance in km for a haversine term h (clamped into asin's domain)."""
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(h)))
+
+
+def radius_h(radius_km):
+    """The h value at distance radius_km: a point is within the radius iff h <= radius_h."""
+    return math.sin(radius_km / (2 * EARTH_RADIUS_KM)) ** 2
+
+
+def haversine_km(a_lat, a_lng, b_lat, b_lng):
+    """Great-circle distance in km between two coordinates given in degrees."""
+    return h_to_km(haversine_h(to_point(a_lat, a_lng), to_point(b_lat, b_lng)))
+
+
+def nearest(lat, lng, points, exclude=()):
+    """Return (key, distance_km) of the point closest to (lat, lng), or (None, None).
+
+    `points` yields (key, lat_rad, lng_rad, cos_lat) tuples; keys in `exclude` are
+    skipped. One pass comparing h terms; asin runs once, for the winner.
+    """
+    lat_r, lng_r, cos_lat = to_point(lat, lng)
+    sin = math.sin
+    best = None; best_h = 2.0
+    for key, p_lat, p_lng, p_cos in points:
+        h = sin((p_lat - lat_r) / 2) ** 2 + cos_lat * p_cos * sin((p_lng - lng_r) / 2) ** 2
+        if h < best_h and key not in exclude:
+            best_h = h; best = key
+    if best is None:
+        return None, None
+    return best, h_to_km(best_h)
@@ -21,6 +21,8 @@ Rate Limiting (lightweight, in-memory):
 Audit Logging & Notifications:
         - Writes lightweight audit log rows for requests (best-effort / fire-and-forget).
         - Inserts notifications and pushes them over Channels groups to connected clients.
+        - `_notify_async` hands that work to a small thread pool so handlers don't wait on it;
+            `_notify_many` writes a batch of notifications with one INSERT.
 
 Push Optimizations:
         - `_push` debounces high-frequency event types (example: "dm_unread_total") so the
@@ -34,7 +36,7 @@ Guiding Principles:
 
 from django.http import JsonResponse, HttpRequest
 from django.views.decorators.csrf import csrf_exempt
-from functools import wraps, partial
+from functools import wraps, partial, lru_cache
 from django.utils import timezone
 from django.conf import settings
 from asgiref.sync import async_to_sync
@@ -42,9 +44,10 @@ from channels.layers import get_channel_layer
 import json, secrets, base64, hmac, time, os
 from hashlib import pbkdf2_hmac
 from collections import defaultdict, deque
-from .db import query, execute
+from .db import query, execute, execute_many
 from math import ceil
-from django.db import connection as _conn
+from concurrent.futures import ThreadPoolExecutor
+from django.db import connection as _conn, close_old_connections
 
 
 def _now_expr():
@@ -96,6 +99,12 @@ def _rate_limited(key: str, limit: int, window_seconds: int):
     return False, None
 
 
+@lru_cache(maxsize=64)
+def _in_placeholders(n: int) -> str:
+    """Return the '%s,%s,...' placeholder list for an IN (...) clause of n values."""
+    return ','.join(['%s'] * n)
+
+
 def _limit_str(val: str, max_len: int):
     """Return truncated string (or empty string if not a str)."""
     if not isinstance(val, str):
@@ -191,17 +200,114 @@ def _audit_safe(request, user_id, meta):
         pass
 
 
+# Circuit breaker for the channel layer: after _PUSH_FAIL_LIMIT consecutive failed
+# group_sends, real-time pushes are skipped for _PUSH_COOLDOWN seconds so an unreachable
+# channel backend doesn't add its connect timeout (and a traceback) to every request.
+_PUSH_FAIL_LIMIT = 10
+_PUSH_COOLDOWN = 60.0
+_push_fails = 0
+_push_open_until = 0.0
+
+
+def _group_send(user_id: int, data: dict):
+    """Send `data` to the user's notification group unless the breaker is open. Never raises."""
+    global _push_fails, _push_open_until
+    if _push_open_until and time.monotonic() < _push_open_until:
+        return
+    try:
+        async_to_sync(get_channel_layer().group_send)(f"notif_{user_id}", {'type': 'notify', 'data': data})
+    except Exception:
+        _push_fails += 1
+        if _push_fails >= _PUSH_FAIL_LIMIT:
+            _push_open_until = time.monotonic() + _PUSH_COOLDOWN
+            _push_fails = 0
+        return
+    _push_fails = 0
+
+
 def _notify(user_id: int, ntype: str, payload: dict):
     """Persist notification then push real-time event to user group (best-effort)."""
     try:
         execute("INSERT INTO notifications(user_id,type,payload) VALUES(%s,%s,%s)",[user_id, ntype, json.dumps(payload)])
-        channel_layer = get_channel_layer()
-        async_to_sync(channel_layer.group_send)(f"notif_{user_id}", {'type': 'notify','data': {'type': ntype, 'payload': payload}})
     except Exception:
         return
+    _group_send(user_id, {'type': ntype, 'payload': payload})
+
+
+def _notify_many(items):
+    """Persist several notifications with one multi-row INSERT, then push each (best-effort).
+
+    `items` is an iterable of (user_id, ntype, payload) tuples. Items sharing one payload
+    object (a fan-out to several users) have it JSON-encoded once.
+    """
+    items = [(uid, ntype, payload) for uid, ntype, payload in items]
+    if not items:
+        return
+    encoded = {}
+    rows = []
+    for uid, ntype, payload in items:
+        js = encoded.get(id(payload))
+        if js is None:
+            js = encoded[id(payload)] = json.dumps(payload)
+        rows.append((uid, ntype, js))
+    try:
+        execute_many(
+            "INSERT INTO notifications(user_id,type,payload) VALUES(%s,%s,%s)",
+            rows
+        )
+    except Exception:
+        return
+    for uid, ntype, payload in items:
+        _group_send(uid, {'type': ntype, 'payload': payload})
+
+
+_NOTIFY_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix='notify')
+
+
+def _background_worker(fn, args):
+    """Run `fn(*args)` on an executor thread and release that thread's DB connection."""
+    try:
+        fn(*args)
+    except Exception:
+        pass
+    finally:
+        close_old_connections()
+
+
+def _run_in_background(fn, *args):
+    """Queue `fn(*args)` on the notification executor so the handler can return.
+
+    For side work whose result the response does not depend on (notification
+    fan-out). Runs inline when settings.NOTIFY_ASYNC is False (e.g. when debugging)
+    or the executor refuses work (interpreter shutdown). Never raises.
+    """
+    if getattr(settings, 'NOTIFY_ASYNC', True):
+        try:
+            _NOTIFY_EXECUTOR.submit(_background_worker, fn, args)
+            return
+        except Exception:
+            pass
+    try:
+        fn(*args)
+    except Exception:
+        pass
+
+
+def _notify_async(user_id: int, ntype: str, payload: dict):
+    """Queue a notification on the background executor (see `_run_in_background`)."""
+    _run_in_background(_notify, user_id, ntype, payload)
+
+_NOTIFICATIONS_TABLE_READY = False
+
 
 def _ensure_notifications_table():
-    """Create notifications table if missing (MySQL/SQLite tolerant)."""
+    """Create notifications table if missing (MySQL/SQLite tolerant).
+
+    Runs the DDL once per process; later calls return immediately.
+    """
+    global _NOTIFICATIONS_TABLE_READY
+    if _NOTIFICATIONS_TABLE_READY:
+        return
     try:
         # Try MySQL DDL first
         execute(
@@ -220,6 +326,7 @@ def _ensure_notifications_table():
             ) ENGINE=InnoDB
             """
         )
+        _NOTIFICATIONS_TABLE_READY = True
     except Exception:
         # SQLite fallback
         try:
@@ -236,6 +343,7 @@ def _ensure_notifications_table():
                 )
                 """
             )
+            _NOTIFICATIONS_TABLE_READY = True
         except Exception:
             pass
 
@@ -253,10 +361,9 @@ def _push(user_id: int, data: dict):
             if now - last < 1.0:
                 return
             _PUSH_LAST[key] = now
-        channel_layer = get_channel_layer()
-        async_to_sync(channel_layer.group_send)(f"notif_{user_id}", {'type':'notify','data': data})
     except Exception:
-        pass
+        return
+    _group_send(user_id, data)
 
 
 def api_view(view_fn=None, *, require_auth=False, csrf=True, methods=None, auth_methods=None):
@@ -374,8 +481,8 @@ def paginate(request: HttpRequest, base_sql: str, params: list, *, count_sql: st
 
 
 __all__ = [
-    'api_view','_rate_limited','_limit_str','_hash_password','_verify_password','_require_method','_auth_user','_check_csrf',
-    '_audit','_audit_safe','_notify','_push','_public_user_fields','paginate','timezone','settings','query','execute'
+    'api_view','_rate_limited','_limit_str','_in_placeholders','_hash_password','_verify_password','_require_method','_auth_user','_check_csrf',
+    '_audit','_audit_safe','_notify','_notify_many','_notify_async','_run_in_background','_push','_public_user_fields','paginate','timezone','settings','query','execute'
 ]
 
 
@@ -481,3 +588,92 @@ def validate_password_minimal(pw: str):
     return True, None
 
 __all__.extend(['api_error','validate_password_minimal'])
+
+# ---------------------- Fast JSON Encode/Decode (orjson when installed) ----------------------
+from django.http import HttpResponse as _HttpResponse, StreamingHttpResponse as _StreamingHttpResponse
+from django.core.serializers.json import DjangoJSONEncoder as _DjangoJSONEncoder
+try:
+    import orjson as _orjson
+except Exception:  # pragma: no cover - optional dependency
+    _orjson = None
+
+_DJANGO_ENCODER = _DjangoJSONEncoder()
+
+
+def _loads(raw):
+    """Decode a JSON document (bytes or str) using orjson when available."""
+    if _orjson is not None:
+        return _orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _dumps(obj) -> bytes:
+    """Encode to UTF-8 JSON bytes; types orjson lacks (Decimal, ...) go through DjangoJSONEncoder."""
+    if _orjson is not None:
+        return _orjson.dumps(obj, default=_DJANGO_ENCODER.default, option=_orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, cls=_DjangoJSONEncoder).encode()
+
+
+class FastJsonResponse(_HttpResponse):
+    """Drop-in for JsonResponse (same data/status/safe arguments) serialized via `_dumps`."""
+
+    def __init__(self, data, safe=True, **kwargs):
+        if safe and not isinstance(data, dict):
+            raise TypeError('In order to allow non-dict objects to be serialized set the safe parameter to False.')
+        kwargs.setdefault('content_type', 'application/json')
+        super().__init__(content=_dumps(data), **kwargs)
+
+def _stream_results(rows, batch: int = 50):
+    """Yield `{"results": [...]}` as JSON bytes, encoding `batch` rows per chunk."""
+    yield b'{"results":['
+    for i in range(0, len(rows), batch):
+        chunk = b','.join(_dumps(r) for r in rows[i:i + batch])
+        yield (b',' + chunk) if i else chunk
+    yield b']}'
+
+
+class StreamingResultsResponse(_StreamingHttpResponse):
+    """`{"results": rows}` encoded chunk by chunk as it is written, not as one large body."""
+
+    def __init__(self, rows, **kwargs):
+        kwargs.setdefault('content_type', 'application/json')
+        super().__init__(_stream_results(rows), **kwargs)
+
+__all__.extend(['_loads','_dumps','FastJsonResponse','StreamingResultsResponse'])
+
+# ---------------------- Bounded in-process LRU (thread-safe) ----------------------
+import threading as _threading
+from collections import OrderedDict as _OrderedDict
+
+
+class LRUCache:
+    """Small lock-guarded LRU map for process-local lookups that rarely go stale.
+
+    `get` returns None on a miss, so callers only store non-None values. The lock keeps a
+    recency bump in one thread from racing another thread's eviction.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data = _OrderedDict()
+        self._lock = _threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key):
+        with self._lock:
+            return self._data.pop(key, None)
+
+__all__.append('LRUCache')
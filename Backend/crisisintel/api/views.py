@@ -6,15 +6,23 @@ validate input, compose SQL, and shape JSON responses manually—matching the
 inputs, and notable behaviors.
 """
 
-from django.http import JsonResponse, HttpRequest
+from django.http import JsonResponse, HttpRequest, HttpResponse
+from django.db import transaction
 from django.db.utils import IntegrityError as DBIntegrityError
 import json
-from .db import query, execute
-from .utils import api_view, _limit_str, _hash_password, _verify_password, _require_method, _public_user_fields, _notify, api_error, validate_password_minimal
+from .db import query, execute, execute_rowcount, execute_many, READ_ALIAS
+from . import geo
+from .utils import api_view, _limit_str, _in_placeholders, _hash_password, _verify_password, _require_method, _public_user_fields, _notify, _notify_many, _notify_async, _run_in_background, api_error, validate_password_minimal, _loads, _dumps, FastJsonResponse, StreamingResultsResponse, LRUCache
 from django.conf import settings
 import os, uuid
 import time
+import math
 import re
+import threading
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from datetime import datetime, timedelta
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
 
 try:
     import requests as _req
@@ -2072,7 +2080,7 @@ def list_user_activity(request: HttpRequest, user_id: int, _user=None):
             dept_ids.append(dept_id)
         dept_ids.extend([d for d in staff_depts if d not in dept_ids])
         if dept_ids:
-            placeholders = ','.join(['%s'] * len(dept_ids))
+            placeholders = _in_placeholders(len(dept_ids))
             frs = query(
                 f"SELECT id, description, status, created_at, assigned_department_id FROM fire_service_requests WHERE assigned_department_id IN ({placeholders})",
                 dept_ids, many=True
@@ -2668,6 +2676,12 @@ def decline_cancel_appointment(request: HttpRequest, appointment_id: int, _user=
 
 # ============================= PHASE 2: BLOOD REQUESTS ==========================
 
+VALID_BLOOD_TYPES = frozenset(('A+','A-','B+','B-','O+','O-','AB+','AB-'))
+
+def _norm_bt(v) -> str:
+    """Normalize a blood type from user input ('' when absent) for VALID_BLOOD_TYPES checks."""
+    return v.strip().upper() if v else ''
+
 def _is_hospital(user):
     return user and user.get('role') == 'hospital'
 
@@ -2683,16 +2697,16 @@ def create_blood_request(request: HttpRequest, _user=None):
     Body: { blood_type, quantity_units?, needed_by?, notes? }
     """
     if not _is_hospital(_user):
-        return JsonResponse({'error':'forbidden'}, status=403)
-    data = json.loads(request.body or '{}')
-    bt = (data.get('blood_type') or '').upper().strip()
+        return FastJsonResponse({'error':'forbidden'}, status=403)
+    data = _loads(request.body) if request.body else {}
+    bt = _norm_bt(data.get('blood_type'))
     qty = int(data.get('quantity_units') or 1)
     needed_by = data.get('needed_by')
     notes = data.get('notes')
-    if bt not in ('A+','A-','B+','B-','O+','O-','AB+','AB-'):
-        return JsonResponse({'error':'invalid_blood_type'}, status=400)
+    if bt not in VALID_BLOOD_TYPES:
+        return FastJsonResponse({'error':'invalid_blood_type'}, status=400)
     rid = execute("INSERT INTO blood_requests(hospital_user_id,blood_type,quantity_units,needed_by,notes) VALUES(%s,%s,%s,%s,%s)", [_user['id'], bt, qty, needed_by, notes])
-    return JsonResponse({'id': rid})
+    return FastJsonResponse({'id': rid})
 
 @api_view(methods=['GET'], csrf=False)
 def list_blood_requests(request: HttpRequest, _user=None):
@@ -2713,57 +2727,55 @@ def list_blood_requests(request: HttpRequest, _user=None):
         sql += ' WHERE ' + ' AND '.join(where)
     sql += ' ORDER BY created_at DESC LIMIT 200'
     rows = query(sql, params, many=True) or []
-    return JsonResponse({'results': rows})
+    return FastJsonResponse({'results': rows})
 
 @api_view(methods=['GET'], csrf=False)
 def get_blood_request(request: HttpRequest, request_id: int, _user=None):
     row = query("SELECT * FROM blood_requests WHERE id=%s", [request_id])
     if not row:
-        return JsonResponse({'error':'not_found'}, status=404)
-    return JsonResponse(row)
+        return FastJsonResponse({'error':'not_found'}, status=404)
+    return FastJsonResponse(row)
 
 @api_view(require_auth=True, methods=['PUT'], csrf=False)
 def update_blood_request(request: HttpRequest, request_id: int, _user=None):
     """Hospital owner can update open request fields."""
     br = query("SELECT * FROM blood_requests WHERE id=%s", [request_id])
     if not br:
-        return JsonResponse({'error':'not_found'}, status=404)
+        return FastJsonResponse({'error':'not_found'}, status=404)
     if br['hospital_user_id'] != _user['id']:
-        return JsonResponse({'error':'forbidden'}, status=403)
-    data = json.loads(request.body or '{}')
+        return FastJsonResponse({'error':'forbidden'}, status=403)
+    data = _loads(request.body) if request.body else {}
     notes = data.get('notes', br.get('notes'))
     qty = int(data.get('quantity_units') or br.get('quantity_units'))
     needed_by = data.get('needed_by', br.get('needed_by'))
     status_val = data.get('status', br.get('status'))
     execute("UPDATE blood_requests SET notes=%s, quantity_units=%s, needed_by=%s, status=%s WHERE id=%s", [notes, qty, needed_by, status_val, request_id])
-    return JsonResponse({'ok': True})
+    return FastJsonResponse({'ok': True})
 
 @api_view(require_auth=True, methods=['POST'], csrf=False)
 def change_blood_request_status(request: HttpRequest, request_id: int, _user=None):
     """Hospital sets status: fulfilled|cancelled|open."""
     br = query("SELECT * FROM blood_requests WHERE id=%s", [request_id])
     if not br:
-        return JsonResponse({'error':'not_found'}, status=404)
+        return FastJsonResponse({'error':'not_found'}, status=404)
     if br['hospital_user_id'] != _user['id']:
-        return JsonResponse({'error':'forbidden'}, status=403)
-    data = json.loads(request.body or '{}')
+        return FastJsonResponse({'error':'forbidden'}, status=403)
+    data = _loads(request.body) if request.body else {}
     status_val = data.get('status')
     if status_val not in ('open','fulfilled','cancelled'):
-        return JsonResponse({'error':'invalid_status'}, status=400)
+        return FastJsonResponse({'error':'invalid_status'}, status=400)
     execute("UPDATE blood_requests SET status=%s WHERE id=%s", [status_val, request_id])
-    return JsonResponse({'ok': True})
+    return FastJsonResponse({'ok': True})
 
 # ============================= BLOOD BANK ORG MGMT ============================
 
-def _ensure_blood_bank_tables():
-    # No-op: schema is managed by final_normalized_schema.sql
-    return None
+# Blood bank tables (donors, staff, inventory, issuances, requests) are created by
+# final_normalized_schema.sql; handlers no longer call a per-request ensure hook.
 
 @api_view(require_auth=True, methods=['GET'], csrf=False)
 def blood_bank_donors_list(request: HttpRequest, _user=None):
     if not _require_blood_bank(_user) and not _require_admin(_user):
-        return JsonResponse({'error':'forbidden'}, status=403)
-    _ensure_blood_bank_tables()
+        return FastJsonResponse({'error':'forbidden'}, status=403)
     rows = query(
         """
         SELECT d.id, d.user_id, d.blood_type, d.notes,
@@ -2775,12 +2787,11 @@ def blood_bank_donors_list(request: HttpRequest, _user=None):
         """,
         [_user['id']], many=True
     ) or []
-    return JsonResponse({'results': rows})
+    return FastJsonResponse({'results': rows})
 
 @api_view(methods=['GET'], csrf=False)
 def blood_bank_donors_of(request: HttpRequest, bank_user_id: int, _user=None):
     """Public: list donors linked to a bank (safe fields only)."""
-    _ensure_blood_bank_tables()
     rows = query(
         """
         SELECT d.id, d.user_id, d.blood_type,
@@ -2792,151 +2803,146 @@ def blood_bank_donors_of(request: HttpRequest, bank_user_id: int, _user=None):
         """,
         [bank_user_id], many=True
     ) or []
-    return JsonResponse({'results': rows})
+    return FastJsonResponse({'results': rows})
 
 @api_view(require_auth=True, methods=['POST'], csrf=False)
 def blood_bank_donors_add(request: HttpRequest, _user=None):
     if not _require_blood_bank(_user) and not _require_admin(_user):
-        return JsonResponse({'error':'forbidden'}, status=403)
-    _ensure_blood_bank_tables()
-    data = json.loads(request.body or '{}')
+        return FastJsonResponse({'error':'forbidden'}, status=403)
+    data = _loads(request.body) if request.body else {}
     user_id = int(data.get('user_id') or 0)
-    bt = (data.get('blood_type') or '').upper().strip()
+    bt = _norm_bt(data.get('blood_type'))
     notes = data.get('notes')
-    if bt not in ('A+','A-','B+','B-','O+','O-','AB+','AB-'):
-        return JsonResponse({'error':'invalid_blood_type'}, status=400)
+    if bt not in VALID_BLOOD_TYPES:
+        return FastJsonResponse({'error':'invalid_blood_type'}, status=400)
     # Ensure target user exists
     u = query("SELECT id FROM users WHERE id=%s", [user_id])
     if not u:
-        return JsonResponse({'error':'user_not_found'}, status=404)
+        return FastJsonResponse({'error':'user_not_found'}, status=404)
     try:
         did = execute("INSERT INTO blood_bank_donors(bank_user_id,user_id,blood_type,notes) VALUES(%s,%s,%s,%s)", [_user['id'], user_id, bt, notes])
-        return JsonResponse({'id': did})
+        return FastJsonResponse({'id': did})
     except Exception as e:
         # handle duplicates gracefully
         existing = query("SELECT id FROM blood_bank_donors WHERE bank_user_id=%s AND user_id=%s", [_user['id'], user_id])
         if existing:
-            return JsonResponse({'id': existing['id'], 'ok': True, 'detail':'already_added'})
-        return JsonResponse({'error':'db_error', 'detail': str(e)}, status=500)
+            return FastJsonResponse({'id': existing['id'], 'ok': True, 'detail':'already_added'})
+        return FastJsonResponse({'error':'db_error', 'detail': str(e)}, status=500)
 
 @api_view(require_auth=True, methods=['POST'], csrf=False)
 def blood_bank_donors_update(request: HttpRequest, donor_id: int, _user=None):
-    if not _require_blood_bank(_user) and not _require_admin(_user):
-        return JsonResponse({'error':'forbidden'}, status=403)
-    _ensure_blood_bank_tables()
+    is_admin = _require_admin(_user)
+    if not is_admin and not _require_blood_bank(_user):
+        return FastJsonResponse({'error':'forbidden'}, status=403)
     row = query("SELECT * FROM blood_bank_donors WHERE id=%s", [donor_id])
-    if not row or (not _require_admin(_user) and row['bank_user_id'] != _user['id']):
-        return JsonResponse({'error':'not_found'}, status=404)
-    data = json.loads(request.body or '{}')
+    if not row or (not is_admin and row['bank_user_id'] != _user['id']):
+        return FastJsonResponse({'error':'not_found'}, status=404)
+    data = _loads(request.body) if request.body else {}
     fields = {}
     if 'blood_type' in data:
-        bt = (data.get('blood_type') or '').upper().strip()
-        if bt not in ('A+','A-','B+','B-','O+','O-','AB+','AB-'):
-            return JsonResponse({'error':'invalid_blood_type'}, status=400)
+        bt = _norm_bt(data.get('blood_type'))
+        if bt not in VALID_BLOOD_TYPES:
+            return FastJsonResponse({'error':'invalid_blood_type'}, status=400)
         fields['blood_type'] = bt
     if 'notes' in data:
         fields['notes'] = data.get('notes')
     if not fields:
-        return JsonResponse({'ok': True})
+        return FastJsonResponse({'ok': True})
     sets = ",".join([f"{k}=%s" for k in fields.keys()])
     params = list(fields.values()) + [donor_id]
     execute(f"UPDATE blood_bank_donors SET {sets} WHERE id=%s", params)
-    return JsonResponse({'ok': True})
+    return FastJsonResponse({'ok': True})
 
 @api_view(require_auth=True, methods=['POST'], csrf=False)
 def blood_bank_donors_remove(request: HttpRequest, donor_id: int, _user=None):
-    if not _require_blood_bank(_user) and not _require_admin(_user):
-        return JsonResponse({'error':'forbidden'}, status=403)
-    _ensure_blood_bank_tables()
+    is_admin = _require_admin(_user)
+    if not is_admin and not _require_blood_bank(_user):
+        return FastJsonResponse({'error':'forbidden'}, status=403)
     row = query("SELECT * FROM blood_bank_donors WHERE id=%s", [donor_id])
-    if not row or (not _require_admin(_user) and row['bank_user_id'] != _user['id']):
-        return JsonResponse({'error':'not_found'}, status=404)
+    if not row or (not is_admin and row['bank_user_id'] != _user['id']):
+        return FastJsonResponse({'error':'not_found'}, status=404)
     execute("DELETE FROM blood_bank_donors WHERE id=%s", [donor_id])
-    return JsonResponse({'ok': True})
+    return FastJsonResponse({'ok': True})
 
 @api_view(require_auth=True, methods=['GET'], csrf=False)
 def blood_bank_staff_list(request: HttpRequest, _user=None):
     if not _require_blood_bank(_user) and not _require_admin(_user):
-        return JsonResponse({'error':'forbidden'}, status=403)
-    _ensure_blood_bank_tables()
+        return FastJsonResponse({'error':'forbidden'}, status=403)
     rows = query("SELECT * FROM blood_bank_staff WHERE bank_user_id=%s ORDER BY name", [_user['id']], many=True) or []
-    return JsonResponse({'results': rows})
+    return FastJsonResponse({'results': rows})
 
 @api_view(require_auth=True, methods=['POST'], csrf=False)
 def blood_bank_staff_add(request: HttpRequest, _user=None):
     if not _require_blood_bank(_user) and not _require_admin(_user):
-        return JsonResponse({'error':'forbidden'}, status=403)
-    _ensure_blood_bank_tables()
-    data = json.loads(request.body or '{}')
+        return FastJsonResponse({'error':'forbidden'}, status=403)
+    data = _loads(request.body) if request.body else {}
     name = (data.get('name') or '').strip()
     role = (data.get('role') or '').strip() or None
     phone = (data.get('phone') or '').strip() or None
     email = (data.get('email') or '').strip() or None
     if not name:
-        return JsonResponse({'error':'name_required'}, status=400)
+        return FastJsonResponse({'error':'name_required'}, status=400)
     sid = execute("INSERT INTO blood_bank_staff(bank_user_id,name,role,phone,email) VALUES(%s,%s,%s,%s,%s)", [_user['id'], name, role, phone, email])
-    return JsonResponse({'id': sid})
+    return FastJsonResponse({'id': sid})
 
 @api_view(require_auth=True, methods=['POST'], csrf=False)
 def blood_bank_staff_update(request: HttpRequest, staff_id: int, _user=None):
-    if not _require_blood_bank(_user) and not _require_admin(_user):
-        return JsonResponse({'error':'forbidden'}, status=403)
-    _ensure_blood_bank_tables()
+    is_admin = _require_admin(_user)
+    if not is_admin and not _require_blood_bank(_user):
+        return FastJsonResponse({'error':'forbidden'}, status=403)
     row = query("SELECT * FROM blood_bank_staff WHERE id=%s", [staff_id])
-    if not row or (not _require_admin(_user) and row['bank_user_id'] != _user['id']):
-        return JsonResponse({'error':'not_found'}, status=404)
-    data = json.loads(request.body or '{}')
+    if not row or (not is_admin and row['bank_user_id'] != _user['id']):
+        return FastJsonResponse({'error':'not_found'}, status=404)
+    data = _loads(request.body) if request.body else {}
     fields = {}
     for k in ('name','role','phone','email','status'):
         if k in data:
             fields[k] = data[k]
     if not fields:
-        return JsonResponse({'ok': True})
+        return FastJsonResponse({'ok': True})
     sets = ",".join([f"{k}=%s" for k in fields.keys()])
     params = list(fields.values()) + [staff_id]
     execute(f"UPDATE blood_bank_staff SET {sets} WHERE id=%s", params)
-    return JsonResponse({'ok': True})
+    return FastJsonResponse({'ok': True})
 
 @api_view(require_auth=True, methods=['POST'], csrf=False)
 def blood_bank_staff_remove(request: HttpRequest, staff_id: int, _user=None):
-    if not _require_blood_bank(_user) and not _require_admin(_user):
-        return JsonResponse({'error':'forbidden'}, status=403)
-    _ensure_blood_bank_tables()
+    is_admin = _require_admin(_user)
+    if not is_admin and not _require_blood_bank(_user):
+        return FastJsonResponse({'error':'forbidden'}, status=403)
     row = query("SELECT * FROM blood_bank_staff WHERE id=%s", [staff_id])
-    if not row or (not _require_admin(_user) and row['bank_user_id'] != _user['id']):
-        return JsonResponse({'error':'not_found'}, status=404)
+    if not row or (not is_admin and row['bank_user_id'] != _user['id']):
+        return FastJsonResponse({'error':'not_found'}, status=404)
     execute("DELETE FROM blood_bank_staff WHERE id=%s", [staff_id])
-    return JsonResponse({'ok': True})
+    return FastJsonResponse({'ok': True})
 
 @api_view(require_auth=True, methods=['GET'], csrf=False)
 def blood_inventory_list(request: HttpRequest, _user=None):
     if not _require_blood_bank(_user) and not _require_admin(_user):
-        return JsonResponse({'error':'forbidden'}, status=403)
-    _ensure_blood_bank_tables()
+        return FastJsonResponse({'error':'forbidden'}, status=403)
     rows = query("SELECT * FROM blood_inventory WHERE bank_user_id=%s ORDER BY blood_type", [_user['id']], many=True) or []
-    return JsonResponse({'results': rows})
+    return FastJsonResponse({'results': rows})
 
 @api_view(require_auth=True, methods=['POST'], csrf=False)
 def blood_inventory_set(request: HttpRequest, _user=None):
     if not _require_blood_bank(_user) and not _require_admin(_user):
-        return JsonResponse({'error':'forbidden'}, status=403)
-    _ensure_blood_bank_tables()
-    data = json.loads(request.body or '{}')
-    bt = (data.get('blood_type') or '').upper().strip()
+        return FastJsonResponse({'error':'forbidden'}, status=403)
+    data = _loads(request.body) if request.body else {}
+    bt = _norm_bt(data.get('blood_type'))
     qty = int(data.get('quantity_units') or 0)
-    if bt not in ('A+','A-','B+','B-','O+','O-','AB+','AB-'):
-        return JsonResponse({'error':'invalid_blood_type'}, status=400)
+    if bt not in VALID_BLOOD_TYPES:
+        return FastJsonResponse({'error':'invalid_blood_type'}, status=400)
     # upsert by (bank_user_id, blood_type)
     try:
         existing = query("SELECT id FROM blood_inventory WHERE bank_user_id=%s AND blood_type=%s", [_user['id'], bt])
         if existing:
             execute("UPDATE blood_inventory SET quantity_units=%s, updated_at=CURRENT_TIMESTAMP WHERE id=%s", [qty, existing['id']])
-            return JsonResponse({'id': existing['id'], 'ok': True})
+            return FastJsonResponse({'id': existing['id'], 'ok': True})
         else:
             iid = execute("INSERT INTO blood_inventory(bank_user_id,blood_type,quantity_units) VALUES(%s,%s,%s)", [_user['id'], bt, qty])
-            return JsonResponse({'id': iid})
+            return FastJsonResponse({'id': iid})
     except Exception as e:
-        return JsonResponse({'error':'db_error', 'detail': str(e)}, status=500)
+        return FastJsonResponse({'error':'db_error', 'detail': str(e)}, status=500)
 
 @api_view(require_auth=True, methods=['POST'], csrf=False)
 def blood_inventory_issue(request: HttpRequest, _user=None):
@@ -2946,22 +2952,21 @@ def blood_inventory_issue(request: HttpRequest, _user=None):
     Effects: decrements inventory immediately; records issuance row.
     """
     if not _require_blood_bank(_user) and not _require_admin(_user):
-        return JsonResponse({'error':'forbidden'}, status=403)
-    _ensure_blood_bank_tables()
-    data = json.loads(request.body or '{}')
-    bt = (data.get('blood_type') or '').upper().strip()
+        return FastJsonResponse({'error':'forbidden'}, status=403)
+    data = _loads(request.body) if request.body else {}
+    bt = _norm_bt(data.get('blood_type'))
     try:
         qty = int(data.get('quantity_units') or 0)
     except Exception:
-        return JsonResponse({'error':'invalid_quantity'}, status=400)
+        return FastJsonResponse({'error':'invalid_quantity'}, status=400)
     if bt not in VALID_BLOOD_TYPES:
-        return JsonResponse({'error':'invalid_blood_type'}, status=400)
+        return FastJsonResponse({'error':'invalid_blood_type'}, status=400)
     if qty < 1:
-        return JsonResponse({'error':'invalid_quantity'}, status=400)
+        return FastJsonResponse({'error':'invalid_quantity'}, status=400)
     # Check inventory
     inv = query("SELECT id, quantity_units FROM blood_inventory WHERE bank_user_id=%s AND blood_type=%s", [_user['id'], bt])
     if not inv or int(inv['quantity_units']) < qty:
-        return JsonResponse({'error':'insufficient_inventory'}, status=400)
+        return FastJsonResponse({'error':'insufficient_inventory'}, status=400)
     # Decrement
     new_qty = int(inv['quantity_units']) - qty
     execute("UPDATE blood_inventory SET quantity_units=%s, updated_at=CURRENT_TIMESTAMP WHERE id=%s", [new_qty, inv['id']])
@@ -2973,28 +2978,27 @@ def blood_inventory_issue(request: HttpRequest, _user=None):
         "INSERT INTO blood_inventory_issuances(bank_user_id,blood_type,quantity_units,purpose,issued_to_name,issued_to_contact) VALUES(%s,%s,%s,%s,%s,%s)",
         [_user['id'], bt, qty, purpose, issued_to_name, issued_to_contact]
     )
-    return JsonResponse({'id': iid})
+    return FastJsonResponse({'id': iid})
 
 @api_view(require_auth=True, methods=['GET'], csrf=False)
 def blood_inventory_issuances_list(request: HttpRequest, _user=None):
     if not _require_blood_bank(_user) and not _require_admin(_user):
-        return JsonResponse({'error':'forbidden'}, status=403)
-    _ensure_blood_bank_tables()
+        return FastJsonResponse({'error':'forbidden'}, status=403)
     rows = query(
         "SELECT * FROM blood_inventory_issuances WHERE bank_user_id=%s ORDER BY created_at DESC",
         [_user['id']], many=True
     ) or []
-    return JsonResponse({'results': rows})
+    return FastJsonResponse({'results': rows})
 
 @api_view(require_auth=True, methods=['POST'], csrf=False)
 def blood_inventory_issuance_update(request: HttpRequest, issuance_id: int, _user=None):
-    if not _require_blood_bank(_user) and not _require_admin(_user):
-        return JsonResponse({'error':'forbidden'}, status=403)
-    _ensure_blood_bank_tables()
+    is_admin = _require_admin(_user)
+    if not is_admin and not _require_blood_bank(_user):
+        return FastJsonResponse({'error':'forbidden'}, status=403)
     row = query("SELECT * FROM blood_inventory_issuances WHERE id=%s", [issuance_id])
-    if not row or (not _require_admin(_user) and row['bank_user_id'] != _user['id']):
-        return JsonResponse({'error':'not_found'}, status=404)
-    data = json.loads(request.body or '{}')
+    if not row or (not is_admin and row['bank_user_id'] != _user['id']):
+        return FastJsonResponse({'error':'not_found'}, status=404)
+    data = _loads(request.body) if request.body else {}
     # Allow editing purpose and issued_to*; allow status revert which restores inventory
     fields = {}
     for k in ('purpose','issued_to_name','issued_to_contact'):
@@ -3012,20 +3016,20 @@ def blood_inventory_issuance_update(request: HttpRequest, issuance_id: int, _use
                     execute("INSERT INTO blood_inventory(bank_user_id,blood_type,quantity_units) VALUES(%s,%s,%s)", [row['bank_user_id'], row['blood_type'], int(row['quantity_units'])])
             fields['status'] = new_status
     if not fields:
-        return JsonResponse({'ok': True})
+        return FastJsonResponse({'ok': True})
     sets = ",".join([f"{k}=%s" for k in fields.keys()])
     params = list(fields.values()) + [issuance_id]
     execute(f"UPDATE blood_inventory_issuances SET {sets} WHERE id=%s", params)
-    return JsonResponse({'ok': True})
+    return FastJsonResponse({'ok': True})
 
 @api_view(require_auth=True, methods=['POST'], csrf=False)
 def blood_inventory_issuance_delete(request: HttpRequest, issuance_id: int, _user=None):
-    if not _require_blood_bank(_user) and not _require_admin(_user):
-        return JsonResponse({'error':'forbidden'}, status=403)
-    _ensure_blood_bank_tables()
+    is_admin = _require_admin(_user)
+    if not is_admin and not _require_blood_bank(_user):
+        return FastJsonResponse({'error':'forbidden'}, status=403)
     row = query("SELECT * FROM blood_inventory_issuances WHERE id=%s", [issuance_id])
-    if not row or (not _require_admin(_user) and row['bank_user_id'] != _user['id']):
-        return JsonResponse({'error':'not_found'}, status=404)
+    if not row or (not is_admin and row['bank_user_id'] != _user['id']):
+        return FastJsonResponse({'error':'not_found'}, status=404)
     # If deleting an issued (not reverted) record, restore inventory to avoid loss
     if row['status'] == 'issued':
         inv = query("SELECT id,quantity_units FROM blood_inventory WHERE bank_user_id=%s AND blood_type=%s", [row['bank_user_id'], row['blood_type']])
@@ -3034,7 +3038,7 @@ def blood_inventory_issuance_delete(request: HttpRequest, issuance_id: int, _use
         else:
             execute("INSERT INTO blood_inventory(bank_user_id,blood_type,quantity_units) VALUES(%s,%s,%s)", [row['bank_user_id'], row['blood_type'], int(row['quantity_units'])])
     execute("DELETE FROM blood_inventory_issuances WHERE id=%s", [issuance_id])
-    return JsonResponse({'ok': True})
+    return FastJsonResponse({'ok': True})
 
 # ======================= BANK INVENTORY REQUEST FLOW =========================
 
@@ -3044,14 +3048,13 @@ def create_inventory_request(request: HttpRequest, _user=None):
 
     Body: { bank_user_id, blood_type, quantity_units, target_datetime, location_text, crisis_id? }
     """
-    _ensure_blood_bank_tables()
-    data = json.loads(request.body or '{}')
+    data = _loads(request.body) if request.body else {}
     try:
         bank_user_id = int(data.get('bank_user_id'))
         qty = int(data.get('quantity_units'))
     except Exception:
-        return JsonResponse({'error':'invalid_input'}, status=400)
-    bt = (data.get('blood_type') or '').upper().strip()
+        return FastJsonResponse({'error':'invalid_input'}, status=400)
+    bt = _norm_bt(data.get('blood_type'))
     when = data.get('target_datetime')
     loc = _limit_str(data.get('location_text') or None, 255)
     crisis_id = None
@@ -3060,27 +3063,22 @@ def create_inventory_request(request: HttpRequest, _user=None):
     except Exception:
         crisis_id = None
     if bt not in VALID_BLOOD_TYPES:
-        return JsonResponse({'error':'invalid_blood_type'}, status=400)
+        return FastJsonResponse({'error':'invalid_blood_type'}, status=400)
     if qty < 1:
-        return JsonResponse({'error':'invalid_quantity'}, status=400)
+        return FastJsonResponse({'error':'invalid_quantity'}, status=400)
     # Default target time to now if omitted to satisfy NOT NULL constraint
     if not when:
-        import datetime as _dt
-        when = _dt.datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
+        when = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
     rid = execute(
         "INSERT INTO blood_inventory_requests(requester_user_id,bank_user_id,blood_type,quantity_units,target_datetime,location_text,crisis_id) VALUES(%s,%s,%s,%s,%s,%s,%s)",
         [_user['id'], bank_user_id, bt, qty, when, loc, crisis_id]
     )
-    try:
-        _notify(bank_user_id, 'inventory_request_created', {'request_id': rid, 'blood_type': bt, 'quantity_units': qty})
-    except Exception:
-        pass
-    return JsonResponse({'id': rid})
+    _notify_async(bank_user_id, 'inventory_request_created', {'request_id': rid, 'blood_type': bt, 'quantity_units': qty})
+    return FastJsonResponse({'id': rid})
 
 @api_view(require_auth=True, methods=['GET'], csrf=False)
 def list_inventory_requests(request: HttpRequest, _user=None):
     """List inventory requests. Filters: bank_user_id, requester_user_id, crisis_id (one required unless admin with all=1)."""
-    _ensure_blood_bank_tables()
     bank_id = request.GET.get('bank_user_id')
     req_id = request.GET.get('requester_user_id')
     crisis_id = request.GET.get('crisis_id')
@@ -3094,7 +3092,7 @@ def list_inventory_requests(request: HttpRequest, _user=None):
         where.append('rir.crisis_id=%s'); params.append(crisis_id)
     # Admins may request all without filters
     if not where and not (show_all and _require_admin(_user)):
-        return JsonResponse({'error':'missing_filter'}, status=400)
+        return FastJsonResponse({'error':'missing_filter'}, status=400)
     rows = query(
         f"""
         SELECT rir.*, u.full_name AS requester_name
@@ -3105,7 +3103,7 @@ def list_inventory_requests(request: HttpRequest, _user=None):
         """,
         params, many=True
     ) or []
-    return JsonResponse({'results': rows})
+    return FastJsonResponse({'results': rows})
 
 def _hours_until(dt_str: str) -> float:
     """Return hours until target datetime.
@@ -3114,7 +3112,6 @@ def _hours_until(dt_str: str) -> float:
     This avoids mixing a naive local time with UTC and incorrectly returning negative/too-small values.
     """
     try:
-        from datetime import datetime, timezone
         if not dt_str:
             return 0.0
         s = str(dt_str).strip()
@@ -3136,82 +3133,166 @@ def _hours_until(dt_str: str) -> float:
 
 @api_view(require_auth=True, methods=['POST'], csrf=False)
 def update_inventory_request_status(request: HttpRequest, request_id: int, _user=None):
-    _ensure_blood_bank_tables()
     row = query("SELECT * FROM blood_inventory_requests WHERE id=%s", [request_id])
     if not row:
-        return JsonResponse({'error':'not_found'}, status=404)
-    data = json.loads(request.body or '{}')
+        return FastJsonResponse({'error':'not_found'}, status=404)
+    data = _loads(request.body) if request.body else {}
     new_status = data.get('status')
     if new_status not in ('accepted','rejected','cancelled','completed'):
-        return JsonResponse({'error':'invalid_status'}, status=400)
+        return FastJsonResponse({'error':'invalid_status'}, status=400)
     # Permissions and rules
     is_bank = _user['id'] == row['bank_user_id'] or _require_admin(_user)
     is_requester = _user['id'] == row['requester_user_id']
     if new_status in ('accepted','rejected','completed') and not is_bank:
-        return JsonResponse({'error':'forbidden'}, status=403)
+        return FastJsonResponse({'error':'forbidden'}, status=403)
     if new_status == 'cancelled' and not (is_bank or is_requester):
-        return JsonResponse({'error':'forbidden'}, status=403)
+        return FastJsonResponse({'error':'forbidden'}, status=403)
     # Cancel rule: up to 2 hours prior
     if new_status == 'cancelled':
         if _hours_until(row['target_datetime']) < 2.0:
-            return JsonResponse({'error':'too_late_to_cancel'}, status=400)
+            return FastJsonResponse({'error':'too_late_to_cancel'}, status=400)
         execute("UPDATE blood_inventory_requests SET status='cancelled' WHERE id=%s", [request_id])
-        try:
-            other = row['bank_user_id'] if is_requester else row['requester_user_id']
-            _notify(other, 'inventory_request_cancelled', {'request_id': request_id})
-        except Exception:
-            pass
-        return JsonResponse({'ok': True})
+        other = row['bank_user_id'] if is_requester else row['requester_user_id']
+        _notify_async(other, 'inventory_request_cancelled', {'request_id': request_id})
+        return FastJsonResponse({'ok': True})
     if row['status'] in ('rejected','cancelled','completed'):
-        return JsonResponse({'error':'immutable'}, status=400)
+        return FastJsonResponse({'error':'immutable'}, status=400)
     if new_status == 'accepted':
         inv = query("SELECT quantity_units FROM blood_inventory WHERE bank_user_id=%s AND blood_type=%s", [row['bank_user_id'], row['blood_type']])
         if not inv or int(inv['quantity_units']) < int(row['quantity_units']):
             execute("UPDATE blood_inventory_requests SET status='rejected', reject_reason='insufficient_inventory' WHERE id=%s", [request_id])
-            try: _notify(row['requester_user_id'], 'inventory_request_rejected', {'request_id': request_id, 'reason':'insufficient_inventory'})
-            except Exception: pass
-            return JsonResponse({'error':'insufficient_inventory', 'auto':'rejected'}, status=400)
+            _notify_async(row['requester_user_id'], 'inventory_request_rejected', {'request_id': request_id, 'reason':'insufficient_inventory'})
+            return FastJsonResponse({'error':'insufficient_inventory', 'auto':'rejected'}, status=400)
         execute("UPDATE blood_inventory_requests SET status='accepted' WHERE id=%s", [request_id])
-        try: _notify(row['requester_user_id'], 'inventory_request_accepted', {'request_id': request_id})
-        except Exception: pass
-        return JsonResponse({'ok': True})
+        _notify_async(row['requester_user_id'], 'inventory_request_accepted', {'request_id': request_id})
+        return FastJsonResponse({'ok': True})
     if new_status == 'rejected':
         reason = _limit_str(data.get('reason') or None, 255)
         execute("UPDATE blood_inventory_requests SET status='rejected', reject_reason=%s WHERE id=%s", [reason, request_id])
-        try: _notify(row['requester_user_id'], 'inventory_request_rejected', {'request_id': request_id, 'reason': reason})
-        except Exception: pass
-        return JsonResponse({'ok': True})
+        _notify_async(row['requester_user_id'], 'inventory_request_rejected', {'request_id': request_id, 'reason': reason})
+        return FastJsonResponse({'ok': True})
     if new_status == 'completed':
-        # Decrement inventory on completion
-        try:
-            inv = query("SELECT id,quantity_units FROM blood_inventory WHERE bank_user_id=%s AND blood_type=%s", [row['bank_user_id'], row['blood_type']])
-            if inv:
-                new_qty = max(0, int(inv['quantity_units']) - int(row['quantity_units']))
-                execute("UPDATE blood_inventory SET quantity_units=%s, updated_at=CURRENT_TIMESTAMP WHERE id=%s", [new_qty, inv['id']])
-        except Exception:
-            pass
-        execute("UPDATE blood_inventory_requests SET status='completed' WHERE id=%s", [request_id])
-        try: _notify(row['requester_user_id'], 'inventory_request_completed', {'request_id': request_id})
-        except Exception: pass
-        return JsonResponse({'ok': True})
+        # Mark completed and decrement inventory in one statement; the status guard
+        # keeps a concurrent second completion from decrementing twice.
+        changed = execute_rowcount(
+            """
+            UPDATE blood_inventory_requests r
+            LEFT JOIN blood_inventory i ON i.bank_user_id = r.bank_user_id AND i.blood_type = r.blood_type
+            SET r.status='completed',
+                i.quantity_units=GREATEST(0, i.quantity_units - r.quantity_units),
+                i.updated_at=CURRENT_TIMESTAMP
+            WHERE r.id=%s AND r.status NOT IN ('rejected','cancelled','completed')
+            """,
+            [request_id]
+        )
+        if not changed:
+            return FastJsonResponse({'error':'immutable'}, status=400)
+        _notify_async(row['requester_user_id'], 'inventory_request_completed', {'request_id': request_id})
+        return FastJsonResponse({'ok': True})
 
 # ======================= DONOR MEETING REQUEST FLOW ==========================
 
+# Short-lived per-process cache of donor cooldown inputs (donor_user_id -> (ts, info)).
+# Cooldowns change rarely; writers that touch them pop the donor's entry.
+_DONOR_COOLDOWN_CACHE = {}
+_DONOR_COOLDOWN_TTL = 30
+_DONOR_COOLDOWN_MAX = 10000
+
+# Process-local LRU of donor blood types (user_id -> blood_type). A donor's blood
+# type practically never changes; upsert_donor_profile drops the entry on write.
+_DONOR_BLOOD_TYPE_CACHE = LRUCache(10000)
+
+def _donor_blood_type(user_id: int):
+    """Return the blood type on a user's donor profile, or None if they have none."""
+    bt = _DONOR_BLOOD_TYPE_CACHE.get(user_id)
+    if bt is not None:
+        return bt
+    row = query("SELECT blood_type FROM donor_profiles WHERE user_id=%s", [user_id])
+    bt = row and row.get('blood_type')
+    if not bt:
+        return None  # not cached: the profile may be created moments later
+    _DONOR_BLOOD_TYPE_CACHE.put(user_id, bt)
+    return bt
+
+def _parse_dt(x) -> datetime:
+    """Naive, second-precision datetime from a DB value or ISO-like string.
+
+    DB drivers already hand back datetime objects, so those skip the string
+    round trip; strings may use 'T' or ' ' and carry fractional seconds.
+    """
+    if isinstance(x, datetime):
+        return x.replace(microsecond=0) if x.microsecond else x
+    return datetime.fromisoformat(str(x).replace('T',' ').split('.')[0])
+
+def _get_donor_cooldown(donor_user_id: int) -> dict:
+    """Return cooldown inputs for a donor.
+
+    Keys: cooldown_days / completed_at (from the last completed meeting request) and
+    cooldown_until (from donor_profiles); any may be None.
+    """
+    now = time.time()
+    hit = _DONOR_COOLDOWN_CACHE.get(donor_user_id)
+    if hit and now - hit[0] < _DONOR_COOLDOWN_TTL:
+        return hit[1]
+    # One round trip; the (SELECT 1) anchor yields a row even without a profile or completed request
+    row = query(
+        """
+        SELECT (SELECT cooldown_until FROM donor_profiles WHERE user_id=%s) AS cooldown_until,
+               mr.cooldown_days_after_completion, mr.updated_at
+        FROM (SELECT 1 AS one) anchor
+        LEFT JOIN (
+            SELECT cooldown_days_after_completion, updated_at
+            FROM blood_donor_meeting_requests
+            WHERE donor_user_id=%s AND status='completed'
+            ORDER BY updated_at DESC LIMIT 1
+        ) mr ON 1=1
+        """,
+        [donor_user_id, donor_user_id]
+    ) or {}
+    info = {
+        'cooldown_days': row.get('cooldown_days_after_completion'),
+        'completed_at': row.get('updated_at'),
+        'cooldown_until': row.get('cooldown_until'),
+    }
+    if len(_DONOR_COOLDOWN_CACHE) >= _DONOR_COOLDOWN_MAX:
+        _DONOR_COOLDOWN_CACHE.clear()
+    _DONOR_COOLDOWN_CACHE[donor_user_id] = (now, info)
+    return info
+
+def _cooldown_violation(cd: dict, target):
+    """Return the 'until' timestamp (str) of a cooldown that blocks `target`, else None."""
+    try:
+        cooldown = int(cd.get('cooldown_days') or 0)
+        if cooldown > 0:
+            next_ok = _parse_dt(cd['completed_at']) + timedelta(days=cooldown)
+            if _parse_dt(target) < next_ok:
+                return next_ok.isoformat(sep=' ', timespec='seconds')
+    except Exception:
+        # On parse issues, do not block; server logs would help diagnose in real env
+        pass
+    try:
+        if cd.get('cooldown_until'):
+            cu = _parse_dt(cd['cooldown_until'])
+            if _parse_dt(target) < cu:
+                return cu.isoformat(sep=' ', timespec='seconds')
+    except Exception:
+        pass
+    return None
+
 @api_view(require_auth=True, methods=['POST'], csrf=False)
 def create_donor_meeting_request(request: HttpRequest, _user=None):
     """User requests donation from a specific donor.
 
     Body: { donor_user_id, target_datetime, location_text, blood_type?, crisis_id? }
     """
-    _ensure_blood_bank_tables()
-    data = json.loads(request.body or '{}')
+    data = _loads(request.body) if request.body else {}
     try:
         donor_user_id = int(data.get('donor_user_id'))
     except Exception:
-        return JsonResponse({'error':'invalid_input'}, status=400)
-    bt = (data.get('blood_type') or '').upper().strip() if data.get('blood_type') else None
+        return FastJsonResponse({'error':'invalid_input'}, status=400)
+    bt = _norm_bt(data.get('blood_type')) or None
     if bt and bt not in VALID_BLOOD_TYPES:
-        return JsonResponse({'error':'invalid_blood_type'}, status=400)
+        return FastJsonResponse({'error':'invalid_blood_type'}, status=400)
     when = data.get('target_datetime')
     loc = _limit_str(data.get('location_text') or None, 255)
     crisis_id = None
@@ -3221,44 +3302,22 @@ def create_donor_meeting_request(request: HttpRequest, _user=None):
         crisis_id = None
     # Default target time to now if omitted to satisfy NOT NULL constraint
     if not when:
-        import datetime as _dt
-        when = _dt.datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
-    # Prevent creating requests within donor cooldown window based on last completed donation
-    try:
-        last = query("SELECT cooldown_days_after_completion, updated_at FROM blood_donor_meeting_requests WHERE donor_user_id=%s AND status='completed' ORDER BY updated_at DESC LIMIT 1", [donor_user_id])
-        if last and last.get('cooldown_days_after_completion'):
-            from datetime import datetime, timedelta
-            cooldown = int(last['cooldown_days_after_completion'] or 0)
-            if cooldown > 0:
-                # Parse timestamps robustly (handle 'T' and fractional seconds)
-                last_done = datetime.fromisoformat(str(last['updated_at']).replace('T',' ').split('.')[0])
-                tgt = datetime.fromisoformat(str(when).replace('T',' ').split('.')[0])
-                next_ok = last_done + timedelta(days=cooldown)
-                if tgt < next_ok:
-                    return JsonResponse({'error':'cooldown_active', 'until': next_ok.isoformat(sep=' ', timespec='seconds')}, status=400)
-    except Exception:
-        # On parse/DB issues, do not block creation; server logs would help diagnose in real env
-        pass
-    # Also enforce profile-level cooldown_until if present
+        when = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
     try:
-        prof = query("SELECT cooldown_until FROM donor_profiles WHERE user_id=%s", [donor_user_id])
-        if prof and prof.get('cooldown_until'):
-            from datetime import datetime
-            cu = datetime.fromisoformat(str(prof['cooldown_until']).replace('T',' ').split('.')[0])
-            tgt = datetime.fromisoformat(str(when).replace('T',' ').split('.')[0])
-            if tgt < cu:
-                return JsonResponse({'error':'cooldown_active', 'until': cu.isoformat(sep=' ', timespec='seconds')}, status=400)
+        cd = _get_donor_cooldown(donor_user_id)
     except Exception:
-        pass
+        cd = {}
+    # Prevent creating requests within the donor cooldown window (last completed donation
+    # or profile-level cooldown_until)
+    until = _cooldown_violation(cd, when)
+    if until:
+        return FastJsonResponse({'error':'cooldown_active', 'until': until}, status=400)
     rid = execute(
         "INSERT INTO blood_donor_meeting_requests(requester_user_id,donor_user_id,blood_type,target_datetime,location_text,crisis_id) VALUES(%s,%s,%s,%s,%s,%s)",
         [_user['id'], donor_user_id, bt, when, loc, crisis_id]
     )
-    try:
-        _notify(donor_user_id, 'donor_meeting_request_created', {'request_id': rid})
-    except Exception:
-        pass
-    return JsonResponse({'id': rid})
+    _notify_async(donor_user_id, 'donor_meeting_request_created', {'request_id': rid})
+    return FastJsonResponse({'id': rid})
 
 @api_view(require_auth=True, methods=['GET'], csrf=False)
 def list_donor_meeting_requests(request: HttpRequest, _user=None):
@@ -3275,7 +3334,7 @@ def list_donor_meeting_requests(request: HttpRequest, _user=None):
     if crisis_id:
         where.append('r.crisis_id=%s'); params.append(crisis_id)
     if not where and not (show_all and _require_admin(_user)):
-        return JsonResponse({'error':'missing_filter'}, status=400)
+        return FastJsonResponse({'error':'missing_filter'}, status=400)
     rows = query(
         f"""
         SELECT r.*, u.full_name AS requester_name
@@ -3286,68 +3345,63 @@ def list_donor_meeting_requests(request: HttpRequest, _user=None):
         """,
         params, many=True
     ) or []
-    return JsonResponse({'results': rows})
+    return StreamingResultsResponse(rows)
 
 @api_view(require_auth=True, methods=['POST'], csrf=False)
 def update_donor_meeting_request_status(request: HttpRequest, request_id: int, _user=None):
     row = query("SELECT * FROM blood_donor_meeting_requests WHERE id=%s", [request_id])
     if not row:
-        return JsonResponse({'error':'not_found'}, status=404)
-    data = json.loads(request.body or '{}')
+        return FastJsonResponse({'error':'not_found'}, status=404)
+    data = _loads(request.body) if request.body else {}
     new_status = data.get('status')
     if new_status not in ('accepted','rejected','cancelled','completed'):
-        return JsonResponse({'error':'invalid_status'}, status=400)
+        return FastJsonResponse({'error':'invalid_status'}, status=400)
     is_donor = _user['id'] == row['donor_user_id'] or _require_admin(_user)
     is_requester = _user['id'] == row['requester_user_id']
     if new_status in ('accepted','rejected','completed') and not is_donor:
-        return JsonResponse({'error':'forbidden'}, status=403)
+        return FastJsonResponse({'error':'forbidden'}, status=403)
     if new_status == 'cancelled' and not (is_donor or is_requester):
-        return JsonResponse({'error':'forbidden'}, status=403)
+        return FastJsonResponse({'error':'forbidden'}, status=403)
     if new_status == 'cancelled':
         if _hours_until(row['target_datetime']) < 2.0:
-            return JsonResponse({'error':'too_late_to_cancel'}, status=400)
+            return FastJsonResponse({'error':'too_late_to_cancel'}, status=400)
         execute("UPDATE blood_donor_meeting_requests SET status='cancelled' WHERE id=%s", [request_id])
-        try:
-            other = row['donor_user_id'] if is_requester else row['requester_user_id']
-            _notify(other, 'donor_meeting_request_cancelled', {'request_id': request_id})
-        except Exception:
-            pass
-        return JsonResponse({'ok': True})
+        other = row['donor_user_id'] if is_requester else row['requester_user_id']
+        _notify_async(other, 'donor_meeting_request_cancelled', {'request_id': request_id})
+        return FastJsonResponse({'ok': True})
     if row['status'] in ('rejected','cancelled','completed'):
-        return JsonResponse({'error':'immutable'}, status=400)
+        return FastJsonResponse({'error':'immutable'}, status=400)
     if new_status == 'accepted':
-        # Enforce cooldown from last completed donation with recorded cooldown_days
-        last = query("SELECT cooldown_days_after_completion, updated_at FROM blood_donor_meeting_requests WHERE donor_user_id=%s AND status='completed' ORDER BY updated_at DESC LIMIT 1", [row['donor_user_id']])
-        if last and last.get('cooldown_days_after_completion'):
-            try:
-                from datetime import datetime, timedelta
-                cooldown = int(last['cooldown_days_after_completion'])
-                next_ok = datetime.fromisoformat(str(last['updated_at']).replace('T',' ').split('.')[0]) + timedelta(days=cooldown)
-                tgt = datetime.fromisoformat(str(row['target_datetime']).replace('T',' ').split('.')[0])
-                if tgt < next_ok:
-                    return JsonResponse({'error':'cooldown_active', 'until': next_ok.isoformat(sep=' ', timespec='seconds')}, status=400)
-            except Exception:
-                pass
-        # Enforce profile-level cooldown_until
-        try:
-            prof = query("SELECT cooldown_until FROM donor_profiles WHERE user_id=%s", [row['donor_user_id']])
-            if prof and prof.get('cooldown_until'):
-                from datetime import datetime
-                cu = datetime.fromisoformat(str(prof['cooldown_until']).replace('T',' ').split('.')[0])
-                tgt = datetime.fromisoformat(str(row['target_datetime']).replace('T',' ').split('.')[0])
-                if tgt < cu:
-                    return JsonResponse({'error':'cooldown_active', 'until': cu.isoformat(sep=' ', timespec='seconds')}, status=400)
-        except Exception:
-            pass
-        execute("UPDATE blood_donor_meeting_requests SET status='accepted' WHERE id=%s", [request_id])
-        try: _notify(row['requester_user_id'], 'donor_meeting_request_accepted', {'request_id': request_id})
-        except Exception: pass
-        return JsonResponse({'ok': True})
+        # Cooldown rules live in the UPDATE itself (last completed donation + profile
+        # cooldown_until); only when it matches nothing do we look up the blocking date.
+        matched = execute_rowcount(
+            """
+            UPDATE blood_donor_meeting_requests r
+            LEFT JOIN donor_profiles dp ON dp.user_id = r.donor_user_id
+            LEFT JOIN (
+                SELECT CASE WHEN cooldown_days_after_completion > 0
+                            THEN updated_at + INTERVAL cooldown_days_after_completion DAY END AS next_ok
+                FROM blood_donor_meeting_requests
+                WHERE donor_user_id=%s AND status='completed'
+                ORDER BY updated_at DESC LIMIT 1
+            ) last_done ON 1=1
+            SET r.status='accepted'
+            WHERE r.id=%s
+              AND (dp.cooldown_until IS NULL OR r.target_datetime >= dp.cooldown_until)
+              AND (last_done.next_ok IS NULL OR r.target_datetime >= last_done.next_ok)
+            """,
+            [row['donor_user_id'], request_id]
+        )
+        if not matched:
+            _DONOR_COOLDOWN_CACHE.pop(row['donor_user_id'], None)
+            until = _cooldown_violation(_get_donor_cooldown(row['donor_user_id']), row['target_datetime'])
+            return FastJsonResponse({'error':'cooldown_active', 'until': until}, status=400)
+        _notify_async(row['requester_user_id'], 'donor_meeting_request_accepted', {'request_id': request_id})
+        return FastJsonResponse({'ok': True})
     if new_status == 'rejected':
         execute("UPDATE blood_donor_meeting_requests SET status='rejected' WHERE id=%s", [request_id])
-        try: _notify(row['requester_user_id'], 'donor_meeting_request_rejected', {'request_id': request_id})
-        except Exception: pass
-        return JsonResponse({'ok': True})
+        _notify_async(row['requester_user_id'], 'donor_meeting_request_rejected', {'request_id': request_id})
+        return FastJsonResponse({'ok': True})
     if new_status == 'completed':
         try:
             # Default to 10 days if not provided or invalid; explicit 0 disables cooldown
@@ -3361,22 +3415,29 @@ def update_donor_meeting_request_status(request: HttpRequest, request_id: int, _
             execute("UPDATE donor_profiles SET last_donation_date=CURDATE() WHERE user_id=%s", [row['donor_user_id']])
         except Exception:
             pass
-        try: _notify(row['requester_user_id'], 'donor_meeting_request_completed', {'request_id': request_id})
-        except Exception: pass
-        return JsonResponse({'ok': True})
+        _DONOR_COOLDOWN_CACHE.pop(row['donor_user_id'], None)
+        _notify_async(row['requester_user_id'], 'donor_meeting_request_completed', {'request_id': request_id})
+        return FastJsonResponse({'ok': True})
 
 # Recruit posts
+
+# Serialized list_recruit_posts bodies keyed by (blood_type, status, owner) -> (ts, bytes).
+# Browsing is public and dominated by a few filter combos; post writers clear it.
+_RECRUIT_LIST_CACHE = {}
+_RECRUIT_LIST_TTL = 10
+_RECRUIT_LIST_MAX = 1024
+
 @api_view(require_auth=True, methods=['POST'], csrf=False)
 def create_recruit_post(request: HttpRequest, _user=None):
     if not _is_social_or_bank(_user):
-        return JsonResponse({'error':'forbidden'}, status=403)
-    data = json.loads(request.body or '{}')
+        return FastJsonResponse({'error':'forbidden'}, status=403)
+    data = _loads(request.body) if request.body else {}
     blood_request_id = data.get('blood_request_id')
     target_bt = data.get('target_blood_type')
     if target_bt:
         target_bt = target_bt.upper()
-        if target_bt not in ('A+','A-','B+','B-','O+','O-','AB+','AB-'):
-            return JsonResponse({'error':'invalid_blood_type'}, status=400)
+        if target_bt not in VALID_BLOOD_TYPES:
+            return FastJsonResponse({'error':'invalid_blood_type'}, status=400)
     location_text = _limit_str(data.get('location_text',''),255)
     scheduled_at = data.get('scheduled_at')
     notes = data.get('notes')
@@ -3392,62 +3453,86 @@ def create_recruit_post(request: HttpRequest, _user=None):
             "INSERT INTO blood_donor_recruit_posts(owner_user_id,blood_request_id,target_blood_type,location_text,scheduled_at,notes) VALUES(%s,%s,%s,%s,%s,%s)",
             [_user['id'], blood_request_id, target_bt, location_text, scheduled_at, notes]
         )
-    return JsonResponse({'id': rid})
+    _RECRUIT_LIST_CACHE.clear()
+    return FastJsonResponse({'id': rid})
 
 @api_view(methods=['GET'], csrf=False)
 def list_recruit_posts(request: HttpRequest, _user=None):
     bt = request.GET.get('blood_type')
     status_f = request.GET.get('status')
     owner = request.GET.get('owner_user_id')
+    key = (bt.upper() if bt else '', status_f or '', owner or '')
+    now = time.time()
+    hit = _RECRUIT_LIST_CACHE.get(key)
+    if hit and now - hit[0] < _RECRUIT_LIST_TTL:
+        return HttpResponse(hit[1], content_type='application/json')
     where=[]; params=[]
     if bt:
-        where.append('target_blood_type=%s'); params.append(bt.upper())
+        where.append('p.target_blood_type=%s'); params.append(bt.upper())
     if status_f:
         # Treat NULL status as 'active' for compatibility with older rows
         if status_f == 'active':
-            where.append("(status='active' OR status IS NULL)")
+            where.append("(p.status='active' OR p.status IS NULL)")
         else:
-            where.append('status=%s'); params.append(status_f)
+            where.append('p.status=%s'); params.append(status_f)
     if owner:
-        where.append('owner_user_id=%s'); params.append(owner)
-    sql='SELECT * FROM blood_donor_recruit_posts'
+        where.append('p.owner_user_id=%s'); params.append(owner)
+    # Owner display fields joined in so clients don't look up each owner separately
+    sql = (
+        'SELECT p.*, u.full_name AS owner_name, u.avatar_url AS owner_avatar_url '
+        'FROM blood_donor_recruit_posts p '
+        'LEFT JOIN users u ON u.id = p.owner_user_id'
+    )
     if where:
         sql += ' WHERE ' + ' AND '.join(where)
-    sql += ' ORDER BY created_at DESC LIMIT 200'
-    rows = query(sql, params, many=True) or []
-    return JsonResponse({'results': rows})
+    sql += ' ORDER BY p.created_at DESC LIMIT 200'
+    rows = query(sql, params, many=True, using=READ_ALIAS) or []
+    body = _dumps({'results': rows})
+    if len(_RECRUIT_LIST_CACHE) >= _RECRUIT_LIST_MAX:
+        _RECRUIT_LIST_CACHE.clear()
+    _RECRUIT_LIST_CACHE[key] = (now, body)
+    return HttpResponse(body, content_type='application/json')
 
 @api_view(methods=['GET'], csrf=False)
 def get_recruit_post(request: HttpRequest, post_id: int, _user=None):
     row = query("SELECT * FROM blood_donor_recruit_posts WHERE id=%s", [post_id])
     if not row:
-        return JsonResponse({'error':'not_found'}, status=404)
-    return JsonResponse(row)
+        return FastJsonResponse({'error':'not_found'}, status=404)
+    return FastJsonResponse(row)
 
 @api_view(require_auth=True, methods=['PUT'], csrf=False)
 def update_recruit_post(request: HttpRequest, post_id: int, _user=None):
-    rp = query("SELECT * FROM blood_donor_recruit_posts WHERE id=%s", [post_id])
+    data = _loads(request.body) if request.body else {}
+    fields = {}
+    for k in ('notes', 'scheduled_at', 'status'):
+        if k in data:
+            fields[k] = data.get(k)
+    if 'location_text' in data:
+        fields['location_text'] = _limit_str(data.get('location_text'), 255)
+    if fields:
+        # Owner guard in the WHERE clause; only on a miss do we look the post up to pick 404 vs 403
+        sets = ",".join([f"{k}=%s" for k in fields.keys()])
+        params = list(fields.values()) + [post_id, _user['id']]
+        if execute_rowcount(f"UPDATE blood_donor_recruit_posts SET {sets} WHERE id=%s AND owner_user_id=%s", params):
+            _RECRUIT_LIST_CACHE.clear()
+            return FastJsonResponse({'ok': True})
+    rp = query("SELECT owner_user_id FROM blood_donor_recruit_posts WHERE id=%s", [post_id])
     if not rp:
-        return JsonResponse({'error':'not_found'}, status=404)
+        return FastJsonResponse({'error':'not_found'}, status=404)
     if rp['owner_user_id'] != _user['id']:
-        return JsonResponse({'error':'forbidden'}, status=403)
-    data = json.loads(request.body or '{}')
-    notes = data.get('notes', rp.get('notes'))
-    location_text = _limit_str(data.get('location_text', rp.get('location_text') or ''),255)
-    scheduled_at = data.get('scheduled_at', rp.get('scheduled_at'))
-    status_val = data.get('status', rp.get('status'))
-    execute("UPDATE blood_donor_recruit_posts SET notes=%s, location_text=%s, scheduled_at=%s, status=%s WHERE id=%s", [notes, location_text, scheduled_at, status_val, post_id])
-    return JsonResponse({'ok': True})
+        return FastJsonResponse({'error':'forbidden'}, status=403)
+    return FastJsonResponse({'ok': True})
 
 @api_view(require_auth=True, methods=['POST'], csrf=False)
 def close_recruit_post(request: HttpRequest, post_id: int, _user=None):
-    rp = query("SELECT * FROM blood_donor_recruit_posts WHERE id=%s", [post_id])
+    rp = query("SELECT owner_user_id FROM blood_donor_recruit_posts WHERE id=%s", [post_id])
     if not rp:
-        return JsonResponse({'error':'not_found'}, status=404)
+        return FastJsonResponse({'error':'not_found'}, status=404)
     if rp['owner_user_id'] != _user['id']:
-        return JsonResponse({'error':'forbidden'}, status=403)
+        return FastJsonResponse({'error':'forbidden'}, status=403)
     execute("UPDATE blood_donor_recruit_posts SET status='closed' WHERE id=%s", [post_id])
-    return JsonResponse({'ok': True})
+    _RECRUIT_LIST_CACHE.clear()
+    return FastJsonResponse({'ok': True})
 
 @api_view(require_auth=True, methods=['POST'], csrf=False)
 def delete_recruit_post(request: HttpRequest, post_id: int, _user=None):
@@ -3455,25 +3540,26 @@ def delete_recruit_post(request: HttpRequest, post_id: int, _user=None):
 
     We use POST to align with other delete-style actions in this API.
     """
-    rp = query("SELECT * FROM blood_donor_recruit_posts WHERE id=%s", [post_id])
+    rp = query("SELECT owner_user_id FROM blood_donor_recruit_posts WHERE id=%s", [post_id])
     if not rp:
-        return JsonResponse({'error':'not_found'}, status=404)
+        return FastJsonResponse({'error':'not_found'}, status=404)
     if rp['owner_user_id'] != _user['id']:
-        return JsonResponse({'error':'forbidden'}, status=403)
+        return FastJsonResponse({'error':'forbidden'}, status=403)
     try:
         # Remove applications first (FKs may not be enforced in this schema)
         execute("DELETE FROM blood_donor_applications WHERE recruit_post_id=%s", [post_id])
         execute("DELETE FROM blood_donor_recruit_posts WHERE id=%s", [post_id])
-        return JsonResponse({'ok': True})
+        _RECRUIT_LIST_CACHE.clear()
+        return FastJsonResponse({'ok': True})
     except Exception as e:
-        return JsonResponse({'error':'db_error', 'detail': str(e)}, status=500)
+        return FastJsonResponse({'error':'db_error', 'detail': str(e)}, status=500)
 
 # Applications
 @api_view(require_auth=True, methods=['POST'], csrf=False)
 def apply_recruit_post(request: HttpRequest, post_id: int, _user=None):
-    rp = query("SELECT * FROM blood_donor_recruit_posts WHERE id=%s", [post_id])
+    rp = query("SELECT owner_user_id, status FROM blood_donor_recruit_posts WHERE id=%s", [post_id])
     if not rp:
-        return JsonResponse({'error':'not_found'}, status=404)
+        return FastJsonResponse({'error':'not_found'}, status=404)
     # Treat NULL/empty/'open'/'active' (any case) as open
     try:
         raw = rp.get('status', 'active') if isinstance(rp, dict) else 'active'
@@ -3482,28 +3568,28 @@ def apply_recruit_post(request: HttpRequest, post_id: int, _user=None):
     status_norm = (str(raw).lower().strip() if raw is not None else 'active')
     is_open = (status_norm in ('', 'open', 'active'))
     if not is_open:
-        return JsonResponse({'error':'closed'}, status=400)
-    data = json.loads(request.body or '{}')
+        return FastJsonResponse({'error':'closed'}, status=400)
+    data = _loads(request.body) if request.body else {}
     availability_at = data.get('availability_at')
     notes = data.get('notes')
-    # Ensure unique application
-    existing = query("SELECT id FROM blood_donor_applications WHERE recruit_post_id=%s AND donor_user_id=%s", [post_id, _user['id']])
-    if existing:
-        return JsonResponse({'error':'already_applied'}, status=400)
-    app_id = execute("INSERT INTO blood_donor_applications(recruit_post_id,donor_user_id,availability_at,notes) VALUES(%s,%s,%s,%s)", [post_id, _user['id'], availability_at, notes])
+    # Unique (recruit_post_id, donor_user_id) key: only a duplicate-key error (1062) means
+    # the donor already applied; any other integrity failure still surfaces
     try:
-        _notify(rp['owner_user_id'], 'donor_applied', {'application_id': app_id, 'post_id': post_id})
-    except Exception:
-        pass
-    return JsonResponse({'id': app_id})
+        app_id = execute("INSERT INTO blood_donor_applications(recruit_post_id,donor_user_id,availability_at,notes) VALUES(%s,%s,%s,%s)", [post_id, _user['id'], availability_at, notes])
+    except DBIntegrityError as e:
+        if e.args and e.args[0] == 1062:
+            return FastJsonResponse({'error':'already_applied'}, status=400)
+        raise
+    _notify_async(rp['owner_user_id'], 'donor_applied', {'application_id': app_id, 'post_id': post_id})
+    return FastJsonResponse({'id': app_id})
 
 @api_view(require_auth=True, methods=['GET'], csrf=False)
 def list_recruit_applications(request: HttpRequest, post_id: int, _user=None):
-    rp = query("SELECT * FROM blood_donor_recruit_posts WHERE id=%s", [post_id])
+    rp = query("SELECT owner_user_id FROM blood_donor_recruit_posts WHERE id=%s", [post_id])
     if not rp:
-        return JsonResponse({'error':'not_found'}, status=404)
+        return FastJsonResponse({'error':'not_found'}, status=404)
     if rp['owner_user_id'] != _user['id']:
-        return JsonResponse({'error':'forbidden'}, status=403)
+        return FastJsonResponse({'error':'forbidden'}, status=403)
     # Enrich with applicant user fields and donor profile blood type
     rows = query(
         """
@@ -3518,61 +3604,69 @@ def list_recruit_applications(request: HttpRequest, post_id: int, _user=None):
         [post_id],
         many=True
     ) or []
-    return JsonResponse({'results': rows})
+    return FastJsonResponse({'results': rows})
 
 @api_view(require_auth=True, methods=['POST'], csrf=False)
 def update_application_status(request: HttpRequest, application_id: int, _user=None):
-    app = query("SELECT * FROM blood_donor_applications WHERE id=%s", [application_id])
+    app = query("SELECT donor_user_id, recruit_post_id FROM blood_donor_applications WHERE id=%s", [application_id])
     if not app:
-        return JsonResponse({'error':'not_found'}, status=404)
-    rp = query("SELECT * FROM blood_donor_recruit_posts WHERE id=%s", [app['recruit_post_id']])
+        return FastJsonResponse({'error':'not_found'}, status=404)
+    rp = query("SELECT owner_user_id, target_blood_type FROM blood_donor_recruit_posts WHERE id=%s", [app['recruit_post_id']])
     if not rp:
-        return JsonResponse({'error':'not_found'}, status=404)
+        return FastJsonResponse({'error':'not_found'}, status=404)
     if rp['owner_user_id'] != _user['id']:
-        return JsonResponse({'error':'forbidden'}, status=403)
-    data = json.loads(request.body or '{}')
+        return FastJsonResponse({'error':'forbidden'}, status=403)
+    data = _loads(request.body) if request.body else {}
     status_val = data.get('status')
     if status_val not in ('pending','accepted','rejected','attended'):
-        return JsonResponse({'error':'invalid_status'}, status=400)
+        return FastJsonResponse({'error':'invalid_status'}, status=400)
     execute("UPDATE blood_donor_applications SET status=%s WHERE id=%s", [status_val, application_id])
     # If accepted, auto-add to bank's donor list
     if status_val == 'accepted':
         try:
-            _ensure_blood_bank_tables()
             # Find bank user id (owner of the recruit post)
             bank_user_id = rp['owner_user_id']
             # Derive blood type: prefer donor's donor_profile if exists; else target_blood_type on post; else skip
-            donor_prof = query("SELECT blood_type FROM donor_profiles WHERE user_id=%s", [app['donor_user_id']])
-            bt = (donor_prof and donor_prof.get('blood_type')) or (rp.get('target_blood_type'))
-            if bt and bt in ('A+','A-','B+','B-','O+','O-','AB+','AB-'):
+            bt = _donor_blood_type(app['donor_user_id']) or rp.get('target_blood_type')
+            if bt and bt in VALID_BLOOD_TYPES:
                 existing = query("SELECT id FROM blood_bank_donors WHERE bank_user_id=%s AND user_id=%s", [bank_user_id, app['donor_user_id']])
                 if not existing:
                     execute("INSERT INTO blood_bank_donors(bank_user_id,user_id,blood_type,notes) VALUES(%s,%s,%s,%s)", [bank_user_id, app['donor_user_id'], bt, 'Recruited via post #' + str(app['recruit_post_id'])])
         except Exception:
             # non-fatal if donor insertion fails
             pass
-    try:
-        _notify(app['donor_user_id'], 'application_status', {'application_id': application_id, 'status': status_val})
-    except Exception:
-        pass
-    return JsonResponse({'ok': True})
+    _notify_async(app['donor_user_id'], 'application_status', {'application_id': application_id, 'status': status_val})
+    return FastJsonResponse({'ok': True})
 
 @api_view(require_auth=True, methods=['GET'], csrf=False)
 def my_applications(request: HttpRequest, _user=None):
-    rows = query("SELECT * FROM blood_donor_applications WHERE donor_user_id=%s ORDER BY created_at DESC", [_user['id']], many=True) or []
-    return JsonResponse({'results': rows})
+    # Include the parent post and its owner so the client needs no per-application fetch
+    rows = query(
+        """
+        SELECT a.*, p.target_blood_type AS post_target_blood_type, p.location_text AS post_location_text,
+               p.scheduled_at AS post_scheduled_at, p.status AS post_status, p.owner_user_id AS post_owner_user_id,
+               u.full_name AS post_owner_name
+        FROM blood_donor_applications a
+        LEFT JOIN blood_donor_recruit_posts p ON p.id = a.recruit_post_id
+        LEFT JOIN users u ON u.id = p.owner_user_id
+        WHERE a.donor_user_id=%s
+        ORDER BY a.created_at DESC
+        """,
+        [_user['id']], many=True
+    ) or []
+    return StreamingResultsResponse(rows)
 
 # Simple overview
 @api_view(methods=['GET'], csrf=False)
 def blood_overview(request: HttpRequest, _user=None):
-    counts = query("SELECT blood_type, COUNT(*) AS c FROM blood_requests WHERE status='open' GROUP BY blood_type", [], many=True) or []
-    return JsonResponse({'open_by_blood_type': counts})
+    counts = query("SELECT blood_type, COUNT(*) AS c FROM blood_requests WHERE status='open' GROUP BY blood_type", [], many=True, using=READ_ALIAS) or []
+    return FastJsonResponse({'open_by_blood_type': counts})
 
 # ============================= BLOOD DIRECT REQUESTS ==========================
 
 # Status values for direct requests and responses
-DIRECT_REQUEST_STATUSES = {'open','accepted','fulfilled','cancelled'}
-DIRECT_RESPONSE_STATUSES = {'pending','accepted','declined','cancelled'}
+DIRECT_REQUEST_STATUSES = frozenset(('open','accepted','fulfilled','cancelled'))
+DIRECT_RESPONSE_STATUSES = frozenset(('pending','accepted','declined','cancelled'))
 
 @api_view(require_auth=True, methods=['POST'], csrf=False)
 def create_blood_direct_request(request: HttpRequest, _user=None):
@@ -3583,16 +3677,16 @@ def create_blood_direct_request(request: HttpRequest, _user=None):
     donor_profiles for potential donors to discover/respond.
     Returns: { id }
     """
-    data = json.loads(request.body or '{}')
-    bt = (data.get('target_blood_type') or '').upper().strip()
+    data = _loads(request.body) if request.body else {}
+    bt = _norm_bt(data.get('target_blood_type'))
     if bt not in VALID_BLOOD_TYPES:
-        return JsonResponse({'error':'invalid_blood_type'}, status=400)
+        return FastJsonResponse({'error':'invalid_blood_type'}, status=400)
     qty = int(data.get('quantity_units') or 1)
     if qty < 1:
         qty = 1
     notes = data.get('notes')
     rid = execute("INSERT INTO blood_direct_requests(requester_user_id,target_blood_type,quantity_units,notes) VALUES(%s,%s,%s,%s)", [_user['id'], bt, qty, notes])
-    return JsonResponse({'id': rid})
+    return FastJsonResponse({'id': rid})
 
 @api_view(methods=['GET'], csrf=False)
 def list_blood_direct_requests(request: HttpRequest, _user=None):
@@ -3606,27 +3700,59 @@ def list_blood_direct_requests(request: HttpRequest, _user=None):
     requester = request.GET.get('requester_user_id')
     where=[]; params=[]
     if bt:
-        where.append('target_blood_type=%s'); params.append(bt.upper())
+        where.append('r.target_blood_type=%s'); params.append(bt.upper())
     if status_f:
-        where.append('status=%s'); params.append(status_f)
+        where.append('r.status=%s'); params.append(status_f)
     if requester:
-        where.append('requester_user_id=%s'); params.append(requester)
-    sql = 'SELECT * FROM blood_direct_requests'
+        where.append('r.requester_user_id=%s'); params.append(requester)
+    sql = (
+        'SELECT r.*, u.full_name AS requester_name, u.avatar_url AS requester_avatar_url '
+        'FROM blood_direct_requests r '
+        'LEFT JOIN users u ON u.id = r.requester_user_id'
+    )
     if where:
         sql += ' WHERE ' + ' AND '.join(where)
-    sql += ' ORDER BY created_at DESC LIMIT 200'
-    rows = query(sql, params, many=True) or []
-    return JsonResponse({'results': rows})
+    sql += ' ORDER BY r.created_at DESC LIMIT 200'
+    rows = query(sql, params, many=True, using=READ_ALIAS) or []
+    return StreamingResultsResponse(rows)
 
 @api_view(methods=['GET'], csrf=False)
 def get_blood_direct_request(request: HttpRequest, request_id: int, _user=None):
-    row = query("SELECT * FROM blood_direct_requests WHERE id=%s", [request_id])
-    if not row:
-        return JsonResponse({'error':'not_found'}, status=404)
+    # Request + responses in one round trip: one row per response (or a single
+    # row with NULL response columns when nobody has responded yet).
+    rows = query(
+        """
+        SELECT r.*, u.full_name AS requester_name,
+               resp.id AS resp_id, resp.donor_user_id AS resp_donor_user_id, resp.status AS resp_status,
+               resp.message AS resp_message, resp.created_at AS resp_created_at,
+               du.full_name AS resp_donor_name, dp.blood_type AS resp_donor_blood_type
+        FROM blood_direct_requests r
+        LEFT JOIN users u ON u.id = r.requester_user_id
+        LEFT JOIN blood_direct_request_responses resp ON resp.request_id = r.id
+        LEFT JOIN users du ON du.id = resp.donor_user_id
+        LEFT JOIN donor_profiles dp ON dp.user_id = resp.donor_user_id
+        WHERE r.id=%s
+        ORDER BY resp.id ASC
+        """,
+        [request_id], many=True
+    ) or []
+    if not rows:
+        return FastJsonResponse({'error':'not_found'}, status=404)
     # Attach responses (public but minimal fields)
-    responses = query("SELECT id,donor_user_id,status,message,created_at FROM blood_direct_request_responses WHERE request_id=%s ORDER BY id ASC", [request_id], many=True) or []
-    row['responses'] = responses
-    return JsonResponse(row)
+    row = {k: v for k, v in rows[0].items() if not k.startswith('resp_')}
+    row['responses'] = [
+        {
+            'id': r['resp_id'],
+            'donor_user_id': r['resp_donor_user_id'],
+            'status': r['resp_status'],
+            'message': r['resp_message'],
+            'created_at': r['resp_created_at'],
+            'donor_name': r['resp_donor_name'],
+            'donor_blood_type': r['resp_donor_blood_type'],
+        }
+        for r in rows if r['resp_id'] is not None
+    ]
+    return FastJsonResponse(row)
 
 @api_view(require_auth=True, methods=['POST'], csrf=False)
 def respond_blood_direct_request(request: HttpRequest, request_id: int, _user=None):
@@ -3638,12 +3764,11 @@ def respond_blood_direct_request(request: HttpRequest, request_id: int, _user=No
     """
     req = query("SELECT * FROM blood_direct_requests WHERE id=%s", [request_id])
     if not req:
-        return JsonResponse({'error':'not_found'}, status=404)
+        return FastJsonResponse({'error':'not_found'}, status=404)
     if req['status'] not in ('open',):
-        return JsonResponse({'error':'not_open'}, status=400)
-    donor_prof = query("SELECT blood_type FROM donor_profiles WHERE user_id=%s", [_user['id']])
-    if not donor_prof or donor_prof['blood_type'] != req['target_blood_type']:
-        return JsonResponse({'error':'blood_type_mismatch'}, status=400)
+        return FastJsonResponse({'error':'not_open'}, status=400)
+    if _donor_blood_type(_user['id']) != req['target_blood_type']:
+        return FastJsonResponse({'error':'blood_type_mismatch'}, status=400)
     existing = query("SELECT id,status FROM blood_direct_request_responses WHERE request_id=%s AND donor_user_id=%s", [request_id, _user['id']])
     if existing:
         if existing['status'] in ('cancelled','declined'):
@@ -3651,17 +3776,14 @@ def respond_blood_direct_request(request: HttpRequest, request_id: int, _user=No
             execute("UPDATE blood_direct_request_responses SET status='pending' WHERE id=%s", [existing['id']])
             resp_id = existing['id']
         else:
-            return JsonResponse({'error':'already_responded'}, status=400)
+            return FastJsonResponse({'error':'already_responded'}, status=400)
     else:
-        data = json.loads(request.body or '{}')
+        data = _loads(request.body) if request.body else {}
         message = _limit_str(data.get('message','') or None, 500) if data.get('message') else None
         resp_id = execute("INSERT INTO blood_direct_request_responses(request_id,donor_user_id,message) VALUES(%s,%s,%s)", [request_id, _user['id'], message])
     # notify requester
-    try:
-        _notify(req['requester_user_id'], 'blood_direct_response', {'request_id': request_id, 'response_id': resp_id, 'donor_user_id': _user['id']})
-    except Exception:
-        pass
-    return JsonResponse({'id': resp_id})
+    _notify_async(req['requester_user_id'], 'blood_direct_response', {'request_id': request_id, 'response_id': resp_id, 'donor_user_id': _user['id']})
+    return FastJsonResponse({'id': resp_id})
 
 @api_view(require_auth=True, methods=['POST'], csrf=False)
 def change_blood_direct_request_status(request: HttpRequest, request_id: int, _user=None):
@@ -3674,45 +3796,40 @@ def change_blood_direct_request_status(request: HttpRequest, request_id: int, _u
     """
     req = query("SELECT * FROM blood_direct_requests WHERE id=%s", [request_id])
     if not req:
-        return JsonResponse({'error':'not_found'}, status=404)
-    data = json.loads(request.body or '{}')
+        return FastJsonResponse({'error':'not_found'}, status=404)
+    data = _loads(request.body) if request.body else {}
     # response-specific path
     if 'response_id' in data:
         if req['requester_user_id'] != _user['id']:
-            return JsonResponse({'error':'forbidden'}, status=403)
+            return FastJsonResponse({'error':'forbidden'}, status=403)
         resp_id = int(data.get('response_id'))
         new_r_status = data.get('response_status')
         if new_r_status not in ('accepted','declined','cancelled'):
-            return JsonResponse({'error':'invalid_response_status'}, status=400)
+            return FastJsonResponse({'error':'invalid_response_status'}, status=400)
         resp = query("SELECT * FROM blood_direct_request_responses WHERE id=%s AND request_id=%s", [resp_id, request_id])
         if not resp:
-            return JsonResponse({'error':'response_not_found'}, status=404)
+            return FastJsonResponse({'error':'response_not_found'}, status=404)
         if resp['status'] in ('accepted','declined') and new_r_status != 'cancelled':
-            return JsonResponse({'error':'immutable_response'}, status=400)
+            return FastJsonResponse({'error':'immutable_response'}, status=400)
         execute("UPDATE blood_direct_request_responses SET status=%s WHERE id=%s", [new_r_status, resp_id])
         # If accepted, set request status=accepted (unless already fulfilled/cancelled)
         if new_r_status == 'accepted' and req['status'] == 'open':
             execute("UPDATE blood_direct_requests SET status='accepted' WHERE id=%s", [request_id])
-            try:
-                _notify(resp['donor_user_id'], 'blood_direct_response_accepted', {'request_id': request_id, 'response_id': resp_id})
-            except Exception:
-                pass
-        return JsonResponse({'ok': True})
+            _notify_async(resp['donor_user_id'], 'blood_direct_response_accepted', {'request_id': request_id, 'response_id': resp_id})
+        return FastJsonResponse({'ok': True})
     # request-level status change
     new_status = data.get('status')
     if new_status not in ('fulfilled','cancelled'):
-        return JsonResponse({'error':'invalid_status'}, status=400)
+        return FastJsonResponse({'error':'invalid_status'}, status=400)
     if req['requester_user_id'] != _user['id']:
-        return JsonResponse({'error':'forbidden'}, status=403)
+        return FastJsonResponse({'error':'forbidden'}, status=403)
     if req['status'] in ('fulfilled','cancelled'):
-        return JsonResponse({'error':'immutable'}, status=400)
+        return FastJsonResponse({'error':'immutable'}, status=400)
     execute("UPDATE blood_direct_requests SET status=%s WHERE id=%s", [new_status, request_id])
-    return JsonResponse({'ok': True})
+    return FastJsonResponse({'ok': True})
 
 # ============================= DONOR PROFILES ==================================
 
-VALID_BLOOD_TYPES = {'A+','A-','B+','B-','O+','O-','AB+','AB-'}
-
 @api_view(require_auth=True, methods=['POST'], csrf=False)
 def upsert_donor_profile(request: HttpRequest, _user=None):
     """Create or update the authenticated user's donor profile.
@@ -3720,30 +3837,38 @@ def upsert_donor_profile(request: HttpRequest, _user=None):
     Body: { blood_type, availability_text?, last_donation_date?, notes? }
     Returns: { ok: true }
     """
-    data = json.loads(request.body or '{}')
-    bt = (data.get('blood_type') or '').upper().strip()
+    data = _loads(request.body) if request.body else {}
+    bt = _norm_bt(data.get('blood_type'))
     if bt not in VALID_BLOOD_TYPES:
-        return JsonResponse({'error':'invalid_blood_type'}, status=400)
+        return FastJsonResponse({'error':'invalid_blood_type'}, status=400)
     availability_text = _limit_str(data.get('availability_text') or None, 255)
     last_donation_date = data.get('last_donation_date')  # Expect YYYY-MM-DD
     notes = data.get('notes')
     # Columns cooldown_until and availability_status are defined in the final schema.
     cooldown_until = data.get('cooldown_until')  # optional ISO
     availability_status = data.get('availability_status')  # optional
-    # Determine if profile exists
-    existing = query("SELECT id FROM donor_profiles WHERE user_id=%s", [_user['id']])
-    if existing:
-        execute("UPDATE donor_profiles SET blood_type=%s, availability_text=%s, last_donation_date=%s, notes=%s, cooldown_until=COALESCE(%s, cooldown_until), availability_status=COALESCE(%s, availability_status) WHERE user_id=%s", [bt, availability_text, last_donation_date, notes, cooldown_until, availability_status, _user['id']])
-    else:
-        execute("INSERT INTO donor_profiles(user_id,blood_type,availability_text,last_donation_date,notes,cooldown_until,availability_status) VALUES(%s,%s,%s,%s,%s,%s,%s)", [_user['id'], bt, availability_text, last_donation_date, notes, cooldown_until, availability_status])
-    return JsonResponse({'ok': True})
+    # Upsert on the UNIQUE user_id; cooldown fields keep their stored value when not provided
+    execute(
+        """
+        INSERT INTO donor_profiles(user_id,blood_type,availability_text,last_donation_date,notes,cooldown_until,availability_status)
+        VALUES(%s,%s,%s,%s,%s,%s,%s)
+        ON DUPLICATE KEY UPDATE blood_type=VALUES(blood_type), availability_text=VALUES(availability_text),
+            last_donation_date=VALUES(last_donation_date), notes=VALUES(notes),
+            cooldown_until=COALESCE(VALUES(cooldown_until), cooldown_until),
+            availability_status=COALESCE(VALUES(availability_status), availability_status)
+        """,
+        [_user['id'], bt, availability_text, last_donation_date, notes, cooldown_until, availability_status]
+    )
+    _DONOR_COOLDOWN_CACHE.pop(_user['id'], None)
+    _DONOR_BLOOD_TYPE_CACHE.pop(_user['id'])
+    return FastJsonResponse({'ok': True})
 
 @api_view(require_auth=True, methods=['GET'], csrf=False)
 def my_donor_profile(request: HttpRequest, _user=None):
     row = query("SELECT user_id,blood_type,availability_text,last_donation_date,notes,cooldown_until,availability_status,created_at,updated_at FROM donor_profiles WHERE user_id=%s", [_user['id']])
     if not row:
-        return JsonResponse({'profile': None})
-    return JsonResponse({'profile': row})
+        return FastJsonResponse({'profile': None})
+    return FastJsonResponse({'profile': row})
 
 @api_view(require_auth=True, methods=['POST'], csrf=False)
 def set_donor_availability(request: HttpRequest, _user=None):
@@ -3751,18 +3876,19 @@ def set_donor_availability(request: HttpRequest, _user=None):
     - available: clears cooldown_until
     - cooldown: sets cooldown_until = now + days (default 10)
     """
-    data = json.loads(request.body or '{}')
+    data = _loads(request.body) if request.body else {}
     status = (data.get('status') or '').strip().lower()
     if status not in ('available','cooldown'):
-        return JsonResponse({'error':'invalid_status'}, status=400)
+        return FastJsonResponse({'error':'invalid_status'}, status=400)
     # Columns are present per final schema.
     # Ensure profile exists (must have blood type set first)
     prof = query("SELECT id,blood_type FROM donor_profiles WHERE user_id=%s", [_user['id']])
     if not prof:
-        return JsonResponse({'error':'no_profile'}, status=400)
+        return FastJsonResponse({'error':'no_profile'}, status=400)
     if status == 'available':
         execute("UPDATE donor_profiles SET availability_status='available', cooldown_until=NULL WHERE user_id=%s", [_user['id']])
-        return JsonResponse({'ok': True, 'availability_status':'available'})
+        _DONOR_COOLDOWN_CACHE.pop(_user['id'], None)
+        return FastJsonResponse({'ok': True, 'availability_status':'available'})
     # cooldown path
     try:
         days = int(data.get('days') or 10)
@@ -3770,30 +3896,128 @@ def set_donor_availability(request: HttpRequest, _user=None):
     except Exception:
         days = 10
     # Compute until in Python for portability
-    from datetime import datetime, timedelta
     until = (datetime.now() + timedelta(days=days)).strftime('%Y-%m-%d %H:%M:%S')
     execute("UPDATE donor_profiles SET availability_status='cooldown', cooldown_until=%s WHERE user_id=%s", [until, _user['id']])
-    return JsonResponse({'ok': True, 'availability_status':'cooldown', 'cooldown_until': until})
+    _DONOR_COOLDOWN_CACHE.pop(_user['id'], None)
+    return FastJsonResponse({'ok': True, 'availability_status':'cooldown', 'cooldown_until': until})
 
 @api_view(methods=['GET'], csrf=False)
 def donor_profiles_search(request: HttpRequest, _user=None):
     """Public search by blood_type.
     Query params: blood_type (required), limit (<=200)
     """
-    bt = (request.GET.get('blood_type') or '').upper().strip()
+    bt = _norm_bt(request.GET.get('blood_type'))
     if bt not in VALID_BLOOD_TYPES:
-        return JsonResponse({'results': []})
+        return FastJsonResponse({'results': []})
     try:
         limit = int(request.GET.get('limit') or 50)
     except Exception:
         limit = 50
     limit = max(1, min(limit, 200))
-    rows = query(f"SELECT user_id,blood_type,availability_text,last_donation_date FROM donor_profiles WHERE blood_type=%s ORDER BY updated_at DESC LIMIT {limit}", [bt], many=True) or []
-    return JsonResponse({'results': rows})
+    rows = query("SELECT user_id,blood_type,availability_text,last_donation_date FROM donor_profiles WHERE blood_type=%s ORDER BY updated_at DESC LIMIT %s", [bt, limit], many=True) or []
+    return FastJsonResponse({'results': rows})
 
 
 # ============================= GEO LOCATION (Feature 32) ==============================
 
+def _haversine_h_sql(lat_col: str, lng_col: str) -> str:
+    """SQL for the haversine term h = (chord / 2)^2 between a point and lat_col/lng_col.
+
+    h is monotonic in distance, so "within R km" is h <= sin^2(R / (2 * 6371)): a radius
+    test without ASIN/SQRT per row. Binds three parameters: point lat, point lat, point lng.
+    """
+    return (
+        f"(POWER(SIN(RADIANS({lat_col} - %s) / 2), 2) + "
+        f"COS(RADIANS(%s)) * COS(RADIANS({lat_col})) * POWER(SIN(RADIANS({lng_col} - %s) / 2), 2))"
+    )
+
+def _haversine_sql(lat_col: str, lng_col: str) -> str:
+    """SQL expression for the great-circle distance (km) from a point to lat_col/lng_col.
+
+    Binds the same three parameters as _haversine_h_sql. LEAST(1, ..) keeps ASIN in its
+    domain when rounding pushes the operand just over 1.
+    """
+    return f"(6371 * 2 * ASIN(LEAST(1, SQRT({_haversine_h_sql(lat_col, lng_col)}))))"
+
+# Active crisis centres for the proximity notify, as
+# (crisis_id, lat_rad, lng_rad, cos_lat, h_max) with h_max = sin²(radius/2R),
+# reloaded at most every _ACTIVE_CRISES_TTL seconds per process. Every location update
+# reads this, while crises open/close rarely; a new crisis is picked up within the TTL.
+_ACTIVE_CRISES_CACHE = { 'ts': 0.0, 'rows': [] }
+_ACTIVE_CRISES_TTL = 30
+_ACTIVE_CRISES_LOCK = threading.Lock()
+
+def _active_crises():
+    now = time.time()
+    if now - _ACTIVE_CRISES_CACHE['ts'] < _ACTIVE_CRISES_TTL:
+        return _ACTIVE_CRISES_CACHE['rows']
+    with _ACTIVE_CRISES_LOCK:
+        if now - _ACTIVE_CRISES_CACHE['ts'] < _ACTIVE_CRISES_TTL:
+            return _ACTIVE_CRISES_CACHE['rows']
+        # Crises treating 'open' and 'monitoring' as active
+        rows = query(
+            """
+            SELECT c.id AS crisis_id, i.lat, i.lng, COALESCE(c.radius_km, 5.0) AS radius_km
+            FROM crises c
+            JOIN incidents i ON i.id=c.incident_id
+            WHERE i.status IN ('open','monitoring') AND i.lat IS NOT NULL AND i.lng IS NOT NULL
+            """,
+            many=True
+        ) or []
+        out = []
+        for r in rows:
+            lat_r = math.radians(float(r['lat']))
+            radius = float(r['radius_km'])
+            out.append((int(r['crisis_id']), lat_r, math.radians(float(r['lng'])), math.cos(lat_r),
+                        geo.radius_h(radius)))
+        _ACTIVE_CRISES_CACHE['rows'] = out
+        _ACTIVE_CRISES_CACHE['ts'] = now
+        return out
+
+def _notify_nearby_crises(user_id: int, lat: float, lng: float):
+    """Notify a user of active crises whose radius covers (lat, lng).
+
+    Runs off the request path (see update_location); the 24h unread de-dupe lives in
+    the notifications table, so repeated or concurrent runs stay idempotent.
+    """
+    # Haversine against the cached crisis centres; the radius test compares the
+    # haversine term h, and distance is only computed for the matches.
+    lat_r, lng_r = math.radians(lat), math.radians(lng)
+    cos_lat = math.cos(lat_r)
+    matches = []
+    for cid, c_lat, c_lng, c_cos, h_max in _active_crises():
+        h = math.sin((c_lat - lat_r) / 2) ** 2 + cos_lat * c_cos * math.sin((c_lng - lng_r) / 2) ** 2
+        if h <= h_max:
+            matches.append((cid, geo.h_to_km(h)))
+    if not matches:
+        return
+    # De-dupe: skip crises that already have an unread notification from the last 24h,
+    # looked up for all matched crises in one query. payload_crisis_id (idx_notif_crisis)
+    # comes from hotfix_add_notification_crisis_index.sql; without it, extract from the JSON.
+    ids = [cid for cid, _ in matches]
+    if _has_column('notifications', 'payload_crisis_id'):
+        cid_expr = 'payload_crisis_id'
+    else:
+        cid_expr = "CAST(JSON_EXTRACT(payload,'$.crisis_id') AS UNSIGNED)"
+    try:
+        seen = query(
+            f"""
+            SELECT DISTINCT {cid_expr} AS cid
+            FROM notifications
+            WHERE user_id=%s AND type='potential_victim_detected'
+              AND {cid_expr} IN ({_in_placeholders(len(ids))})
+              AND is_read=0 AND created_at >= NOW() - INTERVAL 1 DAY
+            """,
+            [user_id, *ids], many=True
+        ) or []
+    except Exception:
+        return  # unknown what was already sent; skip rather than re-notify every crisis
+    already = {int(x['cid']) for x in seen if x.get('cid') is not None}
+    _notify_many(
+        (user_id, 'potential_victim_detected', {'crisis_id': cid, 'distance_km': round(dist, 2)})
+        for cid, dist in matches if cid not in already
+    )
+
 @api_view(require_auth=True, methods=['POST'], csrf=False)
 def update_location(request: HttpRequest, _user=None):
     """Update the authenticated user's current lat/lng and insert a history record.
@@ -3802,79 +4026,26 @@ def update_location(request: HttpRequest, _user=None):
     Effects: updates users.last_lat/last_lng (if columns exist) and inserts row into user_locations.
     Returns: { ok: true }
     """
-    data = json.loads(request.body or '{}')
+    data = _loads(request.body) if request.body else {}
     try:
         lat = float(data.get('lat'))
         lng = float(data.get('lng'))
     except Exception:
-        return JsonResponse({'error':'invalid_coordinates'}, status=400)
+        return FastJsonResponse({'error':'invalid_coordinates'}, status=400)
     if not (-90 <= lat <= 90 and -180 <= lng <= 180):
-        return JsonResponse({'error':'out_of_range'}, status=400)
+        return FastJsonResponse({'error':'out_of_range'}, status=400)
     source = data.get('source')
-    # Update user (best-effort; ignore if columns missing)
-    try:
-        execute("UPDATE users SET last_lat=%s, last_lng=%s WHERE id=%s", [lat, lng, _user['id']])
-    except Exception:
-        pass
-    # Insert history
+    # Last-known position (skipped if the columns are missing) and history row, committed together
     try:
-        execute("INSERT INTO user_locations(user_id,lat,lng,source) VALUES(%s,%s,%s,%s)", [_user['id'], lat, lng, source])
+        with transaction.atomic():
+            if _has_column('users', 'last_lat'):
+                execute("UPDATE users SET last_lat=%s, last_lng=%s WHERE id=%s", [lat, lng, _user['id']])
+            execute("INSERT INTO user_locations(user_id,lat,lng,source) VALUES(%s,%s,%s,%s)", [_user['id'], lat, lng, source])
     except Exception as e:
-        return JsonResponse({'error':'persist_failed','detail':str(e)}, status=500)
-    # After recording location, opportunistically notify user if within any active crisis radius
-    try:
-        # Import lazily to avoid circulars and keep this endpoint fast when notifications are disabled
-        from .utils import _notify, _ensure_notifications_table
-        _ensure_notifications_table()
-        # Fetch crises with coordinates; treat 'open' and 'monitoring' as active
-        rows = query(
-            """
-            SELECT c.id AS crisis_id, COALESCE(c.radius_km, 5.0) AS radius_km, i.lat, i.lng
-            FROM crises c
-            JOIN incidents i ON i.id=c.incident_id
-            WHERE i.lat IS NOT NULL AND i.lng IS NOT NULL AND i.status IN ('open','monitoring')
-            LIMIT 500
-            """,
-            [], many=True
-        ) or []
-        import math
-        def hav(a_lat, a_lng, b_lat, b_lng):
-            R = 6371.0
-            dlat = math.radians(b_lat - a_lat)
-            dlng = math.radians(b_lng - a_lng)
-            alat = math.radians(a_lat); blat = math.radians(b_lat)
-            h = math.sin(dlat/2)**2 + math.cos(alat)*math.cos(blat)*math.sin(dlng/2)**2
-            return 2 * R * math.asin(math.sqrt(h))
-        # Check each crisis; if within radius, create a notification unless one exists recently
-        for r in rows:
-            try:
-                d = hav(float(r['lat']), float(r['lng']), float(lat), float(lng))
-                if d <= float(r['radius_km']) + 1e-6:
-                    # De-dupe: avoid spamming same crisis notification if an unread exists from last 24h
-                    try:
-                        existing = query(
-                            """
-                            SELECT id FROM notifications
-                            WHERE user_id=%s AND type='potential_victim_detected'
-                              AND JSON_EXTRACT(payload,'$.crisis_id')=%s AND is_read=0
-                              AND created_at >= NOW() - INTERVAL 1 DAY
-                            LIMIT 1
-                            """,
-                            [_user['id'], int(r['crisis_id'])]
-                        )
-                    except Exception:
-                        existing = None
-                    if not existing:
-                        _notify(_user['id'], 'potential_victim_detected', {
-                            'crisis_id': int(r['crisis_id']),
-                            'distance_km': round(d, 2),
-                        })
-            except Exception:
-                continue
-    except Exception:
-        # Non-fatal; location update should still succeed
-        pass
-    return JsonResponse({'ok': True})
+        return FastJsonResponse({'error':'persist_failed','detail':str(e)}, status=500)
+    # Crisis proximity check + notify runs in the background; the response doesn't depend on it
+    _run_in_background(_notify_nearby_crises, _user['id'], lat, lng)
+    return FastJsonResponse({'ok': True})
 
 @api_view(methods=['GET'], csrf=False)
 def nearby_users(request: HttpRequest, _user=None):
@@ -3882,79 +4053,112 @@ def nearby_users(request: HttpRequest, _user=None):
 
     Query params: lat, lng, radius_km?
     Returns: { results: [ { user_id, lat, lng, distance_km } ] }
-    Implementation: Uses latest user_locations row per user (by captured_at) via subquery, then Python post-filter for accuracy.
+    Implementation: Uses latest user_locations row per user (by captured_at) via ROW_NUMBER(); bounding
+    box narrows candidates, then the haversine term filters and distance orders them in SQL.
     """
     try:
         lat = float(request.GET.get('lat'))
         lng = float(request.GET.get('lng'))
     except Exception:
-        return JsonResponse({'error':'invalid_coordinates'}, status=400)
+        return FastJsonResponse({'error':'invalid_coordinates'}, status=400)
     try:
         radius_km = float(request.GET.get('radius_km') or 5.0)
     except Exception:
         radius_km = 5.0
     # Allow larger search radii (up to 500km) to accommodate broader queries in tests / future features.
     radius_km = max(0.1, min(radius_km, 500.0))
-    # Rough bounding box to limit candidate set (1 deg lat ~=111km, lng scales by cos(lat))
-    lat_delta = radius_km / 111.0
-    import math
-    lng_delta = radius_km / (111.0 * max(math.cos(math.radians(lat)), 0.0001))
-    min_lat, max_lat = lat - lat_delta, lat + lat_delta
-    min_lng, max_lng = lng - lng_delta, lng + lng_delta
-    # Pull latest location per user using self-join for max captured_at
+    # Bounding box of the spherical cap: the latitude span is the angular radius, the
+    # longitude half-width is asin(sin(ang)/cos(lat)). When the cap reaches a pole or
+    # crosses the antimeridian the box degenerates to the whole latitude band.
+    ang = radius_km / 6371.0
+    lat_delta = math.degrees(ang)
+    min_lat, max_lat = max(-90.0, lat - lat_delta), min(90.0, lat + lat_delta)
+    cos_lat = math.cos(math.radians(min(abs(lat), 89.0)))
+    ratio = math.sin(ang) / cos_lat
+    if abs(lat) + lat_delta >= 90.0 or ratio >= 1.0:
+        min_lng, max_lng = -180.0, 180.0
+    else:
+        lng_delta = math.degrees(math.asin(ratio))
+        min_lng, max_lng = lng - lng_delta, lng + lng_delta
+        if min_lng < -180.0 or max_lng > 180.0:
+            min_lng, max_lng = -180.0, 180.0
+    # Users with any fix inside the box (idx_userloc_lat_lng), ranked once by ROW_NUMBER to find
+    # each one's latest fix (idx_userloc_user_time); that fix must itself be inside the radius.
     rows = query(
-        """
-        SELECT Distinct ul.user_id, ul.lat, ul.lng, ul.captured_at
-        FROM user_locations ul
-        JOIN users u ON u.id = ul.user_id
-        WHERE u.role IN ('regular','admin')
-          AND ul.id = (
-              SELECT ul2.id
-              FROM user_locations ul2
-              WHERE ul2.user_id = ul.user_id
-              ORDER BY ul2.captured_at DESC, ul2.id DESC
-              LIMIT 1
-          )
-          AND ul.lat BETWEEN %s AND %s
-          AND ul.lng BETWEEN %s AND %s
-        LIMIT 500
+        f"""
+        WITH latest AS (
+            SELECT ul.user_id, ul.lat, ul.lng,
+                   ROW_NUMBER() OVER (PARTITION BY ul.user_id ORDER BY ul.captured_at DESC, ul.id DESC) AS rn
+            FROM user_locations ul
+            WHERE ul.user_id IN (
+                SELECT user_id FROM user_locations
+                WHERE lat BETWEEN %s AND %s AND lng BETWEEN %s AND %s
+            )
+        )
+        SELECT l.user_id, l.lat, l.lng,
+               {_haversine_sql('l.lat', 'l.lng')} AS distance_km
+        FROM latest l
+        JOIN users u ON u.id = l.user_id
+        WHERE l.rn = 1
+          AND u.role IN ('regular','admin')
+          AND l.lat BETWEEN %s AND %s
+          AND l.lng BETWEEN %s AND %s
+          AND {_haversine_h_sql('l.lat', 'l.lng')} <= %s
+        ORDER BY distance_km
+        LIMIT 100
         """,
-        [min_lat, max_lat, min_lng, max_lng], many=True
+        [min_lat, max_lat, min_lng, max_lng, lat, lat, lng, min_lat, max_lat, min_lng, max_lng,
+         lat, lat, lng, geo.radius_h(radius_km + 1e-6)], many=True
     ) or []
-    # Haversine filter
-    def hav(a_lat, a_lng, b_lat, b_lng):
-        R = 6371.0
-        dlat = math.radians(b_lat - a_lat)
-        dlng = math.radians(b_lng - a_lng)
-        alat = math.radians(a_lat); blat = math.radians(b_lat)
-        h = math.sin(dlat/2)**2 + math.cos(alat)*math.cos(blat)*math.sin(dlng/2)**2
-        return 2 * R * math.asin(math.sqrt(h))
-    results = []
-    for r in rows:
-        d = hav(lat, lng, float(r['lat']), float(r['lng']))
-        if d <= radius_km + 1e-6:
-            results.append({'user_id': r['user_id'], 'lat': float(r['lat']), 'lng': float(r['lng']), 'distance_km': round(d, 2)})
-    # Sort by distance
-    results.sort(key=lambda x: x['distance_km'])
-    return JsonResponse({'results': results[:100], 'count': len(results[:100])})
+    results = [
+        {'user_id': r['user_id'], 'lat': float(r['lat']), 'lng': float(r['lng']), 'distance_km': round(float(r['distance_km']), 2)}
+        for r in rows
+    ]
+    return FastJsonResponse({'results': results, 'count': len(results)})
 
 # ============================= CRISIS BLOOD BANK INTEGRATIONS ==============================
 
+def _load_crisis_with_membership(crisis_id: int, user_id: int):
+    """Return (crisis_row, is_participant) for the crisis-scoped blood bank endpoints.
+
+    One query loads the crisis' incident_id and incident_status plus whether user_id is
+    an active participant of that incident. crisis_row is None when the crisis is missing.
+    """
+    row = query(
+        """
+        SELECT c.incident_id, i.status AS incident_status, p.id AS part_id
+        FROM crises c
+        LEFT JOIN incidents i ON i.id = c.incident_id
+        LEFT JOIN incident_participants p
+               ON p.incident_id = c.incident_id AND p.user_id=%s AND p.status='active'
+        WHERE c.id=%s
+        LIMIT 1
+        """,
+        [user_id, crisis_id]
+    )
+    if not row:
+        return None, False
+    return row, row.get('part_id') is not None
+
+def _crisis_closed_response(cr):
+    """crisis_closed error for a row from _load_crisis_with_membership, else None."""
+    st = (cr or {}).get('incident_status')
+    if st in ('closed','cancelled'):
+        return FastJsonResponse({'error':'crisis_closed','status': st}, status=400)
+    return None
+
 @api_view(require_auth=True, methods=['GET'], csrf=False)
 def crisis_blood_donors_list(request: HttpRequest, crisis_id: int, _user=None):
     """List crisis-linked donors for the calling blood bank user. Admin can view all by ?all=1."""
-    _ensure_crisis_tables()
-    cr = query("SELECT incident_id FROM crises WHERE id=%s", [crisis_id])
+    cr, is_participant = _load_crisis_with_membership(crisis_id, _user['id'])
     if not cr:
-        return JsonResponse({'error':'not_found'}, status=404)
+        return FastJsonResponse({'error':'not_found'}, status=404)
     is_admin = _require_admin(_user)
     if not is_admin and not _require_blood_bank(_user):
-        return JsonResponse({'error':'forbidden'}, status=403)
+        return FastJsonResponse({'error':'forbidden'}, status=403)
     # Must be a participant of the incident unless admin
-    if not is_admin:
-        part = query("SELECT id FROM incident_participants WHERE incident_id=%s AND user_id=%s AND status='active'", [cr['incident_id'], _user['id']])
-        if not part:
-            return JsonResponse({'error':'forbidden'}, status=403)
+    if not is_admin and not is_participant:
+        return FastJsonResponse({'error':'forbidden'}, status=403)
     all_flag = str(request.GET.get('all') or '').lower() in ('1','true','yes')
     if is_admin and all_flag:
         rows = query(
@@ -3980,7 +4184,7 @@ def crisis_blood_donors_list(request: HttpRequest, crisis_id: int, _user=None):
             """,
             [crisis_id, _user['id']], many=True
         ) or []
-    return JsonResponse({'results': rows})
+    return FastJsonResponse({'results': rows})
 
 @api_view(require_auth=True, methods=['POST'], csrf=False)
 def crisis_blood_donors_add(request: HttpRequest, crisis_id: int, _user=None):
@@ -3988,32 +4192,30 @@ def crisis_blood_donors_add(request: HttpRequest, crisis_id: int, _user=None):
     Body: { donor_user_id, blood_type?, notes? }
     If blood_type omitted, attempts to use bank donor record blood_type.
     """
-    _ensure_crisis_tables(); _ensure_blood_bank_tables()
-    ok, err = _require_crisis_open(crisis_id)
-    if not ok:
-        return err
-    cr = query("SELECT incident_id FROM crises WHERE id=%s", [crisis_id])
+    cr, is_participant = _load_crisis_with_membership(crisis_id, _user['id'])
     if not cr:
-        return JsonResponse({'error':'not_found'}, status=404)
-    if not (_require_admin(_user) or _require_blood_bank(_user)):
-        return JsonResponse({'error':'forbidden'}, status=403)
+        return FastJsonResponse({'error':'not_found'}, status=404)
+    closed = _crisis_closed_response(cr)
+    if closed:
+        return closed
+    is_admin = _require_admin(_user)
+    if not (is_admin or _require_blood_bank(_user)):
+        return FastJsonResponse({'error':'forbidden'}, status=403)
     # Must be incident participant when bank user
-    if not _require_admin(_user):
-        part = query("SELECT id FROM incident_participants WHERE incident_id=%s AND user_id=%s AND status='active'", [cr['incident_id'], _user['id']])
-        if not part:
-            return JsonResponse({'error':'forbidden'}, status=403)
-    data = json.loads(request.body or '{}')
+    if not is_admin and not is_participant:
+        return FastJsonResponse({'error':'forbidden'}, status=403)
+    data = _loads(request.body) if request.body else {}
     try:
         donor_user_id = int(data.get('donor_user_id'))
     except Exception:
-        return JsonResponse({'error':'invalid_donor'}, status=400)
+        return FastJsonResponse({'error':'invalid_donor'}, status=400)
     # Determine blood type
-    bt = (data.get('blood_type') or '').upper().strip()
+    bt = _norm_bt(data.get('blood_type'))
     if not bt:
         link = query("SELECT blood_type FROM blood_bank_donors WHERE bank_user_id=%s AND user_id=%s", [_user['id'], donor_user_id])
         bt = (link or {}).get('blood_type')
     if not bt or bt not in VALID_BLOOD_TYPES:
-        return JsonResponse({'error':'invalid_blood_type'}, status=400)
+        return FastJsonResponse({'error':'invalid_blood_type'}, status=400)
     notes = _limit_str(data.get('notes') or None, 500) if data.get('notes') else None
     try:
         cid = execute(
@@ -4023,85 +4225,84 @@ def crisis_blood_donors_add(request: HttpRequest, crisis_id: int, _user=None):
     except Exception as e:
         existing = query("SELECT id FROM crisis_blood_donors WHERE crisis_id=%s AND bank_user_id=%s AND donor_user_id=%s", [crisis_id, _user['id'], donor_user_id])
         if existing:
-            return JsonResponse({'id': existing['id'], 'ok': True, 'detail': 'already_added'})
-        return JsonResponse({'error':'db_error','detail':str(e)}, status=500)
+            return FastJsonResponse({'id': existing['id'], 'ok': True, 'detail': 'already_added'})
+        return FastJsonResponse({'error':'db_error','detail':str(e)}, status=500)
     # Log activity
     try:
         execute("INSERT INTO incident_events(incident_id,user_id,event_type,note) VALUES(%s,%s,'note',%s)", [cr['incident_id'], _user['id'], f"[Blood Bank] Linked donor #{donor_user_id} ({bt}) to crisis"])
     except Exception:
         pass
-    return JsonResponse({'id': cid})
+    return FastJsonResponse({'id': cid})
 
 @api_view(require_auth=True, methods=['POST'], csrf=False)
 def crisis_blood_donors_remove(request: HttpRequest, crisis_id: int, crisis_donor_id: int, _user=None):
-    _ensure_crisis_tables()
-    row = query("SELECT * FROM crisis_blood_donors WHERE id=%s AND crisis_id=%s", [crisis_donor_id, crisis_id])
+    row = query(
+        "SELECT cbd.bank_user_id, cbd.donor_user_id, c.incident_id FROM crisis_blood_donors cbd JOIN crises c ON c.id=cbd.crisis_id WHERE cbd.id=%s AND cbd.crisis_id=%s",
+        [crisis_donor_id, crisis_id]
+    )
     if not row:
-        return JsonResponse({'error':'not_found'}, status=404)
+        return FastJsonResponse({'error':'not_found'}, status=404)
     if not (_require_admin(_user) or (_require_blood_bank(_user) and row['bank_user_id']==_user['id'])):
-        return JsonResponse({'error':'forbidden'}, status=403)
+        return FastJsonResponse({'error':'forbidden'}, status=403)
     execute("DELETE FROM crisis_blood_donors WHERE id=%s", [crisis_donor_id])
     try:
-        inc = query("SELECT incident_id FROM crises WHERE id=%s", [crisis_id]) or {}
-        execute("INSERT INTO incident_events(incident_id,user_id,event_type,note) VALUES(%s,%s,'note',%s)", [inc.get('incident_id'), _user['id'], f"[Blood Bank] Unlinked donor #{row['donor_user_id']}"])
+        execute("INSERT INTO incident_events(incident_id,user_id,event_type,note) VALUES(%s,%s,'note',%s)", [row['incident_id'], _user['id'], f"[Blood Bank] Unlinked donor #{row['donor_user_id']}"])
     except Exception:
         pass
-    return JsonResponse({'ok': True})
+    return FastJsonResponse({'ok': True})
 
 @api_view(require_auth=True, methods=['GET','POST'], csrf=False)
 def crisis_blood_allocations(request: HttpRequest, crisis_id: int, _user=None):
     """GET: list allocations (bank sees own; admin can pass all=1)
        POST: create allocation from inventory { blood_type, quantity_units, purpose? }
     """
-    _ensure_crisis_tables(); _ensure_blood_bank_tables()
-    ok, err = _require_crisis_open(crisis_id)
-    if not ok:
-        return err
-    cr = query("SELECT incident_id FROM crises WHERE id=%s", [crisis_id])
+    cr, is_participant = _load_crisis_with_membership(crisis_id, _user['id'])
     if not cr:
-        return JsonResponse({'error':'not_found'}, status=404)
+        return FastJsonResponse({'error':'not_found'}, status=404)
+    closed = _crisis_closed_response(cr)
+    if closed:
+        return closed
     is_admin = _require_admin(_user)
     if request.method == 'GET':
         if not (is_admin or _require_blood_bank(_user)):
-            return JsonResponse({'error':'forbidden'}, status=403)
-        if not is_admin:
-            part = query("SELECT id FROM incident_participants WHERE incident_id=%s AND user_id=%s AND status='active'", [cr['incident_id'], _user['id']])
-            if not part:
-                return JsonResponse({'error':'forbidden'}, status=403)
+            return FastJsonResponse({'error':'forbidden'}, status=403)
+        if not is_admin and not is_participant:
+            return FastJsonResponse({'error':'forbidden'}, status=403)
         all_flag = str(request.GET.get('all') or '').lower() in ('1','true','yes')
         if is_admin and all_flag:
             rows = query(
-                "SELECT * FROM crisis_blood_allocations WHERE crisis_id=%s ORDER BY id DESC",
+                "SELECT id, bank_user_id, blood_type, quantity_units, status, purpose, created_at FROM crisis_blood_allocations WHERE crisis_id=%s ORDER BY id DESC",
                 [crisis_id], many=True
             ) or []
         else:
             rows = query(
-                "SELECT * FROM crisis_blood_allocations WHERE crisis_id=%s AND bank_user_id=%s ORDER BY id DESC",
+                "SELECT id, bank_user_id, blood_type, quantity_units, status, purpose, created_at FROM crisis_blood_allocations WHERE crisis_id=%s AND bank_user_id=%s ORDER BY id DESC",
                 [crisis_id, _user['id']], many=True
             ) or []
-        return JsonResponse({'results': rows})
+        return FastJsonResponse({'results': rows})
     # POST create allocation
     if not (_require_blood_bank(_user) or is_admin):
-        return JsonResponse({'error':'forbidden'}, status=403)
-    if not is_admin:
-        part = query("SELECT id FROM incident_participants WHERE incident_id=%s AND user_id=%s AND status='active'", [cr['incident_id'], _user['id']])
-        if not part:
-            return JsonResponse({'error':'forbidden'}, status=403)
-    data = json.loads(request.body or '{}')
-    bt = (data.get('blood_type') or '').upper().strip()
+        return FastJsonResponse({'error':'forbidden'}, status=403)
+    if not is_admin and not is_participant:
+        return FastJsonResponse({'error':'forbidden'}, status=403)
+    data = _loads(request.body) if request.body else {}
+    bt = _norm_bt(data.get('blood_type'))
     try:
         qty = int(data.get('quantity_units') or 0)
     except Exception:
-        return JsonResponse({'error':'invalid_quantity'}, status=400)
+        return FastJsonResponse({'error':'invalid_quantity'}, status=400)
     if bt not in VALID_BLOOD_TYPES:
-        return JsonResponse({'error':'invalid_blood_type'}, status=400)
+        return FastJsonResponse({'error':'invalid_blood_type'}, status=400)
     if qty < 1:
-        return JsonResponse({'error':'invalid_quantity'}, status=400)
-    # Check inventory and decrement
-    inv = query("SELECT id, quantity_units FROM blood_inventory WHERE bank_user_id=%s AND blood_type=%s", [_user['id'], bt])
-    if not inv or int(inv['quantity_units']) < qty:
-        return JsonResponse({'error':'insufficient_inventory'}, status=400)
-    execute("UPDATE blood_inventory SET quantity_units=%s, updated_at=CURRENT_TIMESTAMP WHERE id=%s", [int(inv['quantity_units']) - qty, inv['id']])
+        return FastJsonResponse({'error':'invalid_quantity'}, status=400)
+    # Conditional decrement: the stock check and the write are one statement, so
+    # concurrent allocations can never drive the row negative.
+    affected = execute_rowcount(
+        "UPDATE blood_inventory SET quantity_units = quantity_units - %s, updated_at=CURRENT_TIMESTAMP WHERE bank_user_id=%s AND blood_type=%s AND quantity_units >= %s",
+        [qty, _user['id'], bt, qty]
+    )
+    if not affected:
+        return FastJsonResponse({'error':'insufficient_inventory'}, status=400)
     purpose = data.get('purpose')
     aid = execute(
         "INSERT INTO crisis_blood_allocations(crisis_id,bank_user_id,blood_type,quantity_units,purpose) VALUES(%s,%s,%s,%s,%s)",
@@ -4112,67 +4313,79 @@ def crisis_blood_allocations(request: HttpRequest, crisis_id: int, _user=None):
         execute("INSERT INTO incident_events(incident_id,user_id,event_type,note) VALUES(%s,%s,'note',%s)", [cr['incident_id'], _user['id'], f"[Blood Bank] Allocated {qty} units of {bt} to crisis"])
     except Exception:
         pass
-    return JsonResponse({'id': aid})
+    return FastJsonResponse({'id': aid})
+
+def _restore_inventory(bank_user_id, blood_type, qty):
+    """Add units back to a bank's stock in one statement (creates the row if missing)."""
+    execute(
+        "INSERT INTO blood_inventory(bank_user_id,blood_type,quantity_units) VALUES(%s,%s,%s) "
+        "ON DUPLICATE KEY UPDATE quantity_units = quantity_units + VALUES(quantity_units), updated_at=CURRENT_TIMESTAMP",
+        [bank_user_id, blood_type, int(qty)]
+    )
 
 @api_view(require_auth=True, methods=['POST'], csrf=False)
 def crisis_blood_allocation_update(request: HttpRequest, crisis_id: int, allocation_id: int, _user=None):
-    _ensure_crisis_tables(); _ensure_blood_bank_tables()
-    ok, err = _require_crisis_open(crisis_id)
-    if not ok:
-        return err
-    row = query("SELECT * FROM crisis_blood_allocations WHERE id=%s AND crisis_id=%s", [allocation_id, crisis_id])
+    row = query(
+        """
+        SELECT a.bank_user_id, a.status, a.blood_type, a.quantity_units, i.status AS incident_status
+        FROM crisis_blood_allocations a
+        JOIN crises c ON c.id = a.crisis_id
+        LEFT JOIN incidents i ON i.id = c.incident_id
+        WHERE a.id=%s AND a.crisis_id=%s
+        """,
+        [allocation_id, crisis_id]
+    )
     if not row:
-        return JsonResponse({'error':'not_found'}, status=404)
+        return FastJsonResponse({'error':'not_found'}, status=404)
+    closed = _crisis_closed_response(row)
+    if closed:
+        return closed
     if not (_require_admin(_user) or (_require_blood_bank(_user) and row['bank_user_id']==_user['id'])):
-        return JsonResponse({'error':'forbidden'}, status=403)
-    data = json.loads(request.body or '{}')
+        return FastJsonResponse({'error':'forbidden'}, status=403)
+    data = _loads(request.body) if request.body else {}
     fields = {}
     if 'purpose' in data:
         fields['purpose'] = data.get('purpose')
     if 'status' in data and data.get('status') in ('allocated','reverted'):
         new_status = data.get('status')
         if row['status'] != new_status and new_status == 'reverted':
-            # restore inventory
-            inv = query("SELECT id,quantity_units FROM blood_inventory WHERE bank_user_id=%s AND blood_type=%s", [row['bank_user_id'], row['blood_type']])
-            if inv:
-                execute("UPDATE blood_inventory SET quantity_units=%s, updated_at=CURRENT_TIMESTAMP WHERE id=%s", [int(inv['quantity_units']) + int(row['quantity_units']), inv['id']])
-            else:
-                execute("INSERT INTO blood_inventory(bank_user_id,blood_type,quantity_units) VALUES(%s,%s,%s)", [row['bank_user_id'], row['blood_type'], int(row['quantity_units'])])
+            _restore_inventory(row['bank_user_id'], row['blood_type'], row['quantity_units'])
             fields['status'] = 'reverted'
     if not fields:
-        return JsonResponse({'ok': True})
+        return FastJsonResponse({'ok': True})
     sets = ",".join([f"{k}=%s" for k in fields.keys()])
     params = list(fields.values()) + [allocation_id]
     execute(f"UPDATE crisis_blood_allocations SET {sets} WHERE id=%s", params)
-    return JsonResponse({'ok': True})
+    return FastJsonResponse({'ok': True})
 
 @api_view(require_auth=True, methods=['POST'], csrf=False)
 def crisis_blood_allocation_delete(request: HttpRequest, crisis_id: int, allocation_id: int, _user=None):
-    _ensure_crisis_tables(); _ensure_blood_bank_tables()
-    ok, err = _require_crisis_open(crisis_id)
-    if not ok:
-        return err
-    row = query("SELECT * FROM crisis_blood_allocations WHERE id=%s AND crisis_id=%s", [allocation_id, crisis_id])
+    row = query(
+        """
+        SELECT a.bank_user_id, a.status, a.blood_type, a.quantity_units, i.status AS incident_status
+        FROM crisis_blood_allocations a
+        JOIN crises c ON c.id = a.crisis_id
+        LEFT JOIN incidents i ON i.id = c.incident_id
+        WHERE a.id=%s AND a.crisis_id=%s
+        """,
+        [allocation_id, crisis_id]
+    )
     if not row:
-        return JsonResponse({'error':'not_found'}, status=404)
+        return FastJsonResponse({'error':'not_found'}, status=404)
+    closed = _crisis_closed_response(row)
+    if closed:
+        return closed
     if not (_require_admin(_user) or (_require_blood_bank(_user) and row['bank_user_id']==_user['id'])):
-        return JsonResponse({'error':'forbidden'}, status=403)
+        return FastJsonResponse({'error':'forbidden'}, status=403)
     # restore inventory if still allocated
     if row['status'] == 'allocated':
-        inv = query("SELECT id,quantity_units FROM blood_inventory WHERE bank_user_id=%s AND blood_type=%s", [row['bank_user_id'], row['blood_type']])
-        if inv:
-            execute("UPDATE blood_inventory SET quantity_units=%s, updated_at=CURRENT_TIMESTAMP WHERE id=%s", [int(inv['quantity_units']) + int(row['quantity_units']), inv['id']])
-        else:
-            execute("INSERT INTO blood_inventory(bank_user_id,blood_type,quantity_units) VALUES(%s,%s,%s)", [row['bank_user_id'], row['blood_type'], int(row['quantity_units'])])
+        _restore_inventory(row['bank_user_id'], row['blood_type'], row['quantity_units'])
     execute("DELETE FROM crisis_blood_allocations WHERE id=%s", [allocation_id])
-    return JsonResponse({'ok': True})
+    return FastJsonResponse({'ok': True})
 
 
 # ============================= BLOOD DIRECT REQUESTS (Feature 10) ========================
 
-DIRECT_REQUEST_STATUSES = {'open','accepted','fulfilled','cancelled'}
-DIRECT_RESPONSE_STATUSES = {'pending','accepted','declined','cancelled'}
-
 def _validate_blood_type(bt: str):
     return bt in VALID_BLOOD_TYPES
 
@@ -4183,17 +4396,17 @@ def create_blood_direct_request(request: HttpRequest, _user=None):
     Body: { target_blood_type, quantity_units?, notes? }
     Any authenticated user may create (acts as requester). A donor later responds.
     """
-    data = json.loads(request.body or '{}')
-    bt = (data.get('target_blood_type') or '').upper().strip()
+    data = _loads(request.body) if request.body else {}
+    bt = _norm_bt(data.get('target_blood_type'))
     if not _validate_blood_type(bt):
-        return JsonResponse({'error':'invalid_blood_type'}, status=400)
+        return FastJsonResponse({'error':'invalid_blood_type'}, status=400)
     try:
         qty = int(data.get('quantity_units') or 1)
     except Exception:
-        return JsonResponse({'error':'invalid_quantity'}, status=400)
+        return FastJsonResponse({'error':'invalid_quantity'}, status=400)
     notes = _limit_str(data.get('notes') or None, 500) if data.get('notes') else None
     rid = execute("INSERT INTO blood_direct_requests(requester_user_id,target_blood_type,quantity_units,notes) VALUES(%s,%s,%s,%s)", [_user['id'], bt, qty, notes])
-    return JsonResponse({'id': rid})
+    return FastJsonResponse({'id': rid})
 
 @api_view(require_auth=True, methods=['POST'], csrf=False)
 def change_blood_direct_request_status(request: HttpRequest, request_id: int, _user=None):
@@ -4210,74 +4423,184 @@ def change_blood_direct_request_status(request: HttpRequest, request_id: int, _u
     """
     dr = query("SELECT * FROM blood_direct_requests WHERE id=%s", [request_id])
     if not dr:
-        return JsonResponse({'error':'not_found'}, status=404)
+        return FastJsonResponse({'error':'not_found'}, status=404)
     if dr['requester_user_id'] != _user['id']:
-        return JsonResponse({'error':'forbidden'}, status=403)
-    data = json.loads(request.body or '{}')
+        return FastJsonResponse({'error':'forbidden'}, status=403)
+    data = _loads(request.body) if request.body else {}
     accept_id = data.get('accept_response_id')
     new_status = data.get('status')
     if accept_id:
         if dr['status'] != 'open':
-            return JsonResponse({'error':'invalid_state'}, status=400)
+            return FastJsonResponse({'error':'invalid_state'}, status=400)
         resp = query("SELECT * FROM blood_direct_request_responses WHERE id=%s AND request_id=%s", [accept_id, request_id])
         if not resp:
-            return JsonResponse({'error':'response_not_found'}, status=404)
+            return FastJsonResponse({'error':'response_not_found'}, status=404)
         if resp['status'] != 'pending':
-            return JsonResponse({'error':'response_not_pending'}, status=400)
+            return FastJsonResponse({'error':'response_not_pending'}, status=400)
         execute("UPDATE blood_direct_requests SET status='accepted' WHERE id=%s", [request_id])
         execute("UPDATE blood_direct_request_responses SET status='accepted' WHERE id=%s", [accept_id])
         # decline others
         execute("UPDATE blood_direct_request_responses SET status='declined' WHERE request_id=%s AND id!=%s AND status='pending'", [request_id, accept_id])
-        try:
-            _notify(resp['donor_user_id'], 'direct_request_accepted', {'request_id': request_id, 'response_id': accept_id})
-        except Exception:
-            pass
-        return JsonResponse({'ok': True, 'status': 'accepted'})
+        _notify_async(resp['donor_user_id'], 'direct_request_accepted', {'request_id': request_id, 'response_id': accept_id})
+        return FastJsonResponse({'ok': True, 'status': 'accepted'})
     if new_status:
         if new_status not in ('cancelled','fulfilled'):
-            return JsonResponse({'error':'invalid_status'}, status=400)
+            return FastJsonResponse({'error':'invalid_status'}, status=400)
         if new_status == 'fulfilled' and dr['status'] != 'accepted':
-            return JsonResponse({'error':'invalid_transition'}, status=400)
+            return FastJsonResponse({'error':'invalid_transition'}, status=400)
         if new_status == 'cancelled' and dr['status'] not in ('open','accepted'):
-            return JsonResponse({'error':'invalid_transition'}, status=400)
+            return FastJsonResponse({'error':'invalid_transition'}, status=400)
         execute("UPDATE blood_direct_requests SET status=%s WHERE id=%s", [new_status, request_id])
-        return JsonResponse({'ok': True, 'status': new_status})
-    return JsonResponse({'error':'no_action'}, status=400)
+        return FastJsonResponse({'ok': True, 'status': new_status})
+    return FastJsonResponse({'error':'no_action'}, status=400)
 
 
 
 # ============================= PHASE 3: CAMPAIGNS ==============================
 
 ALLOWED_CAMPAIGN_CREATOR_ROLES = {'hospital','social_org','fire_service','blood_bank','admin','ngo','social_service','org'}
-CAMPAIGN_STATUSES = {'draft','active','completed','cancelled'}
+CAMPAIGN_STATUSES = frozenset(('draft','active','completed','cancelled'))
+# Statuses an owner may set on a participant row
+CAMPAIGN_PARTICIPANT_STATUSES = frozenset(('accepted','rejected','withdrawn'))
+# Default and maximum ?page_size for the campaign / finance / fire department lists. The
+# lists that were capped at 200 rows before pagination keep that cap when ?page is absent.
+_LIST_PAGE_SIZE = 200
 CAMPAIGN_STATUS_TRANSITIONS = {
-    'draft': {'active','cancelled'},
-    'active': {'completed','cancelled'},
-    'completed': set(),
-    'cancelled': set(),
+    'draft': frozenset(('active','cancelled')),
+    'active': frozenset(('completed','cancelled')),
+    'completed': frozenset(),
+    'cancelled': frozenset(),
 }
 
 def _can_create_campaign(user):
     return user and user.get('role') in ALLOWED_CAMPAIGN_CREATOR_ROLES
 
-def _ensure_campaigns_table():
-    # No-op: schema is managed by final_normalized_schema.sql
-    return None
+# Process-local LRU of campaign owners (campaign_id -> owner_user_id) for owner-only
+# endpoints. A campaign's owner never changes, so entries need no invalidation; status
+# is not cached because other workers can change it.
+_CAMPAIGN_OWNER_CACHE = LRUCache(10000)
+
+def _campaign_owner(campaign_id: int):
+    """Return a campaign's owner_user_id, or None if the campaign does not exist."""
+    owner = _CAMPAIGN_OWNER_CACHE.get(campaign_id)
+    if owner is not None:
+        return owner
+    row = query("SELECT owner_user_id FROM campaigns WHERE id=%s", [campaign_id])
+    if not row:
+        return None
+    owner = row['owner_user_id']
+    _CAMPAIGN_OWNER_CACHE.put(campaign_id, owner)
+    return owner
+
+# (table, column) pairs of the current schema, loaded in one INFORMATION_SCHEMA read on first
+# use. Migrations require a restart anyway, so the set lives for the life of the process.
+_SCHEMA_COLUMNS = None
+_SCHEMA_COLUMNS_LOCK = threading.Lock()
 
 def _has_column(table: str, column: str) -> bool:
     """Return True if a given column exists in the current DB schema."""
-    try:
-        row = query(
-            """
-            SELECT COUNT(*) AS c
-            FROM INFORMATION_SCHEMA.COLUMNS
-            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME=%s AND COLUMN_NAME=%s
-            """,
-            [table, column]
-        )
-        return bool(row and int(row.get('c') or 0) > 0)
-    except Exception:
-        return False
+    global _SCHEMA_COLUMNS
+    cols = _SCHEMA_COLUMNS
+    if cols is None:
+        with _SCHEMA_COLUMNS_LOCK:
+            cols = _SCHEMA_COLUMNS
+            if cols is None:
+                try:
+                    rows = query(
+                        """
+                        SELECT TABLE_NAME AS t, COLUMN_NAME AS c
+                        FROM INFORMATION_SCHEMA.COLUMNS
+                        WHERE TABLE_SCHEMA = DATABASE()
+                        """,
+                        many=True
+                    ) or []
+                except Exception:
+                    return False  # not cached; retry on the next call
+                cols = _SCHEMA_COLUMNS = frozenset((r['t'].lower(), r['c'].lower()) for r in rows)
+    return (table.lower(), column.lower()) in cols
+
+# (table, index) pairs, cached the same way as _SCHEMA_COLUMNS.
+_SCHEMA_INDEXES = None
+
+def _has_index(table: str, index_name: str) -> bool:
+    """Return True if a given index exists in the current DB schema."""
+    global _SCHEMA_INDEXES
+    idx = _SCHEMA_INDEXES
+    if idx is None:
+        with _SCHEMA_COLUMNS_LOCK:
+            idx = _SCHEMA_INDEXES
+            if idx is None:
+                try:
+                    rows = query(
+                        """
+                        SELECT DISTINCT TABLE_NAME AS t, INDEX_NAME AS i
+                        FROM INFORMATION_SCHEMA.STATISTICS
+                        WHERE TABLE_SCHEMA = DATABASE()
+                        """,
+                        many=True
+                    ) or []
+                except Exception:
+                    return False  # not cached; retry on the next call
+                idx = _SCHEMA_INDEXES = frozenset((r['t'].lower(), r['i'].lower()) for r in rows)
+    return (table.lower(), index_name.lower()) in idx
+
+# InnoDB's default FULLTEXT stopword list (INFORMATION_SCHEMA.INNODB_FT_DEFAULT_STOPWORD).
+# These words are never indexed, so a required +word* term on one can never match.
+_FT_STOPWORDS = frozenset((
+    'a', 'about', 'an', 'are', 'as', 'at', 'be', 'by', 'com', 'de', 'en', 'for', 'from',
+    'how', 'i', 'in', 'is', 'it', 'la', 'of', 'on', 'or', 'that', 'the', 'this', 'to',
+    'was', 'what', 'when', 'where', 'who', 'will', 'with', 'und', 'www',
+))
+
+def _title_search_clause(q: str):
+    """WHERE fragment + param for list_campaigns' ?q= title search.
+
+    Uses the ft_campaigns_title FULLTEXT index, which is word-prefix matching: every
+    indexable word must start a word of the title ("fire" finds "fire station" but not
+    "wildfire"). Stopwords and words shorter than innodb_ft_min_token_size (default 3)
+    are not indexed and are left out of the required set. When no indexable word remains,
+    or before the index exists, falls back to the substring LIKE scan.
+    """
+    words = [w for w in re.findall(r'\w+', q.lower()) if len(w) >= 3 and w not in _FT_STOPWORDS]
+    if words and _has_index('campaigns', 'ft_campaigns_title'):
+        return 'MATCH(title) AGAINST(%s IN BOOLEAN MODE)', ' '.join(f'+{w}*' for w in words)
+    return 'title LIKE %s', f"%{q}%"
+
+def _paginate_unless_unpaged(request, base_sql, params, count_sql, order_fragment):
+    """paginate() when the client sends ?page; otherwise every row, as these lists always
+    returned (no cap), with empty page metadata."""
+    if request.GET.get('page') is None:
+        return query(base_sql + order_fragment, params, many=True) or [], {}
+    from .utils import paginate
+    return paginate(
+        request, base_sql, params, count_sql=count_sql,
+        default_size=_LIST_PAGE_SIZE, max_size=_LIST_PAGE_SIZE, order_fragment=order_fragment
+    )
+
+def _attach_participant_counts(rows):
+    """Add participant_count (pending + accepted) and accepted_count to campaign rows.
+
+    One grouped query over the page's campaign ids (idx_cp_campaign_status), so list
+    pages don't need a participants request per campaign.
+    """
+    if not rows:
+        return rows
+    ids = [r['id'] for r in rows]
+    counts = query(
+        f"""
+        SELECT campaign_id, COUNT(*) AS participant_count, SUM(status='accepted') AS accepted_count
+        FROM campaign_participants
+        WHERE campaign_id IN ({_in_placeholders(len(ids))}) AND status IN ('pending','accepted')
+        GROUP BY campaign_id
+        """,
+        ids, many=True
+    ) or []
+    by_id = {c['campaign_id']: c for c in counts}
+    for r in rows:
+        c = by_id.get(r['id']) or {}
+        r['participant_count'] = int(c.get('participant_count') or 0)
+        r['accepted_count'] = int(c.get('accepted_count') or 0)
+    return rows
 
 @api_view(require_auth=True, methods=['POST'], csrf=False)
 def create_campaign(request: HttpRequest, _user=None):
@@ -4286,13 +4609,12 @@ def create_campaign(request: HttpRequest, _user=None):
     Body: { title, description?, campaign_type?, starts_at?, ends_at?, location_text?, target_metric?, target_value? }
     Returns: { id }
     """
-    _ensure_campaigns_table()
     if not _can_create_campaign(_user):
-        return JsonResponse({'error':'forbidden'}, status=403)
-    data = json.loads(request.body or '{}')
+        return FastJsonResponse({'error':'forbidden'}, status=403)
+    data = _loads(request.body) if request.body else {}
     title = _limit_str(data.get('title','').strip(), 200)
     if not title:
-        return JsonResponse({'error':'missing_title'}, status=400)
+        return FastJsonResponse({'error':'missing_title'}, status=400)
     description = data.get('description')
     ctype = _limit_str(data.get('campaign_type','general'), 50)
     starts_at = data.get('starts_at')
@@ -4304,7 +4626,7 @@ def create_campaign(request: HttpRequest, _user=None):
         if target_value is not None:
             target_value = int(target_value)
     except Exception:
-        return JsonResponse({'error':'invalid_target_value'}, status=400)
+        return FastJsonResponse({'error':'invalid_target_value'}, status=400)
     # Some environments may not have the optional 'campaign_type' column; handle gracefully
     if _has_column('campaigns', 'campaign_type'):
         cid = execute(
@@ -4316,15 +4638,14 @@ def create_campaign(request: HttpRequest, _user=None):
             "INSERT INTO campaigns(owner_user_id,title,description,starts_at,ends_at,location_text,target_metric,target_value) VALUES(%s,%s,%s,%s,%s,%s,%s,%s)",
             [_user['id'], title, description, starts_at, ends_at, location_text, target_metric, target_value]
         )
-    return JsonResponse({'id': cid})
+    return FastJsonResponse({'id': cid})
 
 @api_view(methods=['GET'], csrf=False)
 def list_campaigns(request: HttpRequest, _user=None):
     """List campaigns with optional filters: status, type, owner_user_id.
-    Draft campaigns only visible to their owner.
-    Query params: status, campaign_type, owner, q (substring in title)
+    Draft campaigns only visible to their owner. Rows carry participant_count / accepted_count.
+    Query params: status, campaign_type, owner, q (title search, see _title_search_clause)
     """
-    _ensure_campaigns_table()
     status_f = request.GET.get('status')
     ctype = request.GET.get('campaign_type')
     owner = request.GET.get('owner')
@@ -4338,39 +4659,38 @@ def list_campaigns(request: HttpRequest, _user=None):
     if owner:
         where.append('owner_user_id=%s'); params.append(owner)
     if q:
-        where.append('title LIKE %s'); params.append(f"%{q}%")
+        clause, arg = _title_search_clause(q)
+        where.append(clause); params.append(arg)
     # Visibility rule: hide draft unless owner
     if not (status_f == 'draft' and owner and _user and str(_user['id'])==str(owner)):
         where.append("(status!='draft' OR owner_user_id=%s)"); params.append(_user['id'] if _user else 0)
     sql = 'SELECT * FROM campaigns'
     if where:
         sql += ' WHERE ' + ' AND '.join(where)
-    sql += ' ORDER BY created_at DESC LIMIT 200'
-    rows = query(sql, params, many=True) or []
-    return JsonResponse({'results': rows})
+    from .utils import paginate
+    rows, meta = paginate(request, sql, params, default_size=_LIST_PAGE_SIZE, max_size=_LIST_PAGE_SIZE, order_fragment=' ORDER BY created_at DESC')
+    return FastJsonResponse({'results': _attach_participant_counts(rows), **meta})
 
 @api_view(methods=['GET'], csrf=False)
 def get_campaign(request: HttpRequest, campaign_id: int, _user=None):
-    _ensure_campaigns_table()
     row = query("SELECT * FROM campaigns WHERE id=%s", [campaign_id])
     if not row:
-        return JsonResponse({'error':'not_found'}, status=404)
+        return FastJsonResponse({'error':'not_found'}, status=404)
     # draft visibility
     if row['status']=='draft' and (not _user or row['owner_user_id'] != _user['id']):
-        return JsonResponse({'error':'forbidden'}, status=403)
-    return JsonResponse(row)
+        return FastJsonResponse({'error':'forbidden'}, status=403)
+    return FastJsonResponse(row)
 
 @api_view(require_auth=True, methods=['PUT'], csrf=False)
 def update_campaign(request: HttpRequest, campaign_id: int, _user=None):
-    _ensure_campaigns_table()
     camp = query("SELECT * FROM campaigns WHERE id=%s", [campaign_id])
     if not camp:
-        return JsonResponse({'error':'not_found'}, status=404)
+        return FastJsonResponse({'error':'not_found'}, status=404)
     if camp['owner_user_id'] != _user['id']:
-        return JsonResponse({'error':'forbidden'}, status=403)
+        return FastJsonResponse({'error':'forbidden'}, status=403)
     if camp['status'] in ('completed','cancelled'):
-        return JsonResponse({'error':'immutable_status'}, status=400)
-    data = json.loads(request.body or '{}')
+        return FastJsonResponse({'error':'immutable_status'}, status=400)
+    data = _loads(request.body) if request.body else {}
     has_ct = _has_column('campaigns','campaign_type')
     fields = {
         'title': _limit_str(data.get('title', camp.get('title')), 200),
@@ -4390,7 +4710,7 @@ def update_campaign(request: HttpRequest, campaign_id: int, _user=None):
         if fields['current_value'] is not None:
             fields['current_value'] = int(fields['current_value'])
     except Exception:
-        return JsonResponse({'error':'invalid_numeric'}, status=400)
+        return FastJsonResponse({'error':'invalid_numeric'}, status=400)
     # Build dynamic UPDATE depending on column presence
     set_parts = [
         'title=%s', 'description=%s',
@@ -4406,129 +4726,120 @@ def update_campaign(request: HttpRequest, campaign_id: int, _user=None):
         set_parts.insert(2, 'campaign_type=%s')
         params.insert(2, fields.get('campaign_type'))
     execute("UPDATE campaigns SET " + ", ".join(set_parts) + " WHERE id=%s", params + [campaign_id])
-    return JsonResponse({'ok': True})
+    return FastJsonResponse({'ok': True})
 
 @api_view(require_auth=True, methods=['POST'], csrf=False)
 def change_campaign_status(request: HttpRequest, campaign_id: int, _user=None):
-    _ensure_campaigns_table()
-    camp = query("SELECT * FROM campaigns WHERE id=%s", [campaign_id])
-    if not camp:
-        return JsonResponse({'error':'not_found'}, status=404)
-    if camp['owner_user_id'] != _user['id']:
-        return JsonResponse({'error':'forbidden'}, status=403)
-    data = json.loads(request.body or '{}')
+    owner_id = _campaign_owner(campaign_id)
+    if owner_id is None:
+        return FastJsonResponse({'error':'not_found'}, status=404)
+    if owner_id != _user['id']:
+        return FastJsonResponse({'error':'forbidden'}, status=403)
+    data = _loads(request.body) if request.body else {}
     new_status = data.get('status')
     if new_status not in CAMPAIGN_STATUSES:
-        return JsonResponse({'error':'invalid_status'}, status=400)
-    allowed = CAMPAIGN_STATUS_TRANSITIONS.get(camp['status'], set())
-    if new_status not in allowed:
-        return JsonResponse({'error':'invalid_transition','from':camp['status'],'to':new_status}, status=400)
-    execute("UPDATE campaigns SET status=%s WHERE id=%s", [new_status, campaign_id])
-    return JsonResponse({'ok': True})
+        return FastJsonResponse({'error':'invalid_status'}, status=400)
+    # Transition check and write in one statement: only rows currently in a status that
+    # may move to new_status match. On a miss, read the status for the error payload.
+    sources = [st for st, nxt in CAMPAIGN_STATUS_TRANSITIONS.items() if new_status in nxt]
+    if sources and execute_rowcount(
+        f"UPDATE campaigns SET status=%s WHERE id=%s AND status IN ({_in_placeholders(len(sources))})",
+        [new_status, campaign_id, *sources]
+    ):
+        return FastJsonResponse({'ok': True})
+    camp = query("SELECT status FROM campaigns WHERE id=%s", [campaign_id])
+    if not camp:
+        return FastJsonResponse({'error':'not_found'}, status=404)
+    return FastJsonResponse({'error':'invalid_transition','from':camp['status'],'to':new_status}, status=400)
 
 @api_view(require_auth=True, methods=['POST'], csrf=False)
 def join_campaign(request: HttpRequest, campaign_id: int, _user=None):
-    _ensure_campaigns_table()
-    camp = query("SELECT * FROM campaigns WHERE id=%s", [campaign_id])
-    if not camp:
-        return JsonResponse({'error':'not_found'}, status=404)
-    if camp['status'] != 'active':
-        return JsonResponse({'error':'not_joinable'}, status=400)
-    if camp['owner_user_id'] == _user['id']:
-        return JsonResponse({'error':'owner_cannot_join'}, status=400)
-    existing = query("SELECT id,status,role_label FROM campaign_participants WHERE campaign_id=%s AND user_id=%s", [campaign_id, _user['id']])
-    if existing:
-        status_now = str(existing.get('status') or '').lower()
-        if status_now in ('withdrawn','rejected'):
-            # Re-request participation as pending
-            execute("UPDATE campaign_participants SET status='pending' WHERE id=%s", [existing['id']])
-            try:
-                from .utils import _ensure_notifications_table
-                _ensure_notifications_table()
-            except Exception:
-                pass
-            try:
-                _notify(camp['owner_user_id'], 'campaign_participated', {
-                    'campaign_id': campaign_id,
-                    'campaign_title': camp.get('title'),
-                    'participant_user_id': _user['id'],
-                    'participant_name': _user.get('full_name') or _user.get('email'),
-                    'role_label': role_label,
-                    'rejoined': True,
-                })
-            except Exception:
-                pass
-            return JsonResponse({'id': existing['id'], 'rejoined': True, 'status': 'pending'})
-        if status_now == 'pending':
-            return JsonResponse({'error':'already_pending'}, status=400)
-        # accepted or any other active-like status
-        return JsonResponse({'error':'already_participating'}, status=400)
-    data = json.loads(request.body or '{}')
-    role_label = _limit_str(data.get('role_label','') or None,50) if data.get('role_label') else None
-    # New requests join as 'pending' by default; owner must accept
-    pid = execute("INSERT INTO campaign_participants(campaign_id,user_id,role_label,status) VALUES(%s,%s,%s,'pending')", [campaign_id, _user['id'], role_label])
-    # Notify owner about new participant
-    try:
-        from .utils import _ensure_notifications_table
-        _ensure_notifications_table()
-    except Exception:
-        pass
-    try:
-        _notify(camp['owner_user_id'], 'campaign_participated', {
-            'campaign_id': campaign_id,
-            'campaign_title': camp.get('title'),
-            'participant_user_id': _user['id'],
-            'participant_name': _user.get('full_name') or _user.get('email'),
-            'role_label': role_label,
-            'rejoined': False,
-        })
-    except Exception:
-        pass
-    return JsonResponse({'id': pid})
+    camp = query("SELECT owner_user_id,status,title FROM campaigns WHERE id=%s", [campaign_id])
+    if not camp:
+        return FastJsonResponse({'error':'not_found'}, status=404)
+    if camp['status'] != 'active':
+        return FastJsonResponse({'error':'not_joinable'}, status=400)
+    if camp['owner_user_id'] == _user['id']:
+        return FastJsonResponse({'error':'owner_cannot_join'}, status=400)
+    data = _loads(request.body) if request.body else {}
+    role_label = _limit_str(data.get('role_label','') or None,50) if data.get('role_label') else None
+    # New requests join as 'pending' by default; owner must accept.
+    # uq_campaign_user turns a repeat join into an ignored insert (lastrowid 0).
+    pid = execute("INSERT IGNORE INTO campaign_participants(campaign_id,user_id,role_label,status) VALUES(%s,%s,%s,'pending')", [campaign_id, _user['id'], role_label])
+    rejoined = False
+    if not pid:
+        existing = query("SELECT id,status FROM campaign_participants WHERE campaign_id=%s AND user_id=%s", [campaign_id, _user['id']])
+        if not existing:
+            return FastJsonResponse({'error':'join_failed'}, status=500)
+        status_now = str(existing.get('status') or '').lower()
+        if status_now == 'pending':
+            return FastJsonResponse({'error':'already_pending'}, status=400)
+        if status_now not in ('withdrawn','rejected'):
+            # accepted or any other active-like status
+            return FastJsonResponse({'error':'already_participating'}, status=400)
+        # Re-request participation as pending; the status guard makes concurrent rejoins count once
+        if not execute_rowcount("UPDATE campaign_participants SET status='pending' WHERE id=%s AND status IN ('withdrawn','rejected')", [existing['id']]):
+            return FastJsonResponse({'error':'already_pending'}, status=400)
+        pid, rejoined = existing['id'], True
+    # Notify owner about the (re)joined participant
+    _notify_async(camp['owner_user_id'], 'campaign_participated', {
+        'campaign_id': campaign_id,
+        'campaign_title': camp.get('title'),
+        'participant_user_id': _user['id'],
+        'participant_name': _user.get('full_name') or _user.get('email'),
+        'role_label': role_label,
+        'rejoined': rejoined,
+    })
+    if rejoined:
+        return FastJsonResponse({'id': pid, 'rejoined': True, 'status': 'pending'})
+    return FastJsonResponse({'id': pid})
 
 @api_view(require_auth=True, methods=['POST'], csrf=False)
 def withdraw_campaign(request: HttpRequest, campaign_id: int, _user=None):
-    _ensure_campaigns_table()
     row = query("SELECT id,status FROM campaign_participants WHERE campaign_id=%s AND user_id=%s", [campaign_id, _user['id']])
     if not row:
-        return JsonResponse({'error':'not_participant'}, status=404)
+        return FastJsonResponse({'error':'not_participant'}, status=404)
     if row['status'] in ('withdrawn','rejected'):
-        return JsonResponse({'ok': True, 'already': True})
+        return FastJsonResponse({'ok': True, 'already': True})
     execute("UPDATE campaign_participants SET status='withdrawn' WHERE id=%s", [row['id']])
-    return JsonResponse({'ok': True})
+    return FastJsonResponse({'ok': True})
 
 @api_view(require_auth=True, methods=['GET'], csrf=False)
 def list_campaign_participants(request: HttpRequest, campaign_id: int, _user=None):
-    _ensure_campaigns_table()
     camp = query("SELECT owner_user_id,status FROM campaigns WHERE id=%s", [campaign_id])
     if not camp:
-        return JsonResponse({'error':'not_found'}, status=404)
+        return FastJsonResponse({'error':'not_found'}, status=404)
     if camp['status']=='draft' and (not _user or camp['owner_user_id'] != _user['id']):
-        return JsonResponse({'error':'forbidden'}, status=403)
+        return FastJsonResponse({'error':'forbidden'}, status=403)
     from .utils import paginate
     owner_view = _user and camp['owner_user_id'] == _user['id']
+    # User name (and email for the owner) joined in, so clients need no per-participant lookups;
+    # the count skips the join.
     if owner_view:
-        base = "SELECT id,user_id,role_label,status,joined_at FROM campaign_participants WHERE campaign_id=%s"
+        cols = "cp.id,cp.user_id,cp.role_label,cp.status,cp.joined_at, u.full_name AS user_full_name, u.email AS user_email"
+        where = "cp.campaign_id=%s"
         params = [campaign_id]
     else:
         # Show accepted participants to everyone; also show the caller's own row (pending/rejected/withdrawn) so they can see their status
-        base = "SELECT id,user_id,role_label,status,joined_at FROM campaign_participants WHERE campaign_id=%s AND (status='accepted' OR user_id=%s)"
+        cols = "cp.id,cp.user_id,cp.role_label,cp.status,cp.joined_at, u.full_name AS user_full_name"
+        where = "cp.campaign_id=%s AND (cp.status='accepted' OR cp.user_id=%s)"
         params = [campaign_id, (_user['id'] if _user else 0)]
-    rows, meta = paginate(request, base, params, order_fragment=' ORDER BY joined_at ASC')
-    return JsonResponse({'results': rows, **meta})
+    base = f"SELECT {cols} FROM campaign_participants cp LEFT JOIN users u ON u.id=cp.user_id WHERE {where}"
+    count_sql = f"SELECT COUNT(1) AS ct FROM campaign_participants cp WHERE {where}"
+    rows, meta = paginate(request, base, params, count_sql=count_sql, order_fragment=' ORDER BY cp.joined_at ASC')
+    return FastJsonResponse({'results': rows, **meta})
 
 @api_view(require_auth=True, methods=['POST'], csrf=False)
 def update_campaign_participant_status(request: HttpRequest, campaign_id: int, participant_id: int, _user=None):
-    _ensure_campaigns_table()
-    camp = query("SELECT owner_user_id FROM campaigns WHERE id=%s", [campaign_id])
-    if not camp:
-        return JsonResponse({'error':'not_found'}, status=404)
-    if camp['owner_user_id'] != _user['id']:
-        return JsonResponse({'error':'forbidden'}, status=403)
+    owner_id = _campaign_owner(campaign_id)
+    if owner_id is None:
+        return FastJsonResponse({'error':'not_found'}, status=404)
+    if owner_id != _user['id']:
+        return FastJsonResponse({'error':'forbidden'}, status=403)
     part = query("SELECT * FROM campaign_participants WHERE id=%s AND campaign_id=%s", [participant_id, campaign_id])
     if not part:
-        return JsonResponse({'error':'not_found'}, status=404)
-    data = json.loads(request.body or '{}')
+        return FastJsonResponse({'error':'not_found'}, status=404)
+    data = _loads(request.body) if request.body else {}
     sets = []
     params = []
     # Optional role change
@@ -4538,62 +4849,61 @@ def update_campaign_participant_status(request: HttpRequest, campaign_id: int, p
     # Optional status change
     new_status = data.get('status') if 'status' in data else None
     if new_status is not None:
-        if new_status not in ('accepted','rejected','withdrawn'):
-            return JsonResponse({'error':'invalid_status'}, status=400)
+        if new_status not in CAMPAIGN_PARTICIPANT_STATUSES:
+            return FastJsonResponse({'error':'invalid_status'}, status=400)
         sets.append('status=%s'); params.append(new_status)
     if not sets:
-        return JsonResponse({'error':'no_fields'}, status=400)
+        return FastJsonResponse({'error':'no_fields'}, status=400)
     params.append(participant_id)
     execute("UPDATE campaign_participants SET "+','.join(sets)+" WHERE id=%s", params)
     if new_status is not None:
-        try:
-            _notify(part['user_id'], 'campaign_participation_status', {'campaign_id': campaign_id, 'status': new_status})
-        except Exception:
-            pass
-    return JsonResponse({'ok': True})
+        _notify_async(part['user_id'], 'campaign_participation_status', {'campaign_id': campaign_id, 'status': new_status})
+    return FastJsonResponse({'ok': True})
 
 @api_view(require_auth=True, methods=['DELETE'], csrf=False)
 def delete_campaign_participant(request: HttpRequest, campaign_id: int, participant_id: int, _user=None):
     """Owner-only hard delete of a participant record.
     This permanently removes the participant row instead of toggling status.
     """
-    _ensure_campaigns_table()
-    camp = query("SELECT owner_user_id FROM campaigns WHERE id=%s", [campaign_id])
-    if not camp:
-        return JsonResponse({'error':'not_found'}, status=404)
-    if camp['owner_user_id'] != _user['id']:
-        return JsonResponse({'error':'forbidden'}, status=403)
+    owner_id = _campaign_owner(campaign_id)
+    if owner_id is None:
+        return FastJsonResponse({'error':'not_found'}, status=404)
+    if owner_id != _user['id']:
+        return FastJsonResponse({'error':'forbidden'}, status=403)
     part = query("SELECT id FROM campaign_participants WHERE id=%s AND campaign_id=%s", [participant_id, campaign_id])
     if not part:
-        return JsonResponse({'error':'not_found'}, status=404)
+        return FastJsonResponse({'error':'not_found'}, status=404)
     execute("DELETE FROM campaign_participants WHERE id=%s", [participant_id])
-    return JsonResponse({'ok': True, 'deleted': True})
+    return FastJsonResponse({'ok': True, 'deleted': True})
 
 @api_view(require_auth=True, methods=['GET'], csrf=False)
 def my_campaigns(request: HttpRequest, _user=None):
-    _ensure_campaigns_table()
-    rows = query("SELECT * FROM campaigns WHERE owner_user_id=%s ORDER BY created_at DESC", [_user['id']], many=True) or []
-    return JsonResponse({'results': rows})
+    rows, meta = _paginate_unless_unpaged(
+        request, "SELECT * FROM campaigns WHERE owner_user_id=%s", [_user['id']],
+        "SELECT COUNT(1) AS ct FROM campaigns WHERE owner_user_id=%s", ' ORDER BY created_at DESC'
+    )
+    return FastJsonResponse({'results': _attach_participant_counts(rows), **meta})
 
 @api_view(require_auth=True, methods=['GET'], csrf=False)
 def my_campaign_participations(request: HttpRequest, _user=None):
-    _ensure_campaigns_table()
-    rows = query("SELECT c.*, cp.status AS participation_status, cp.role_label, cp.id AS participation_id FROM campaign_participants cp JOIN campaigns c ON c.id=cp.campaign_id WHERE cp.user_id=%s ORDER BY cp.joined_at DESC", [_user['id']], many=True) or []
-    return JsonResponse({'results': rows})
+    rows, meta = _paginate_unless_unpaged(
+        request,
+        "SELECT c.*, cp.status AS participation_status, cp.role_label, cp.id AS participation_id FROM campaign_participants cp JOIN campaigns c ON c.id=cp.campaign_id WHERE cp.user_id=%s",
+        [_user['id']],
+        "SELECT COUNT(1) AS ct FROM campaign_participants WHERE user_id=%s", ' ORDER BY cp.joined_at DESC'
+    )
+    return FastJsonResponse({'results': rows, **meta})
 
 # ============================= SOCIAL ORG VOLUNTEERS ==============================
 
+VOLUNTEER_STATUSES = frozenset(('pending','accepted','rejected','removed'))
+
 def _require_org_owner(org_id: int, user_id: int) -> bool:
     row = query("SELECT id FROM social_organizations WHERE id=%s AND user_id=%s", [org_id, user_id])
     return bool(row)
 
-def _ensure_social_org_volunteers_table():
-    # No-op: final schema ensures social_org_volunteers exists.
-    return None
-
 @api_view(methods=['GET'], csrf=False)
 def social_org_list_volunteers(request: HttpRequest, org_id: int, _user=None):
-    _ensure_social_org_volunteers_table()
     owner_view = _user and _require_org_owner(org_id, _user['id'])
     if owner_view:
         rows = query(
@@ -4617,42 +4927,56 @@ def social_org_list_volunteers(request: HttpRequest, org_id: int, _user=None):
             """,
             [org_id], many=True
         ) or []
-    return JsonResponse({'results': rows, 'owner_view': bool(owner_view)})
+    return FastJsonResponse({'results': rows, 'owner_view': bool(owner_view)})
 
 @api_view(require_auth=True, methods=['POST'], csrf=False)
 def social_org_add_volunteer(request: HttpRequest, org_id: int, _user=None):
-    if not _require_org_owner(org_id, _user['id']):
-        return JsonResponse({'error': 'forbidden'}, status=403)
-    _ensure_social_org_volunteers_table()
-    data = json.loads(request.body or '{}')
+    data = _loads(request.body) if request.body else {}
     user_id = int(data.get('user_id') or 0)
     role_label = _limit_str(data.get('role_label','') or None, 64) if data.get('role_label') else None
     status = data.get('status') or 'accepted'
     if not user_id:
-        return JsonResponse({'error':'missing_user_id'}, status=400)
-    existing = query("SELECT id FROM social_org_volunteers WHERE org_id=%s AND user_id=%s", [org_id, user_id])
-    if existing:
-        # Update role/status if provided
-        sets=[]; params=[]
-        if role_label is not None:
-            sets.append('role_label=%s'); params.append(role_label)
-        if status in ('pending','accepted','rejected','removed'):
-            sets.append('status=%s'); params.append(status)
-        if sets:
-            params.append(existing['id'])
-            execute("UPDATE social_org_volunteers SET "+','.join(sets)+" WHERE id=%s", params)
-        return JsonResponse({'id': existing['id'], 'updated': True})
-    vid = execute("INSERT INTO social_org_volunteers(org_id,user_id,role_label,status) VALUES(%s,%s,%s,%s)", [org_id, user_id, role_label, status])
-    return JsonResponse({'id': vid})
+        return FastJsonResponse({'error':'missing_user_id'}, status=400)
+    # Ownership is checked inside the write itself: the INSERT only selects a row when
+    # the caller owns the org, and uq_org_user makes an existing volunteer a no-op (lastrowid 0)
+    vid = execute(
+        "INSERT IGNORE INTO social_org_volunteers(org_id,user_id,role_label,status) "
+        "SELECT o.id,%s,%s,%s FROM social_organizations o WHERE o.id=%s AND o.user_id=%s",
+        [user_id, role_label, status, org_id, _user['id']]
+    )
+    if vid:
+        return FastJsonResponse({'id': vid})
+    # Update role/status if provided; id=LAST_INSERT_ID(id) hands the row id back as lastrowid
+    sets=['v.id=LAST_INSERT_ID(v.id)']; params=[]
+    if role_label is not None:
+        sets.append('v.role_label=%s'); params.append(role_label)
+    if status in VOLUNTEER_STATUSES:
+        sets.append('v.status=%s'); params.append(status)
+    vid = execute(
+        "UPDATE social_org_volunteers v JOIN social_organizations o ON o.id=v.org_id SET "+','.join(sets)+
+        " WHERE v.org_id=%s AND v.user_id=%s AND o.user_id=%s",
+        params + [org_id, user_id, _user['id']]
+    )
+    if not vid:
+        # Both writes missed: tell a non-owner apart from an unknown volunteer
+        if not _require_org_owner(org_id, _user['id']):
+            return FastJsonResponse({'error': 'forbidden'}, status=403)
+        return FastJsonResponse({'error':'not_found'}, status=404)
+    return FastJsonResponse({'id': vid, 'updated': True})
 
 @api_view(require_auth=True, methods=['POST','DELETE'], csrf=False)
 def social_org_volunteer_item(request: HttpRequest, org_id: int, volunteer_id: int, _user=None):
-    if not _require_org_owner(org_id, _user['id']):
-        return JsonResponse({'error': 'forbidden'}, status=403)
-    _ensure_social_org_volunteers_table()
-    vol = query("SELECT id FROM social_org_volunteers WHERE id=%s AND org_id=%s", [volunteer_id, org_id])
+    # One round-trip validates both the volunteer row and org ownership; only a miss
+    # pays for the ownership check (403 for non-owners, 404 for an unknown volunteer)
+    vol = query(
+        "SELECT v.id FROM social_org_volunteers v JOIN social_organizations o ON o.id=v.org_id "
+        "WHERE v.id=%s AND v.org_id=%s AND o.user_id=%s",
+        [volunteer_id, org_id, _user['id']]
+    )
     if not vol:
-        return JsonResponse({'error':'not_found'}, status=404)
+        if not _require_org_owner(org_id, _user['id']):
+            return FastJsonResponse({'error': 'forbidden'}, status=403)
+        return FastJsonResponse({'error':'not_found'}, status=404)
     if request.method == 'DELETE':
         try:
             execute("DELETE FROM social_org_volunteers WHERE id=%s", [volunteer_id])
@@ -4661,171 +4985,195 @@ def social_org_volunteer_item(request: HttpRequest, org_id: int, volunteer_id: i
             try:
                 execute("UPDATE social_org_volunteers SET status='removed' WHERE id=%s", [volunteer_id])
             except Exception:
-                return JsonResponse({'error':'delete_failed'}, status=500)
-        return JsonResponse({'ok': True})
+                return FastJsonResponse({'error':'delete_failed'}, status=500)
+        return FastJsonResponse({'ok': True})
     # POST = update
-    data = json.loads(request.body or '{}')
+    data = _loads(request.body) if request.body else {}
     sets=[]; params=[]
     if 'role_label' in data:
         rl = _limit_str((data.get('role_label') or '') or None, 64) if data.get('role_label') else None
         sets.append('role_label=%s'); params.append(rl)
     if 'status' in data:
         st = data.get('status')
-        if st not in ('pending','accepted','rejected','removed'):
-            return JsonResponse({'error':'invalid_status'}, status=400)
+        if st not in VOLUNTEER_STATUSES:
+            return FastJsonResponse({'error':'invalid_status'}, status=400)
         sets.append('status=%s'); params.append(st)
     if sets:
         params.append(volunteer_id)
         execute("UPDATE social_org_volunteers SET "+','.join(sets)+" WHERE id=%s", params)
-    return JsonResponse({'ok': True})
+    return FastJsonResponse({'ok': True})
 
 @api_view(require_auth=True, methods=['POST'], csrf=False)
 def social_org_apply_to_volunteer(request: HttpRequest, org_id: int, _user=None):
-    _ensure_social_org_volunteers_table()
     # Allow any user to apply; create or update to pending for self
-    existing = query("SELECT id,status FROM social_org_volunteers WHERE org_id=%s AND user_id=%s", [org_id, _user['id']])
-    if existing:
-        if existing.get('status') == 'pending':
-            return JsonResponse({'ok': True, 'already': True, 'status': 'pending'})
-        execute("UPDATE social_org_volunteers SET status='pending' WHERE id=%s", [existing['id']])
-        return JsonResponse({'ok': True, 'reapplied': True})
-    vid = execute("INSERT INTO social_org_volunteers(org_id,user_id,status) VALUES(%s,%s,'pending')", [org_id, _user['id']])
-    return JsonResponse({'id': vid, 'status': 'pending'})
+    vid = execute("INSERT IGNORE INTO social_org_volunteers(org_id,user_id,status) VALUES(%s,%s,'pending')", [org_id, _user['id']])
+    if vid:
+        return FastJsonResponse({'id': vid, 'status': 'pending'})
+    # Existing row (uq_org_user): flip it back to pending unless it already is
+    if execute_rowcount("UPDATE social_org_volunteers SET status='pending' WHERE org_id=%s AND user_id=%s AND status<>'pending'", [org_id, _user['id']]):
+        return FastJsonResponse({'ok': True, 'reapplied': True})
+    # Both writes missed: either already pending, or IGNORE swallowed the org foreign key
+    if not query("SELECT id FROM social_organizations WHERE id=%s", [org_id]):
+        return FastJsonResponse({'error':'not_found'}, status=404)
+    return FastJsonResponse({'ok': True, 'already': True, 'status': 'pending'})
 
 # ============================= CAMPAIGN: ADD VOLUNTEERS ==============================
 
 @api_view(require_auth=True, methods=['POST'], csrf=False)
 def campaigns_add_volunteers(request: HttpRequest, campaign_id: int, _user=None):
-    camp = query("SELECT owner_user_id,status FROM campaigns WHERE id=%s", [campaign_id])
-    if not camp:
-        return JsonResponse({'error':'not_found'}, status=404)
-    if camp['owner_user_id'] != _user['id']:
-        return JsonResponse({'error':'forbidden'}, status=403)
-    data = json.loads(request.body or '{}')
+    owner_id = _campaign_owner(campaign_id)
+    if owner_id is None:
+        return FastJsonResponse({'error':'not_found'}, status=404)
+    if owner_id != _user['id']:
+        return FastJsonResponse({'error':'forbidden'}, status=403)
+    data = _loads(request.body) if request.body else {}
     user_ids = data.get('user_ids') or []
     role_label_default = _limit_str(data.get('role_label','volunteer'), 50)
     if not isinstance(user_ids, list) or not user_ids:
-        return JsonResponse({'error':'missing_user_ids'}, status=400)
-    added = []
-    reactivated = []
+        return FastJsonResponse({'error':'missing_user_ids'}, status=400)
+    uids = []
     for uid in user_ids:
         try:
             uid_i = int(uid)
         except Exception:
             continue
-        existing = query("SELECT id,status FROM campaign_participants WHERE campaign_id=%s AND user_id=%s", [campaign_id, uid_i])
-        if existing:
-            if existing['status'] in ('withdrawn','rejected'):
-                execute("UPDATE campaign_participants SET status='accepted', role_label=COALESCE(role_label,%s) WHERE id=%s", [role_label_default, existing['id']])
-                reactivated.append(uid_i)
-            continue
-        try:
-            pid = execute("INSERT INTO campaign_participants(campaign_id,user_id,role_label,status) VALUES(%s,%s,%s,'accepted')", [campaign_id, uid_i, role_label_default])
-            added.append(pid)
-        except Exception:
-            continue
-    return JsonResponse({'ok': True, 'added_count': len(added), 'reactivated_count': len(reactivated)})
+        if uid_i not in uids:
+            uids.append(uid_i)
+    if not uids:
+        return FastJsonResponse({'ok': True, 'added_count': 0, 'reactivated_count': 0})
+    # Classify the whole batch in one query, then one UPDATE for reactivations and one batched
+    # INSERT for new volunteers (IGNORE skips races on uq_campaign_user and unknown users)
+    marks = _in_placeholders(len(uids))
+    existing = query(
+        f"SELECT id,user_id,status FROM campaign_participants WHERE campaign_id=%s AND user_id IN ({marks})",
+        [campaign_id, *uids], many=True
+    ) or []
+    reactivate_ids = [r['id'] for r in existing if r['status'] in ('withdrawn','rejected')]
+    known = {int(r['user_id']) for r in existing}
+    new_uids = [u for u in uids if u not in known]
+    reactivated = 0
+    if reactivate_ids:
+        reactivated = execute_rowcount(
+            f"UPDATE campaign_participants SET status='accepted', role_label=COALESCE(role_label,%s) WHERE id IN ({_in_placeholders(len(reactivate_ids))})",
+            [role_label_default, *reactivate_ids]
+        )
+    try:
+        added = execute_many(
+            "INSERT IGNORE INTO campaign_participants(campaign_id,user_id,role_label,status) VALUES(%s,%s,%s,'accepted')",
+            [(campaign_id, u, role_label_default) for u in new_uids]
+        )
+    except Exception:
+        added = 0
+    return FastJsonResponse({'ok': True, 'added_count': added, 'reactivated_count': reactivated})
 
 # ============================= CAMPAIGN FINANCE (DONATIONS/EXPENSES) ==============================
 
-def _ensure_campaign_finance_tables():
-    # No-op: final schema includes campaign_donations and campaign_expenses.
-    return None
+_CENT = Decimal('0.01')
+_MAX_AMOUNT = Decimal('9999999999.99')  # DECIMAL(12,2)
+
+def _parse_amount(raw):
+    """Parse a positive money amount as Decimal rounded to cents, or None if invalid."""
+    try:
+        amount = Decimal(str(raw)).quantize(_CENT, rounding=ROUND_HALF_UP)
+    except (InvalidOperation, ValueError, TypeError):
+        return None
+    if not amount.is_finite() or amount <= 0 or amount > _MAX_AMOUNT:
+        return None
+    return amount
 
 @api_view(require_auth=True, methods=['POST'], csrf=False)
 def campaign_add_donation(request: HttpRequest, campaign_id: int, _user=None):
-    _ensure_campaign_finance_tables()
     camp = query("SELECT owner_user_id,status,title FROM campaigns WHERE id=%s", [campaign_id])
     if not camp:
-        return JsonResponse({'error':'not_found'}, status=404)
+        return FastJsonResponse({'error':'not_found'}, status=404)
     if camp['status'] == 'cancelled':
-        return JsonResponse({'error':'not_accepting'}, status=400)
-    data = json.loads(request.body or '{}')
-    try:
-        amount = float(data.get('amount') or 0)
-    except Exception:
-        return JsonResponse({'error':'invalid_amount'}, status=400)
-    if amount <= 0:
-        return JsonResponse({'error':'invalid_amount'}, status=400)
+        return FastJsonResponse({'error':'not_accepting'}, status=400)
+    data = _loads(request.body) if request.body else {}
+    amount = _parse_amount(data.get('amount') or 0)
+    if amount is None:
+        return FastJsonResponse({'error':'invalid_amount'}, status=400)
     currency = _limit_str((data.get('currency') or 'BDT').upper(), 8)
     note = data.get('note')
     did = execute("INSERT INTO campaign_donations(campaign_id,donor_user_id,amount,currency,note) VALUES(%s,%s,%s,%s,%s)", [campaign_id, _user['id'], amount, currency, note])
     # Notify campaign owner about donation
-    try:
-        from .utils import _ensure_notifications_table
-        _ensure_notifications_table()
-    except Exception:
-        pass
-    try:
-        _notify(camp['owner_user_id'], 'campaign_donation', {
-            'campaign_id': campaign_id,
-            'campaign_title': camp.get('title'),
-            'donor_user_id': _user['id'],
-            'donor_name': _user.get('full_name') or _user.get('email'),
-            'amount': amount,
-            'currency': currency,
-            'note': note,
-            'donation_id': did,
-        })
-    except Exception:
-        pass
-    return JsonResponse({'id': did})
+    _notify_async(camp['owner_user_id'], 'campaign_donation', {
+        'campaign_id': campaign_id,
+        'campaign_title': camp.get('title'),
+        'donor_user_id': _user['id'],
+        'donor_name': _user.get('full_name') or _user.get('email'),
+        'amount': float(amount),
+        'currency': currency,
+        'note': note,
+        'donation_id': did,
+    })
+    return FastJsonResponse({'id': did})
 
 @api_view(methods=['GET'], csrf=False)
 def campaign_list_donations(request: HttpRequest, campaign_id: int, _user=None):
-    _ensure_campaign_finance_tables()
-    rows = query("SELECT id,donor_user_id,amount,currency,note,created_at FROM campaign_donations WHERE campaign_id=%s ORDER BY id DESC LIMIT 200", [campaign_id], many=True) or []
-    return JsonResponse({'results': rows})
+    from .utils import paginate
+    rows, meta = paginate(
+        request, "SELECT id,donor_user_id,amount,currency,note,created_at FROM campaign_donations WHERE campaign_id=%s", [campaign_id],
+        count_sql="SELECT COUNT(1) AS ct FROM campaign_donations WHERE campaign_id=%s",
+        default_size=_LIST_PAGE_SIZE, max_size=_LIST_PAGE_SIZE, order_fragment=' ORDER BY id DESC'
+    )
+    return FastJsonResponse({'results': rows, **meta})
 
 @api_view(require_auth=True, methods=['POST'], csrf=False)
 def campaign_add_expense(request: HttpRequest, campaign_id: int, _user=None):
-    _ensure_campaign_finance_tables()
-    camp = query("SELECT owner_user_id,status FROM campaigns WHERE id=%s", [campaign_id])
-    if not camp:
-        return JsonResponse({'error':'not_found'}, status=404)
-    if camp['owner_user_id'] != _user['id']:
-        return JsonResponse({'error':'forbidden'}, status=403)
-    data = json.loads(request.body or '{}')
-    try:
-        amount = float(data.get('amount') or 0)
-    except Exception:
-        return JsonResponse({'error':'invalid_amount'}, status=400)
-    if amount <= 0:
-        return JsonResponse({'error':'invalid_amount'}, status=400)
+    owner_id = _campaign_owner(campaign_id)
+    if owner_id is None:
+        return FastJsonResponse({'error':'not_found'}, status=404)
+    if owner_id != _user['id']:
+        return FastJsonResponse({'error':'forbidden'}, status=403)
+    data = _loads(request.body) if request.body else {}
+    amount = _parse_amount(data.get('amount') or 0)
+    if amount is None:
+        return FastJsonResponse({'error':'invalid_amount'}, status=400)
     currency = _limit_str((data.get('currency') or 'BDT').upper(), 8)
     category = _limit_str(data.get('category','') or None, 64) if data.get('category') else None
     description = data.get('description')
     try:
         eid = execute("INSERT INTO campaign_expenses(campaign_id,amount,currency,category,description,created_by_user_id) VALUES(%s,%s,%s,%s,%s,%s)", [campaign_id, amount, currency, category, description, _user['id']])
     except Exception as e:
-        return JsonResponse({'error':'insert_failed','detail': str(e)}, status=400)
-    return JsonResponse({'id': eid})
+        return FastJsonResponse({'error':'insert_failed','detail': str(e)}, status=400)
+    return FastJsonResponse({'id': eid})
 
 @api_view(methods=['GET'], csrf=False)
 def campaign_list_expenses(request: HttpRequest, campaign_id: int, _user=None):
-    _ensure_campaign_finance_tables()
     # Public listing (owner will see same; amounts are public for transparency)
-    rows = query("SELECT id,amount,currency,category,description,spent_at,created_by_user_id FROM campaign_expenses WHERE campaign_id=%s ORDER BY id DESC LIMIT 200", [campaign_id], many=True) or []
-    return JsonResponse({'results': rows})
+    from .utils import paginate
+    rows, meta = paginate(
+        request, "SELECT id,amount,currency,category,description,spent_at,created_by_user_id FROM campaign_expenses WHERE campaign_id=%s", [campaign_id],
+        count_sql="SELECT COUNT(1) AS ct FROM campaign_expenses WHERE campaign_id=%s",
+        default_size=_LIST_PAGE_SIZE, max_size=_LIST_PAGE_SIZE, order_fragment=' ORDER BY id DESC'
+    )
+    return FastJsonResponse({'results': rows, **meta})
 
 @api_view(methods=['GET'], csrf=False)
 def campaign_finance_summary(request: HttpRequest, campaign_id: int, _user=None):
-    _ensure_campaign_finance_tables()
-    tot_d = query("SELECT COALESCE(SUM(amount),0) AS s, COALESCE(MAX(currency),'BDT') AS currency FROM campaign_donations WHERE campaign_id=%s", [campaign_id]) or {'s': 0, 'currency': 'BDT'}
-    tot_e = query("SELECT COALESCE(SUM(amount),0) AS s, COALESCE(MAX(currency),'BDT') AS currency FROM campaign_expenses WHERE campaign_id=%s", [campaign_id]) or {'s': 0, 'currency': 'BDT'}
-    total_donations = float(tot_d.get('s') or 0)
-    total_expenses = float(tot_e.get('s') or 0)
-    return JsonResponse({
+    # Both aggregates in one round-trip
+    tot = query(
+        """
+        SELECT (SELECT COALESCE(SUM(amount),0) FROM campaign_donations WHERE campaign_id=%s) AS total_donations,
+               (SELECT COALESCE(SUM(amount),0) FROM campaign_expenses WHERE campaign_id=%s) AS total_expenses,
+               (SELECT COALESCE(MAX(currency),'BDT') FROM campaign_donations WHERE campaign_id=%s) AS currency
+        """,
+        [campaign_id] * 3
+    ) or {}
+    # SUM over DECIMAL columns comes back as Decimal: subtract exactly, convert for JSON
+    total_donations = Decimal(tot.get('total_donations') or 0)
+    total_expenses = Decimal(tot.get('total_expenses') or 0)
+    return FastJsonResponse({
         'campaign_id': campaign_id,
-        'total_donations': total_donations,
-        'total_expenses': total_expenses,
-        'balance': round(total_donations - total_expenses, 2),
-        'currency': tot_d.get('currency') or tot_e.get('currency') or 'BDT',
+        'total_donations': float(total_donations),
+        'total_expenses': float(total_expenses),
+        'balance': float(total_donations - total_expenses),
+        'currency': tot.get('currency') or 'BDT',
     })
 
 # ============================= PHASE 4: FIRE SERVICE DISPATCH ==============================
 
-FIRE_REQUEST_STATUSES = ('pending','assigned','resolved','cancelled')
+FIRE_REQUEST_STATUSES = frozenset(('pending','assigned','resolved','cancelled'))
 
 def _is_fire_service(user):
     """Return True if the user represents a fire service/department.
@@ -4836,6 +5184,106 @@ def _is_fire_service(user):
     role = str((user or {}).get('role') or '').lower()
     return role in ('fire_service', 'fire_department', 'fd')
 
+# Process-local LRU of owner user_id -> fire department id. fire_departments.user_id is
+# UNIQUE and departments are never re-owned, so a found id never goes stale; misses are
+# not cached, so a department created on another worker is seen on the next call.
+_FIRE_DEPT_FOR_USER = LRUCache(10000)
+
+def _my_fire_department_id(user_id: int):
+    """Return the id of the fire department owned by user_id, or None."""
+    dept_id = _FIRE_DEPT_FOR_USER.get(user_id)
+    if dept_id is not None:
+        return dept_id
+    dept_id = (query('SELECT id FROM fire_departments WHERE user_id=%s LIMIT 1', [user_id]) or {}).get('id')
+    if dept_id is None:
+        return None
+    _FIRE_DEPT_FOR_USER.put(user_id, dept_id)
+    return dept_id
+
+def _dept_points(rows):
+    """Geocoded department rows as (id, lat_rad, lng_rad, cos_lat) tuples for geo.nearest; unparsable rows are skipped."""
+    out = []
+    for d in rows:
+        try:
+            out.append((int(d['id']),) + geo.to_point(d['lat'], d['lng']))
+        except (TypeError, ValueError):
+            continue
+    return out
+
+# Geocoded departments as _dept_points tuples sorted by latitude (with the parallel
+# latitude list for bisect, and their names by id), reloaded at most every
+# _DEPT_POINTS_TTL seconds per process.
+# Every fire request POST and the mine=1 fallback read this; department create/update
+# drop it in this process, other workers pick the change up within the TTL.
+_DEPT_POINTS_CACHE = { 'ts': 0.0, 'rows': [], 'lats': [], 'names': {} }
+_DEPT_POINTS_TTL = 60
+_DEPT_POINTS_LOCK = threading.Lock()
+
+def _geocoded_departments():
+    now = time.time()
+    if now - _DEPT_POINTS_CACHE['ts'] < _DEPT_POINTS_TTL:
+        return _DEPT_POINTS_CACHE['rows'], _DEPT_POINTS_CACHE['lats']
+    with _DEPT_POINTS_LOCK:
+        if now - _DEPT_POINTS_CACHE['ts'] < _DEPT_POINTS_TTL:
+            return _DEPT_POINTS_CACHE['rows'], _DEPT_POINTS_CACHE['lats']
+        raw = query("SELECT id,name,lat,lng FROM fire_departments WHERE lat IS NOT NULL AND lng IS NOT NULL", many=True) or []
+        rows = _dept_points(raw)
+        rows.sort(key=lambda p: p[1])
+        lats = [p[1] for p in rows]
+        _DEPT_POINTS_CACHE['rows'] = rows
+        _DEPT_POINTS_CACHE['lats'] = lats
+        _DEPT_POINTS_CACHE['names'] = {int(d['id']): d.get('name') for d in raw}
+        _DEPT_POINTS_CACHE['ts'] = now
+        return rows, lats
+
+def _invalidate_geocoded_departments():
+    _DEPT_POINTS_CACHE['ts'] = 0.0
+
+def _geocoded_department_name(dept_id):
+    """Name of a cached geocoded department (call after a _geocoded_departments lookup)."""
+    return _DEPT_POINTS_CACHE['names'].get(dept_id)
+
+def _departments_in_box(min_lat, max_lat, min_lng, max_lng):
+    """Cached department points inside a lat/lng box given in degrees."""
+    rows, lats = _geocoded_departments()
+    lo_lng, hi_lng = math.radians(min_lng), math.radians(max_lng)
+    band = rows[bisect_left(lats, math.radians(min_lat)):bisect_right(lats, math.radians(max_lat))]
+    return [p for p in band if lo_lng <= p[2] <= hi_lng]
+
+def _nearest_geocoded_department(lat, lng, exclude=()):
+    """Nearest cached department to (lat, lng) as (department_id, distance_km), or (None, None).
+
+    Searches a latitude band around the point, widening it until the best match lies
+    closer than the band edge: anything outside a band of half-width b is at least b
+    away along the meridian, so the match is then also the global nearest.
+    """
+    rows, lats = _geocoded_departments()
+    lat_r = math.radians(float(lat))
+    band = math.radians(0.5)
+    while True:
+        lo, hi = bisect_left(lats, lat_r - band), bisect_right(lats, lat_r + band)
+        covers_all = lo == 0 and hi == len(rows)
+        found = geo.nearest(lat, lng, rows[lo:hi], exclude=exclude)
+        if covers_all or (found[0] is not None and found[1] <= geo.EARTH_RADIUS_KM * band):
+            return found
+        band *= 4
+
+def _department_recipients(dept_id):
+    """User ids of a department's owner (first) and staff, from one JOIN; [] if the department does not exist."""
+    rows = query(
+        "SELECT fd.user_id AS owner_user_id, s.user_id AS staff_user_id FROM fire_departments fd "
+        "LEFT JOIN fire_staff s ON s.department_id=fd.id WHERE fd.id=%s",
+        [dept_id], many=True
+    ) or []
+    if not rows:
+        return []
+    out = [int(rows[0]['owner_user_id'])]
+    for r in rows:
+        uid = r.get('staff_user_id')
+        if uid and int(uid) not in out:
+            out.append(int(uid))
+    return out
+
 @api_view(require_auth=True, methods=['POST'], csrf=False)
 def create_fire_department(request: HttpRequest, _user=None):
     """Create a fire department record (fire_service or admin).
@@ -4844,33 +5292,35 @@ def create_fire_department(request: HttpRequest, _user=None):
     For simplicity we treat the creating user as owning/representing the department.
     """
     if not (_is_fire_service(_user) or _require_admin(_user)):
-        return JsonResponse({'error':'forbidden'}, status=403)
-    data = json.loads(request.body or '{}')
+        return FastJsonResponse({'error':'forbidden'}, status=403)
+    data = _loads(request.body) if request.body else {}
     name = _limit_str(data.get('name','').strip(), 255)
     if not name:
-        return JsonResponse({'error':'missing_name'}, status=400)
+        return FastJsonResponse({'error':'missing_name'}, status=400)
     lat = data.get('lat')
     lng = data.get('lng')
     try:
         dept_id = execute("INSERT INTO fire_departments(user_id,name,lat,lng) VALUES(%s,%s,%s,%s)", [_user['id'], name, lat, lng])
     except Exception as e:
-        return JsonResponse({'error':'create_failed','detail':str(e)}, status=400)
-    return JsonResponse({'id': dept_id})
+        return FastJsonResponse({'error':'create_failed','detail':str(e)}, status=400)
+    if lat is not None and lng is not None:
+        _invalidate_geocoded_departments()
+    return FastJsonResponse({'id': dept_id})
 
 @api_view(require_auth=True, methods=['POST'], csrf=False)
 def update_fire_department(request: HttpRequest, department_id: int, _user=None):
     """Update fire department (owner or admin). Body may include name, lat, lng."""
     dept = query("SELECT id,user_id FROM fire_departments WHERE id=%s", [department_id])
     if not dept:
-        return JsonResponse({'error':'not_found'}, status=404)
+        return FastJsonResponse({'error':'not_found'}, status=404)
     if not (_require_admin(_user) or dept['user_id'] == _user['id']):
-        return JsonResponse({'error':'forbidden'}, status=403)
-    data = json.loads(request.body or '{}')
+        return FastJsonResponse({'error':'forbidden'}, status=403)
+    data = _loads(request.body) if request.body else {}
     sets=[]; params=[]
     if 'name' in data:
         name = _limit_str((data.get('name') or '').strip(), 255)
         if not name:
-            return JsonResponse({'error':'missing_name'}, status=400)
+            return FastJsonResponse({'error':'missing_name'}, status=400)
         sets.append('name=%s'); params.append(name)
     if 'lat' in data:
         sets.append('lat=%s'); params.append(data.get('lat'))
@@ -4879,24 +5329,32 @@ def update_fire_department(request: HttpRequest, department_id: int, _user=None)
     if sets:
         params.append(department_id)
         execute('UPDATE fire_departments SET '+','.join(sets)+' WHERE id=%s', params)
-    return JsonResponse({'ok': True})
+        if 'lat' in data or 'lng' in data or 'name' in data:
+            _invalidate_geocoded_departments()
+    return FastJsonResponse({'ok': True})
 
 @api_view(methods=['GET'], csrf=False)
 def list_fire_departments(request: HttpRequest, _user=None):
-    rows = query("SELECT id,user_id,name,lat,lng FROM fire_departments ORDER BY name ASC", [], many=True) or []
-    return JsonResponse({'results': rows})
+    rows, meta = _paginate_unless_unpaged(
+        request, "SELECT id,user_id,name,lat,lng FROM fire_departments", [],
+        "SELECT COUNT(1) AS ct FROM fire_departments", ' ORDER BY name ASC'
+    )
+    return FastJsonResponse({'results': rows, **meta})
 
 @api_view(methods=['GET','POST'], auth_methods=['POST'], csrf=False)
 def fire_requests(request: HttpRequest, _user=None):
     """GET: list fire service requests (public)
     POST: create a new fire service request (auth required)
-    Query params (GET): status
+    Query params (GET): status, page/page_size, or before_id (keyset; follow next_before_id)
     Body (POST): { description, lat?, lng? }
     """
     if request.method == 'GET':
         from .utils import paginate
         status_f = request.GET.get('status')
         show_all = request.GET.get('all') in ('1','true','yes')
+        # Query flags and role scoping, evaluated once for the filters, enrichment and response
+        mine = bool(_user) and request.GET.get('mine') in ('1','true','yes')
+        fire_scoped = bool(_user) and _is_fire_service(_user) and not show_all and request.GET.get('mine') not in ('1','true','yes')
         where = []; params=[]
         if status_f:
             where.append('fsr.status=%s'); params.append(status_f)
@@ -4907,12 +5365,12 @@ def fire_requests(request: HttpRequest, _user=None):
                     'LEFT JOIN fire_teams t ON t.id=fsr.assigned_team_id '
                     'LEFT JOIN fire_departments d ON d.id=fsr.assigned_department_id')
         # Filter to only my requests if mine=1
-        if request.GET.get('mine') in ('1','true','yes') and _user:
+        if mine:
             where.append('fsr.requester_id=%s'); params.append(_user['id'])
             # Exclude requests hidden by this user (per-user hide)
             where.append('NOT EXISTS (SELECT 1 FROM fire_request_user_hides h WHERE h.request_id=fsr.id AND h.user_id=%s)'); params.append(_user['id'])
         # Fire service scoping (only when not requesting all & not using mine filter)
-        if _user and _is_fire_service(_user) and not show_all and request.GET.get('mine') not in ('1','true','yes'):
+        if fire_scoped:
             dept = query('SELECT id,lat,lng FROM fire_departments WHERE user_id=%s LIMIT 1', [_user['id']])
             if dept:
                 dept_id = dept['id']
@@ -4927,25 +5385,37 @@ def fire_requests(request: HttpRequest, _user=None):
                     params.extend([dept_id, dept_id])
         if where:
             base += ' WHERE ' + ' AND '.join(where)
-        rows, meta = paginate(request, base, params, order_fragment=' ORDER BY fsr.created_at DESC')
+        before_id = request.GET.get('before_id')
+        if before_id:
+            # Keyset page: ids are assigned in creation order, so id<before_id ORDER BY id DESC
+            # walks the same order as created_at DESC by primary key, at any depth (no OFFSET scan)
+            try:
+                page_size = max(1, min(int(request.GET.get('page_size') or 20), 100))
+                before_id = int(before_id)
+            except (TypeError, ValueError):
+                return FastJsonResponse({'error': 'invalid_cursor'}, status=400)
+            base += (' AND ' if where else ' WHERE ') + 'fsr.id<%s'
+            rows = query(base + ' ORDER BY fsr.id DESC LIMIT %s', params + [before_id, page_size + 1], many=True) or []
+            has_next = len(rows) > page_size
+            rows = rows[:page_size]
+            meta = {'page_size': page_size, 'has_next': has_next, 'next_before_id': rows[-1]['id'] if has_next else None}
+        else:
+            rows, meta = paginate(request, base, params, order_fragment=' ORDER BY fsr.created_at DESC')
+            meta['next_before_id'] = rows[-1]['id'] if rows and meta.get('has_next') else None
         # If mine=1 augment each with candidate departments (names + status)
-        if request.GET.get('mine') in ('1','true','yes') and _user and rows:
+        if mine and rows:
             ids = [r['id'] for r in rows]
             try:
-                placeholders = ','.join(['%s']*len(ids))
+                placeholders = _in_placeholders(len(ids))
                 cand_rows = query(
                     'SELECT c.request_id,c.department_id,c.status,fd.name,fd.user_id AS owner_user_id FROM fire_request_candidates c JOIN fire_departments fd ON fd.id=c.department_id WHERE c.request_id IN ('+placeholders+')',
                     ids,
                     many=True
                 ) or []
-                by_req = {}
+                # The selected columns are exactly the exposed keys once request_id is taken off
+                by_req = defaultdict(list)
                 for c in cand_rows:
-                    by_req.setdefault(c['request_id'], []).append({
-                        'department_id': c['department_id'],
-                        'name': c['name'],
-                        'status': c['status'],
-                        'owner_user_id': c.get('owner_user_id'),
-                    })
+                    by_req[c.pop('request_id')].append(c)
                 for r in rows:
                     r['candidate_departments'] = by_req.get(r['id'], [])
             except Exception:
@@ -4954,76 +5424,39 @@ def fire_requests(request: HttpRequest, _user=None):
             # Lazy fallback: if a pending request has no candidates yet but has coordinates,
             # attempt on-demand nearest department selection (idempotent best-effort).
             try:
-                import math
                 needing = [r for r in rows if r.get('status') == 'pending' and not r.get('candidate_departments') and r.get('lat') is not None and r.get('lng') is not None]
                 if needing:
-                    # Preload geocoded departments once
-                    depts = query("SELECT id,lat,lng FROM fire_departments WHERE lat IS NOT NULL AND lng IS NOT NULL LIMIT 500", many=True) or []
-                    def hav(a_lat, a_lng, b_lat, b_lng):
-                        R = 6371.0
-                        dlat = math.radians(b_lat - a_lat); dlng = math.radians(b_lng - a_lng)
-                        alat = math.radians(a_lat); blat = math.radians(b_lat)
-                        h = math.sin(dlat/2)**2 + math.cos(alat)*math.cos(blat)*math.sin(dlng/2)**2
-                        return 2 * R * math.asin(math.sqrt(h))
+                    picks = []
                     for r in needing:
                         try:
-                            nearest=None; nearest_d=9999.0
-                            for dpt in depts:
-                                try:
-                                    dist = hav(float(r['lat']), float(r['lng']), float(dpt['lat']), float(dpt['lng']))
-                                except Exception:
-                                    continue
-                                if dist < nearest_d and dist <= 50.0: # 50 km radius
-                                    nearest_d = dist; nearest = dpt['id']
-                            # Fallback: if none within radius, pick absolute nearest overall
-                            if nearest is None and depts:
-                                try:
-                                    any_nearest = min(
-                                        (
-                                            (hav(float(r['lat']), float(r['lng']), float(dpt['lat']), float(dpt['lng'])), dpt['id'])
-                                            for dpt in depts
-                                        ),
-                                        key=lambda x: x[0]
-                                    )
-                                    nearest = any_nearest[1]
-                                except Exception:
-                                    nearest = None
-                            if nearest is not None:
-                                # Insert candidate if not exists
-                                try:
-                                    existing = query('SELECT id FROM fire_request_candidates WHERE request_id=%s AND department_id=%s', [r['id'], nearest])
-                                    if not existing:
-                                        execute('INSERT INTO fire_request_candidates(request_id, department_id, candidate_rank) VALUES(%s,%s,%s)', [r['id'], nearest, 1])
-                                        dept_name = query('SELECT name FROM fire_departments WHERE id=%s', [nearest])
-                                        r['candidate_departments'] = [{ 'department_id': nearest, 'name': (dept_name and dept_name.get('name')) or None, 'status': 'pending' }]
-                                except Exception:
-                                    pass
+                            nearest, _ = _nearest_geocoded_department(r['lat'], r['lng'])
                         except Exception:
                             continue
+                        if nearest is not None:
+                            picks.append((r, nearest))
+                    if picks:
+                        # One multi-row insert for every pick; uq_req_dept keeps it idempotent
+                        execute_many(
+                            'INSERT IGNORE INTO fire_request_candidates(request_id, department_id, candidate_rank) VALUES(%s,%s,%s)',
+                            [(r['id'], nearest, 1) for r, nearest in picks]
+                        )
+                        for r, nearest in picks:
+                            r['candidate_departments'] = [{ 'department_id': nearest, 'name': _geocoded_department_name(nearest), 'status': 'pending' }]
             except Exception:
                 pass
-        return JsonResponse({'results': rows, **meta, 'filtered': (_user and _is_fire_service(_user) and not show_all and request.GET.get('mine') not in ('1','true','yes'))})
+        return FastJsonResponse({'results': rows, **meta, 'filtered': fire_scoped})
     # POST path
     data = json.loads(request.body or '{}')
     description = _limit_str(data.get('description','').strip(), 2000)
     if not description:
-        return JsonResponse({'error':'missing_description'}, status=400)
+        return FastJsonResponse({'error':'missing_description'}, status=400)
     lat = data.get('lat'); lng = data.get('lng')
     # Fallback: if coordinates not provided, use user's last-known location
     try:
         if (lat is None or lng is None):
+            # Latest fix for this user only: a backward range scan on idx_userloc_user_time
             loc = query(
-                """
-                SELECT ul.lat, ul.lng
-                FROM user_locations ul
-                JOIN (
-                    SELECT user_id, MAX(captured_at) AS max_cap
-                    FROM user_locations
-                    GROUP BY user_id
-                ) latest ON latest.user_id = ul.user_id AND latest.max_cap = ul.captured_at
-                WHERE ul.user_id=%s
-                LIMIT 1
-                """,
+                "SELECT lat, lng FROM user_locations WHERE user_id=%s ORDER BY captured_at DESC LIMIT 1",
                 [_user['id']]
             )
             if loc:
@@ -5042,90 +5475,37 @@ def fire_requests(request: HttpRequest, _user=None):
         target_dept_id = data.get('target_department_id')
         if target_dept_id:
             try:
-                exists = query('SELECT id FROM fire_departments WHERE id=%s', [target_dept_id])
-                if exists:
-                    existing = query('SELECT id FROM fire_request_candidates WHERE request_id=%s AND department_id=%s', [rid, target_dept_id])
-                    if not existing:
-                        candidate_id = execute("INSERT INTO fire_request_candidates(request_id, department_id, candidate_rank) VALUES(%s,%s,%s)", [rid, int(target_dept_id), 1])
+                # Owner + staff in one query; an empty list means the department does not exist
+                recipients = _department_recipients(target_dept_id)
+                if recipients:
+                    # uq_req_dept: a repeat insert is a no-op (lastrowid 0) instead of a SELECT-then-INSERT race
+                    candidate_id = execute("INSERT IGNORE INTO fire_request_candidates(request_id, department_id, candidate_rank) VALUES(%s,%s,%s)", [rid, int(target_dept_id), 1]) or None
                     # notify owner + staff
-                    try:
-                        dept_user = query("SELECT user_id FROM fire_departments WHERE id=%s", [target_dept_id])
-                        if dept_user:
-                            _notify(dept_user['user_id'], 'fire_request_candidate', {'request_id': rid})
-                        try:
-                            staff_rows = query("SELECT user_id FROM fire_staff WHERE department_id=%s", [target_dept_id], many=True) or []
-                            for sr in staff_rows:
-                                try:
-                                    if sr.get('user_id') and int(sr['user_id']) != int(dept_user.get('user_id') or 0):
-                                        _notify(int(sr['user_id']), 'fire_request_candidate', {'request_id': rid})
-                                except Exception:
-                                    continue
-                        except Exception:
-                            pass
-                    except Exception:
-                        pass
+                    payload = {'request_id': rid}
+                    _notify_many((uid, 'fire_request_candidate', payload) for uid in recipients)
                     # Skip nearest generation if explicit target provided
                     raise StopIteration
             except StopIteration:
                 pass
         if lat is not None and lng is not None:
-            import math
-            RADIUS_KM = 50.0
             box_delta = 0.5
             min_lat = float(lat) - box_delta; max_lat = float(lat) + box_delta
             lng_delta = box_delta / max(math.cos(math.radians(float(lat))), 0.0001)
             min_lng = float(lng) - lng_delta; max_lng = float(lng) + lng_delta
-            departments = query(
-                "SELECT id,lat,lng FROM fire_departments WHERE lat IS NOT NULL AND lng IS NOT NULL AND lat BETWEEN %s AND %s AND lng BETWEEN %s AND %s LIMIT 300",
-                [min_lat, max_lat, min_lng, max_lng], many=True
-            ) or []
-            def hav(a_lat, a_lng, b_lat, b_lng):
-                R = 6371.0
-                dlat = math.radians(b_lat - a_lat)
-                dlng = math.radians(b_lng - a_lng)
-                alat = math.radians(a_lat); blat = math.radians(b_lat)
-                h = math.sin(dlat/2)**2 + math.cos(alat)*math.cos(blat)*math.sin(dlng/2)**2
-                return 2 * R * math.asin(math.sqrt(h))
-            nearest=None; nearest_d=9999
-            for dpt in departments:
-                try:
-                    dist = hav(float(lat), float(lng), float(dpt['lat']), float(dpt['lng']))
-                except Exception:
-                    continue
-                if dist < nearest_d and dist <= RADIUS_KM:
-                    nearest_d = dist; nearest = dpt['id']
-            # If no department found within radius, pick absolute nearest overall (global fallback)
-            if nearest is None and departments:
-                try:
-                    any_nearest = min(
-                        (
-                            (hav(float(lat), float(lng), float(dpt['lat']), float(dpt['lng'])), dpt['id'])
-                            for dpt in departments
-                        ),
-                        key=lambda x: x[0]
-                    )
-                    nearest = any_nearest[1]
-                except Exception:
-                    nearest = None
+            departments = _departments_in_box(min_lat, max_lat, min_lng, max_lng)
+            # Nearest in the box; within 50 km when one exists, else the closest found
+            nearest, _ = geo.nearest(lat, lng, departments)
             if nearest is not None:
-                candidate_id = execute("INSERT INTO fire_request_candidates(request_id, department_id, candidate_rank) VALUES(%s,%s,%s)", [rid, nearest, 1])
-                try:
-                    dept_user = query("SELECT user_id FROM fire_departments WHERE id=%s", [nearest])
-                    if dept_user:
-                        _notify(dept_user['user_id'], 'fire_request_candidate', {'request_id': rid})
-                    # notify staff as well
+                # lastrowid 0 when the nearest is the targeted department (already a candidate and notified)
+                new_id = execute("INSERT IGNORE INTO fire_request_candidates(request_id, department_id, candidate_rank) VALUES(%s,%s,%s)", [rid, nearest, 1])
+                if new_id:
+                    candidate_id = new_id
+                    # notify owner + staff
                     try:
-                        staff_rows = query("SELECT user_id FROM fire_staff WHERE department_id=%s", [nearest], many=True) or []
-                        for sr in staff_rows:
-                            try:
-                                if sr.get('user_id') and int(sr['user_id']) != int(dept_user.get('user_id') or 0):
-                                    _notify(int(sr['user_id']), 'fire_request_candidate', {'request_id': rid})
-                            except Exception:
-                                continue
+                        payload = {'request_id': rid}
+                        _notify_many((uid, 'fire_request_candidate', payload) for uid in _department_recipients(nearest))
                     except Exception:
                         pass
-                except Exception:
-                    pass
     except Exception:
         pass
     try:
@@ -5133,7 +5513,7 @@ def fire_requests(request: HttpRequest, _user=None):
         _notify(_user['id'], 'fire_request_created', payload)
     except Exception:
         pass
-    return JsonResponse({'id': rid, 'candidate_id': candidate_id})
+    return FastJsonResponse({'id': rid, 'candidate_id': candidate_id})
 
 @api_view(require_auth=True, methods=['POST'], csrf=False)
 def deploy_fire_request_team(request: HttpRequest, request_id: int, _user=None):
@@ -5147,29 +5527,29 @@ def deploy_fire_request_team(request: HttpRequest, request_id: int, _user=None):
       - Sets assigned_team_id.
     """
     if not _is_fire_service(_user):
-        return JsonResponse({'error':'forbidden'}, status=403)
+        return FastJsonResponse({'error':'forbidden'}, status=403)
     fr = query('SELECT id,assigned_department_id,status FROM fire_service_requests WHERE id=%s', [request_id])
     if not fr:
-        return JsonResponse({'error':'not_found'}, status=404)
+        return FastJsonResponse({'error':'not_found'}, status=404)
     data = json.loads(request.body or '{}')
     team_id = data.get('team_id')
     if not team_id:
-        return JsonResponse({'error':'missing_team_id'}, status=400)
+        return FastJsonResponse({'error':'missing_team_id'}, status=400)
     # Identify user's department
-    dept = query('SELECT id FROM fire_departments WHERE user_id=%s LIMIT 1', [_user['id']])
-    if not dept:
-        return JsonResponse({'error':'no_department'}, status=400)
-    team = query('SELECT id,department_id FROM fire_teams WHERE id=%s AND department_id=%s', [team_id, dept['id']])
+    dept_id = _my_fire_department_id(_user['id'])
+    if not dept_id:
+        return FastJsonResponse({'error':'no_department'}, status=400)
+    team = query('SELECT id,department_id FROM fire_teams WHERE id=%s AND department_id=%s', [team_id, dept_id])
     if not team:
-        return JsonResponse({'error':'team_not_found'}, status=404)
+        return FastJsonResponse({'error':'team_not_found'}, status=404)
     # assigned_team_id exists per final schema.
     # Check assignment compatibility
-    if fr['assigned_department_id'] and fr['assigned_department_id'] != dept['id']:
-        return JsonResponse({'error':'already_assigned_elsewhere'}, status=409)
+    if fr['assigned_department_id'] and fr['assigned_department_id'] != dept_id:
+        return FastJsonResponse({'error':'already_assigned_elsewhere'}, status=409)
     # Perform assignment
     # assigned_team_at exists per final schema.
     if not fr['assigned_department_id']:
-        execute("UPDATE fire_service_requests SET assigned_department_id=%s, assigned_team_id=%s, status='assigned', assigned_team_at=NOW() WHERE id=%s", [dept['id'], team_id, request_id])
+        execute("UPDATE fire_service_requests SET assigned_department_id=%s, assigned_team_id=%s, status='assigned', assigned_team_at=NOW() WHERE id=%s", [dept_id, team_id, request_id])
     else:
         # Preserve existing status; if not yet assigned mark assigned
         if fr['status'] != 'assigned':
@@ -5186,15 +5566,12 @@ def deploy_fire_request_team(request: HttpRequest, request_id: int, _user=None):
             """,
             [team_id], many=True
         ) or []
-        for m in members:
-            try:
-                if m.get('user_id'):
-                    _notify(int(m['user_id']), 'fire_team_deployed', {'request_id': request_id, 'team_id': team_id})
-            except Exception:
-                continue
+        member_ids = {int(m['user_id']) for m in members if m.get('user_id')}
+        payload = {'request_id': request_id, 'team_id': team_id}
+        _notify_many((uid, 'fire_team_deployed', payload) for uid in member_ids)
     except Exception:
         pass
-    return JsonResponse({'ok': True})
+    return FastJsonResponse({'ok': True})
 
 @api_view(require_auth=True, methods=['POST'], csrf=False)
 def assign_fire_request(request: HttpRequest, request_id: int, _user=None):
@@ -5203,24 +5580,24 @@ def assign_fire_request(request: HttpRequest, request_id: int, _user=None):
     Body: { department_id }
     """
     if not (_is_fire_service(_user) or _require_admin(_user)):
-        return JsonResponse({'error':'forbidden'}, status=403)
+        return FastJsonResponse({'error':'forbidden'}, status=403)
     fr = query("SELECT * FROM fire_service_requests WHERE id=%s", [request_id])
     if not fr:
-        return JsonResponse({'error':'not_found'}, status=404)
+        return FastJsonResponse({'error':'not_found'}, status=404)
     data = json.loads(request.body or '{}')
     dept_id = data.get('department_id')
     if not dept_id:
-        return JsonResponse({'error':'missing_department'}, status=400)
+        return FastJsonResponse({'error':'missing_department'}, status=400)
     dept = query("SELECT id FROM fire_departments WHERE id=%s", [dept_id])
     if not dept:
-        return JsonResponse({'error':'department_not_found'}, status=404)
+        return FastJsonResponse({'error':'department_not_found'}, status=404)
     # Update assignment
     execute("UPDATE fire_service_requests SET assigned_department_id=%s, status='assigned' WHERE id=%s", [dept_id, request_id])
     try:
         _notify(fr['requester_id'], 'fire_request_assigned', {'request_id': request_id, 'department_id': dept_id})
     except Exception:
         pass
-    return JsonResponse({'ok': True})
+    return FastJsonResponse({'ok': True})
 
 @api_view(require_auth=True, methods=['POST'], csrf=False)
 def complete_fire_request(request: HttpRequest, request_id: int, _user=None):
@@ -5229,17 +5606,17 @@ def complete_fire_request(request: HttpRequest, request_id: int, _user=None):
     Sets status='completed' and a completion timestamp.
     """
     if not _is_fire_service(_user):
-        return JsonResponse({'error':'forbidden'}, status=403)
+        return FastJsonResponse({'error':'forbidden'}, status=403)
     fr = query('SELECT id, assigned_department_id, status FROM fire_service_requests WHERE id=%s', [request_id])
     if not fr:
-        return JsonResponse({'error':'not_found'}, status=404)
-    dept = query('SELECT id FROM fire_departments WHERE user_id=%s LIMIT 1', [_user['id']])
-    if not dept:
-        return JsonResponse({'error':'no_department'}, status=400)
-    if fr['assigned_department_id'] != dept['id']:
-        return JsonResponse({'error':'not_owner'}, status=403)
+        return FastJsonResponse({'error':'not_found'}, status=404)
+    dept_id = _my_fire_department_id(_user['id'])
+    if not dept_id:
+        return FastJsonResponse({'error':'no_department'}, status=400)
+    if fr['assigned_department_id'] != dept_id:
+        return FastJsonResponse({'error':'not_owner'}, status=403)
     if fr['status'] == 'completed':
-        return JsonResponse({'ok': True, 'already': True})
+        return FastJsonResponse({'ok': True, 'already': True})
     # completed_at and 'completed' status are present per final schema.
     # Try setting completed; if DataError occurs again we fallback to resolved
     try:
@@ -5249,12 +5626,12 @@ def complete_fire_request(request: HttpRequest, request_id: int, _user=None):
         try:
             execute("UPDATE fire_service_requests SET status='resolved', completed_at=NOW() WHERE id=%s", [request_id])
         except Exception:
-            return JsonResponse({'error':'status_update_failed'}, status=500)
+            return FastJsonResponse({'error':'status_update_failed'}, status=500)
     try:
         _notify(_user['id'], 'fire_request_completed', {'request_id': request_id})
     except Exception:
         pass
-    return JsonResponse({'ok': True})
+    return FastJsonResponse({'ok': True})
 
 @api_view(require_auth=True, methods=['POST'], csrf=False)
 def cancel_fire_request(request: HttpRequest, request_id: int, _user=None):
@@ -5268,23 +5645,23 @@ def cancel_fire_request(request: HttpRequest, request_id: int, _user=None):
     """
     fr = query('SELECT id, requester_id, status, assigned_department_id, assigned_team_id FROM fire_service_requests WHERE id=%s', [request_id])
     if not fr:
-        return JsonResponse({'error':'not_found'}, status=404)
+        return FastJsonResponse({'error':'not_found'}, status=404)
     if not (_require_admin(_user) or (_user and fr['requester_id'] == _user['id'])):
-        return JsonResponse({'error':'forbidden'}, status=403)
+        return FastJsonResponse({'error':'forbidden'}, status=403)
     if fr['status'] == 'cancelled':
-        return JsonResponse({'ok': True, 'already': True})
+        return FastJsonResponse({'ok': True, 'already': True})
     # Disallow cancellation after assignment (department/team engaged)
     if fr.get('assigned_department_id') or fr.get('assigned_team_id') or fr['status'] not in ('pending',):
-        return JsonResponse({'error':'cannot_cancel_now'}, status=409)
+        return FastJsonResponse({'error':'cannot_cancel_now'}, status=409)
     try:
         execute("UPDATE fire_service_requests SET status='cancelled' WHERE id=%s", [request_id])
     except Exception:
-        return JsonResponse({'error':'update_failed'}, status=500)
+        return FastJsonResponse({'error':'update_failed'}, status=500)
     try:
         _notify(fr['requester_id'], 'fire_request_cancelled', {'request_id': request_id})
     except Exception:
         pass
-    return JsonResponse({'ok': True})
+    return FastJsonResponse({'ok': True})
 
 @api_view(require_auth=True, methods=['POST'], csrf=False)
 def hide_fire_request(request: HttpRequest, request_id: int, _user=None):
@@ -5296,9 +5673,9 @@ def hide_fire_request(request: HttpRequest, request_id: int, _user=None):
     """
     fr = query('SELECT id, requester_id FROM fire_service_requests WHERE id=%s', [request_id])
     if not fr:
-        return JsonResponse({'error': 'not_found'}, status=404)
+        return FastJsonResponse({'error': 'not_found'}, status=404)
     if not (_require_admin(_user) or (_user and fr['requester_id'] == _user['id'])):
-        return JsonResponse({'error': 'forbidden'}, status=403)
+        return FastJsonResponse({'error': 'forbidden'}, status=403)
     # fire_request_user_hides exists per final schema.
     # Insert ignore to be idempotent
     try:
@@ -5310,8 +5687,8 @@ def hide_fire_request(request: HttpRequest, request_id: int, _user=None):
             if not existing:
                 execute('INSERT INTO fire_request_user_hides(user_id, request_id) VALUES(%s,%s)', [_user['id'], request_id])
         except Exception:
-            return JsonResponse({'error': 'hide_failed'}, status=500)
-    return JsonResponse({'ok': True})
+            return FastJsonResponse({'error': 'hide_failed'}, status=500)
+    return FastJsonResponse({'ok': True})
 
 @api_view(require_auth=True, methods=['GET'], csrf=False)
 def fire_activities(request: HttpRequest, _user=None):
@@ -5336,27 +5713,29 @@ def fire_activities(request: HttpRequest, _user=None):
             dept_id = None
     # Owner path
     if dept_id is None and _is_fire_service(_user):
-        dept = query('SELECT id FROM fire_departments WHERE user_id=%s LIMIT 1', [_user['id']])
-        dept_id = dept and dept.get('id')
+        dept_id = _my_fire_department_id(_user['id'])
     # Staff path
     if dept_id is None:
         staff = query('SELECT department_id FROM fire_staff WHERE user_id=%s LIMIT 1', [_user['id']])
         dept_id = staff and staff.get('department_id')
     if not dept_id:
-        return JsonResponse({'results': [], 'items': [], 'current': [], 'past': []})
+        return FastJsonResponse({'results': [], 'items': [], 'current': [], 'past': []})
     # Columns exist per final schema.
     base = (
         "SELECT fsr.id, fsr.description, fsr.status, fsr.assigned_team_id, fsr.assigned_team_at, fsr.completed_at, fsr.created_at, "
-        " t.name AS team_name, t.status AS team_status, fd.name AS assigned_department_name, fsr.description AS location_text "
+        " t.name AS team_name, t.status AS team_status, fd.name AS assigned_department_name, fsr.description AS location_text, "
+        " fsr.status IN ('completed','withdrawn') AS is_past "
         "FROM fire_service_requests fsr "
         "LEFT JOIN fire_teams t ON t.id=fsr.assigned_team_id "
         "LEFT JOIN fire_departments fd ON fd.id=fsr.assigned_department_id "
         "WHERE fsr.assigned_department_id=%s ORDER BY fsr.id DESC"
     )
     rows = query(base, [dept_id], many=True) or []
-    current = [r for r in rows if str(r.get('status') or '').lower() not in ('completed','withdrawn')]
-    past = [r for r in rows if str(r.get('status') or '').lower() in ('completed','withdrawn')]
-    return JsonResponse({'results': rows, 'items': rows, 'current': current, 'past': past, 'department_id': dept_id})
+    # is_past is bucketed in SQL (status compares case-insensitively there); split in one pass
+    current = []; past = []
+    for r in rows:
+        (past if r.pop('is_past') else current).append(r)
+    return FastJsonResponse({'results': rows, 'items': rows, 'current': current, 'past': past, 'department_id': dept_id})
 
 @api_view(require_auth=True, methods=['POST'], csrf=False)
 def change_fire_request_status(request: HttpRequest, request_id: int, _user=None):
@@ -5368,27 +5747,27 @@ def change_fire_request_status(request: HttpRequest, request_id: int, _user=None
     """
     fr = query("SELECT * FROM fire_service_requests WHERE id=%s", [request_id])
     if not fr:
-        return JsonResponse({'error':'not_found'}, status=404)
+        return FastJsonResponse({'error':'not_found'}, status=404)
     # Only fire_service/admin or original requester (for cancellation) can modify
     data = json.loads(request.body or '{}')
     new_status = data.get('status')
     if new_status not in FIRE_REQUEST_STATUSES:
-        return JsonResponse({'error':'invalid_status'}, status=400)
+        return FastJsonResponse({'error':'invalid_status'}, status=400)
     if not (_is_fire_service(_user) or _require_admin(_user) or (new_status=='cancelled' and fr['requester_id']==_user['id'])):
-        return JsonResponse({'error':'forbidden'}, status=403)
+        return FastJsonResponse({'error':'forbidden'}, status=403)
     # Basic transition sanity
     if fr['status']=='resolved' or fr['status']=='cancelled':
-        return JsonResponse({'error':'immutable'}, status=400)
+        return FastJsonResponse({'error':'immutable'}, status=400)
     if fr['status']=='pending' and new_status not in ('assigned','cancelled'):
-        return JsonResponse({'error':'invalid_transition'}, status=400)
+        return FastJsonResponse({'error':'invalid_transition'}, status=400)
     if fr['status']=='assigned' and new_status not in ('resolved','cancelled'):
-        return JsonResponse({'error':'invalid_transition'}, status=400)
+        return FastJsonResponse({'error':'invalid_transition'}, status=400)
     execute("UPDATE fire_service_requests SET status=%s WHERE id=%s", [new_status, request_id])
     try:
         _notify(fr['requester_id'], 'fire_request_status', {'request_id': request_id, 'status': new_status})
     except Exception:
         pass
-    return JsonResponse({'ok': True})
+    return FastJsonResponse({'ok': True})
 
 @api_view(require_auth=True, methods=['POST'], csrf=False)
 def assign_fire_request_nearest(request: HttpRequest, request_id: int, _user=None):
@@ -5398,21 +5777,22 @@ def assign_fire_request_nearest(request: HttpRequest, request_id: int, _user=Non
     Rules:
       - Only fire_service or admin may invoke.
       - Skips if already assigned unless force=true.
-      - Uses same 50km radius + bounding box heuristic as creation auto-assignment.
+      - Uses same 50km radius + bounding box heuristic as creation auto-assignment,
+        falling back to the absolute nearest untried department outside the box.
     """
     if not (_is_fire_service(_user) or _require_admin(_user)):
-        return JsonResponse({'error':'forbidden'}, status=403)
+        return FastJsonResponse({'error':'forbidden'}, status=403)
     fr = query("SELECT * FROM fire_service_requests WHERE id=%s", [request_id])
     if not fr:
-        return JsonResponse({'error':'not_found'}, status=404)
+        return FastJsonResponse({'error':'not_found'}, status=404)
     data = json.loads(request.body or '{}')
     force = bool(data.get('force'))
     if fr.get('assigned_department_id') and not force:
-        return JsonResponse({'error':'already_assigned'}, status=400)
+        return FastJsonResponse({'error':'already_assigned'}, status=400)
     # If a pending candidate already exists and not forcing, no need to regenerate
     existing = query("SELECT id,status FROM fire_request_candidates WHERE request_id=%s AND status='pending'", [request_id])
     if existing and not force:
-        return JsonResponse({'candidate_id': existing['id'], 'status':'pending'})
+        return FastJsonResponse({'candidate_id': existing['id'], 'status':'pending'})
     # Determine coordinates to use
     lat = fr.get('lat'); lng = fr.get('lng')
     if lat is None or lng is None:
@@ -5430,92 +5810,61 @@ def assign_fire_request_nearest(request: HttpRequest, request_id: int, _user=Non
         # As a last resort, if columns exist on users, use them
         if (lat is None or lng is None):
             try:
-                col = query(
-                    """
-                    SELECT 1 AS ok FROM INFORMATION_SCHEMA.COLUMNS
-                    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME='users' AND COLUMN_NAME='last_lat'
-                    """
-                )
-                if col:
+                if _has_column('users', 'last_lat'):
                     req_user = query("SELECT last_lat,last_lng FROM users WHERE id=%s", [fr['requester_id']])
                     if req_user:
                         lat = req_user.get('last_lat'); lng = req_user.get('last_lng')
             except Exception:
                 pass
     if lat is None or lng is None:
-        return JsonResponse({'error':'no_coordinates'}, status=400)
+        return FastJsonResponse({'error':'no_coordinates'}, status=400)
     # Candidate search
-    import math
-    RADIUS_KM = 50.0
     box_delta = 0.5
     min_lat = float(lat) - box_delta; max_lat = float(lat) + box_delta
     lng_delta = box_delta / max(math.cos(math.radians(float(lat))), 0.0001)
     min_lng = float(lng) - lng_delta; max_lng = float(lng) + lng_delta
     # Exclude departments already tried for this request
     tried_ids = set(r['department_id'] for r in (query("SELECT department_id FROM fire_request_candidates WHERE request_id=%s", [request_id], many=True) or []))
-    candidates = query(
-        "SELECT id, lat, lng FROM fire_departments WHERE lat IS NOT NULL AND lng IS NOT NULL AND lat BETWEEN %s AND %s AND lng BETWEEN %s AND %s LIMIT 500",
-        [min_lat, max_lat, min_lng, max_lng], many=True
-    ) or []
-    def hav(a_lat, a_lng, b_lat, b_lng):
-        R = 6371.0
-        dlat = math.radians(b_lat - a_lat)
-        dlng = math.radians(b_lng - a_lng)
-        alat = math.radians(a_lat); blat = math.radians(b_lat)
-        h = math.sin(dlat/2)**2 + math.cos(alat)*math.cos(blat)*math.sin(dlng/2)**2
-        return 2 * R * math.asin(math.sqrt(h))
-    nearest = None; nearest_d = 9999
-    for c in candidates:
-        if c['id'] in tried_ids:
-            continue
-        try:
-            d = hav(float(lat), float(lng), float(c['lat']), float(c['lng']))
-        except Exception:
-            continue
-        if d < nearest_d and d <= RADIUS_KM:
-            nearest_d = d; nearest = c['id']
-    # Fallback to absolute nearest globally (excluding tried) if none in radius
-    if nearest is None and candidates:
-        try:
-            any_nearest = min(
-                (
-                    (hav(float(lat), float(lng), float(c['lat']), float(c['lng'])), c['id'])
-                    for c in candidates if c['id'] not in tried_ids
-                ),
-                key=lambda x: x[0]
-            )
-            nearest = any_nearest[1]
-            nearest_d = any_nearest[0]
-        except Exception:
-            nearest = None
+    candidates = _departments_in_box(min_lat, max_lat, min_lng, max_lng)
+    # Nearest untried department; within 50 km when one exists, else the closest found
+    nearest, nearest_d = geo.nearest(lat, lng, candidates, exclude=tried_ids)
     if nearest is None:
-        return JsonResponse({'error':'no_department_in_radius'}, status=404)
-    # Insert candidate (rank = count(existing)+1)
-    rank = (query("SELECT COUNT(1) AS c FROM fire_request_candidates WHERE request_id=%s", [request_id]) or {}).get('c',0) + 1
-    cid = execute("INSERT INTO fire_request_candidates(request_id, department_id, candidate_rank) VALUES(%s,%s,%s)", [request_id, nearest, rank])
+        # Nothing untried in the box: absolute nearest untried department anywhere,
+        # searched in the cached latitude index rather than a second department query
+        nearest, nearest_d = _nearest_geocoded_department(lat, lng, exclude=tried_ids)
+    if nearest is None:
+        return FastJsonResponse({'error':'no_department_in_radius'}, status=404)
+    # Insert candidate; rank = MAX(existing)+1 computed inside the INSERT so concurrent
+    # assigns cannot both read the same count and collide on one rank
+    cid = execute(
+        "INSERT INTO fire_request_candidates(request_id, department_id, candidate_rank) "
+        "SELECT %s, %s, COALESCE(MAX(candidate_rank),0)+1 FROM fire_request_candidates WHERE request_id=%s",
+        [request_id, nearest, request_id]
+    )
+    rank = (query("SELECT candidate_rank FROM fire_request_candidates WHERE id=%s", [cid]) or {}).get('candidate_rank')
     try:
         dept_user = query("SELECT user_id FROM fire_departments WHERE id=%s", [nearest])
         if dept_user:
             _notify(dept_user['user_id'], 'fire_request_candidate', {'request_id': request_id})
     except Exception:
         pass
-    return JsonResponse({'candidate_id': cid, 'rank': rank, 'distance_km': round(nearest_d,2)})
+    return FastJsonResponse({'candidate_id': cid, 'rank': rank, 'distance_km': round(nearest_d,2)})
 
 @api_view(require_auth=True, methods=['POST'], csrf=False)
 def fire_request_candidate_accept(request: HttpRequest, request_id: int, _user=None):
     if not (_is_fire_service(_user) or _require_admin(_user)):
-        return JsonResponse({'error':'forbidden'}, status=403)
+        return FastJsonResponse({'error':'forbidden'}, status=403)
     # Find pending candidate for this department's fire_department (if user is fire_service) or any if admin
-    dept = query("SELECT id FROM fire_departments WHERE user_id=%s", [_user['id']]) if _is_fire_service(_user) else None
-    if _is_fire_service(_user) and not dept:
-        return JsonResponse({'error':'no_department_context'}, status=400)
+    dept_id = _my_fire_department_id(_user['id']) if _is_fire_service(_user) else None
+    if _is_fire_service(_user) and not dept_id:
+        return FastJsonResponse({'error':'no_department_context'}, status=400)
     base_q = "SELECT c.* FROM fire_request_candidates c JOIN fire_service_requests r ON r.id=c.request_id WHERE c.request_id=%s AND c.status='pending'"
     params = [request_id]
-    if dept:
-        base_q += " AND c.department_id=%s"; params.append(dept['id'])
+    if dept_id:
+        base_q += " AND c.department_id=%s"; params.append(dept_id)
     cand = query(base_q, params)
     if not cand:
-        return JsonResponse({'error':'no_pending_candidate'}, status=404)
+        return FastJsonResponse({'error':'no_pending_candidate'}, status=404)
     # Accept: mark candidate and update request
     execute("UPDATE fire_request_candidates SET status='accepted' WHERE id=%s", [cand['id']])
     execute("UPDATE fire_service_requests SET assigned_department_id=%s, status='assigned' WHERE id=%s", [cand['department_id'], request_id])
@@ -5524,32 +5873,93 @@ def fire_request_candidate_accept(request: HttpRequest, request_id: int, _user=N
         _notify(fr['requester_id'], 'fire_request_assigned', {'request_id': request_id, 'department_id': cand['department_id']})
     except Exception:
         pass
-    return JsonResponse({'ok': True, 'assigned_department_id': cand['department_id']})
+    return FastJsonResponse({'ok': True, 'assigned_department_id': cand['department_id']})
 
 @api_view(require_auth=True, methods=['POST'], csrf=False)
 def fire_request_candidate_decline(request: HttpRequest, request_id: int, _user=None):
     if not (_is_fire_service(_user) or _require_admin(_user)):
-        return JsonResponse({'error':'forbidden'}, status=403)
-    dept = query("SELECT id FROM fire_departments WHERE user_id=%s", [_user['id']]) if _is_fire_service(_user) else None
-    if _is_fire_service(_user) and not dept:
-        return JsonResponse({'error':'no_department_context'}, status=400)
+        return FastJsonResponse({'error':'forbidden'}, status=403)
+    dept_id = _my_fire_department_id(_user['id']) if _is_fire_service(_user) else None
+    if _is_fire_service(_user) and not dept_id:
+        return FastJsonResponse({'error':'no_department_context'}, status=400)
     base_q = "SELECT c.* FROM fire_request_candidates c WHERE c.request_id=%s AND c.status='pending'"
     params=[request_id]
-    if dept:
-        base_q += " AND c.department_id=%s"; params.append(dept['id'])
+    if dept_id:
+        base_q += " AND c.department_id=%s"; params.append(dept_id)
     cand = query(base_q, params)
     if not cand:
-        return JsonResponse({'error':'no_pending_candidate'}, status=404)
+        return FastJsonResponse({'error':'no_pending_candidate'}, status=404)
     execute("UPDATE fire_request_candidates SET status='declined' WHERE id=%s", [cand['id']])
-    return JsonResponse({'ok': True})
+    return FastJsonResponse({'ok': True})
 
 # ---------------------------------------------------------------------------
 # Breadth-first Messaging (Feature 42 stub)
 # ---------------------------------------------------------------------------
 
+# Participants are only ever added, so a positive membership answer stays valid; misses
+# are not cached so a freshly created conversation is seen immediately.
+_PARTICIPANT_CACHE = LRUCache(20000)
+
 def _is_participant(conversation_id: int, user_id: int):
-    row = query("SELECT id FROM conversation_participants WHERE conversation_id=%s AND user_id=%s", [conversation_id, user_id])
-    return bool(row)
+    key = (int(conversation_id), int(user_id))
+    if _PARTICIPANT_CACHE.get(key):
+        return True
+    row = query("SELECT 1 AS ok FROM conversation_participants WHERE conversation_id=%s AND user_id=%s LIMIT 1", [conversation_id, user_id])
+    if not row:
+        return False
+    _PARTICIPANT_CACHE.put(key, True)
+    return True
+
+def _conversation_summaries(user_id: int, after_message_id=None, by_last_message=False):
+    """Up to 100 of the user's conversations with last message, partner and unread count.
+
+    One grouped pass over the user's messages yields both the last message id and the
+    unread count per conversation (instead of 4-6 correlated subqueries per row). The
+    partner is the lowest other participant id, so partner_name and partner_user_id
+    always describe the same user.
+    """
+    clause = ''
+    params = [user_id, user_id]
+    if after_message_id is not None:
+        clause = 'WHERE agg.last_message_id > %s'
+        params.append(after_message_id)
+    order = 'agg.last_message_id DESC' if by_last_message else 'COALESCE(lm.created_at, c.created_at) DESC'
+    return query(
+        f"""
+        WITH my AS (
+            SELECT conversation_id, last_read_message_id
+            FROM conversation_participants WHERE user_id=%s
+        ),
+        agg AS (
+            SELECT m.conversation_id, MAX(m.id) AS last_message_id,
+                   COUNT(CASE WHEN my.last_read_message_id IS NULL OR m.id > my.last_read_message_id THEN 1 END) AS unread_count
+            FROM messages m JOIN my ON my.conversation_id=m.conversation_id
+            GROUP BY m.conversation_id
+        ),
+        partner AS (
+            SELECT cp.conversation_id, MIN(cp.user_id) AS partner_user_id
+            FROM conversation_participants cp JOIN my ON my.conversation_id=cp.conversation_id
+            WHERE cp.user_id<>%s
+            GROUP BY cp.conversation_id
+        )
+        SELECT c.id, c.is_group, c.created_at,
+               agg.last_message_id,
+               lm.body AS last_message,
+               lm.created_at AS last_message_time,
+               u.full_name AS partner_name,
+               pt.partner_user_id,
+               COALESCE(agg.unread_count,0) AS unread_count
+        FROM my
+        JOIN conversations c ON c.id=my.conversation_id
+        LEFT JOIN agg ON agg.conversation_id=c.id
+        LEFT JOIN messages lm ON lm.id=agg.last_message_id
+        LEFT JOIN partner pt ON pt.conversation_id=c.id
+        LEFT JOIN users u ON u.id=pt.partner_user_id
+        {clause}
+        ORDER BY {order}
+        LIMIT 100
+        """, params, many=True
+    ) or []
 
 @api_view(require_auth=True, methods=['POST'], csrf=False)
 def create_conversation(request: HttpRequest, _user=None):
@@ -5576,29 +5986,8 @@ def create_conversation(request: HttpRequest, _user=None):
 
 @api_view(require_auth=True, methods=['GET'], csrf=False)
 def list_conversations(request: HttpRequest, _user=None):
-        rows = query(
-                """
-                SELECT c.id, c.is_group, c.created_at,
-                             (SELECT body FROM messages m WHERE m.conversation_id=c.id ORDER BY m.id DESC LIMIT 1) AS last_message,
-                             (SELECT created_at FROM messages m WHERE m.conversation_id=c.id ORDER BY m.id DESC LIMIT 1) AS last_message_time,
-                             (
-                                 SELECT u.full_name FROM conversation_participants cp2
-                                 JOIN users u ON u.id=cp2.user_id
-                                 WHERE cp2.conversation_id=c.id AND cp2.user_id <> %s
-                                 LIMIT 1
-                             ) AS partner_name,
-                             (
-                                 SELECT cp2.user_id FROM conversation_participants cp2
-                                 WHERE cp2.conversation_id=c.id AND cp2.user_id <> %s
-                                 LIMIT 1
-                             ) AS partner_user_id
-                FROM conversations c
-                JOIN conversation_participants p ON p.conversation_id=c.id AND p.user_id=%s
-                ORDER BY COALESCE(last_message_time, c.created_at) DESC
-                LIMIT 100
-                """, [_user['id'], _user['id'], _user['id']], many=True
-        ) or []
-        return JsonResponse({'items': rows})
+    rows = _conversation_summaries(_user['id'])
+    return JsonResponse({'items': rows})
 
 @api_view(require_auth=True, methods=['POST'], csrf=False)
 def send_message(request: HttpRequest, conversation_id: int, _user=None):
@@ -5612,8 +6001,8 @@ def send_message(request: HttpRequest, conversation_id: int, _user=None):
     # Notify other participants
     try:
         others = query("SELECT user_id FROM conversation_participants WHERE conversation_id=%s AND user_id<>%s", [conversation_id, _user['id']], many=True) or []
-        for o in others:
-            _notify(o['user_id'], 'message_new', {'conversation_id': conversation_id, 'message_id': mid})
+        payload = {'conversation_id': conversation_id, 'message_id': mid}
+        _notify_many((o['user_id'], 'message_new', payload) for o in others)
     except Exception:
         pass
     return JsonResponse({'id': mid})
@@ -5627,23 +6016,8 @@ def list_messages(request: HttpRequest, conversation_id: int, _user=None):
 
 @api_view(require_auth=True, methods=['GET'], csrf=False)
 def inbox(request: HttpRequest, _user=None):
-    # Include unread counts leveraging last_read_message_id (NULL => all messages unread until first read)
-    rows = query(
-        """
-        SELECT c.id,
-               c.is_group,
-               c.created_at,
-               (SELECT body FROM messages m WHERE m.conversation_id=c.id ORDER BY m.id DESC LIMIT 1) AS last_message,
-               (SELECT created_at FROM messages m WHERE m.conversation_id=c.id ORDER BY m.id DESC LIMIT 1) AS last_message_time,
-               (SELECT u.full_name FROM conversation_participants cp2 JOIN users u ON u.id=cp2.user_id WHERE cp2.conversation_id=c.id AND cp2.user_id <> %s LIMIT 1) AS partner_name,
-               (SELECT cp2.user_id FROM conversation_participants cp2 WHERE cp2.conversation_id=c.id AND cp2.user_id <> %s LIMIT 1) AS partner_user_id,
-               COALESCE((SELECT COUNT(1) FROM messages m3 WHERE m3.conversation_id=c.id AND (p.last_read_message_id IS NULL OR m3.id > p.last_read_message_id)),0) AS unread_count
-        FROM conversations c
-        JOIN conversation_participants p ON p.conversation_id=c.id AND p.user_id=%s
-        ORDER BY COALESCE(last_message_time, c.created_at) DESC
-        LIMIT 100
-        """, [_user['id'], _user['id'], _user['id']], many=True
-    ) or []
+    # Unread counts use last_read_message_id (NULL => all messages unread until first read)
+    rows = _conversation_summaries(_user['id'])
     total_unread = sum(int(r.get('unread_count') or 0) for r in rows)
     return JsonResponse({'items': rows, 'total_unread': total_unread})
 
@@ -5703,27 +6077,8 @@ def messages_since(request: HttpRequest, conversation_id: int, _user=None):
 @api_view(require_auth=True, methods=['GET'], csrf=False)
 def inbox_updates(request: HttpRequest, _user=None):
     after_message_id = request.GET.get('after_message_id')
-    clause = ''
-    params = [_user['id'], _user['id'], _user['id']]
-    if after_message_id and str(after_message_id).isdigit():
-        clause = 'AND (SELECT MAX(m.id) FROM messages m WHERE m.conversation_id=c.id) > %s'
-        params.append(int(after_message_id))
-    rows = query(
-        f"""
-        SELECT c.id,
-               (SELECT MAX(m.id) FROM messages m WHERE m.conversation_id=c.id) AS last_message_id,
-               (SELECT body FROM messages m2 WHERE m2.conversation_id=c.id ORDER BY m2.id DESC LIMIT 1) AS last_message,
-               (SELECT created_at FROM messages m2 WHERE m2.conversation_id=c.id ORDER BY m2.id DESC LIMIT 1) AS last_message_time,
-               (SELECT u.full_name FROM conversation_participants cp2 JOIN users u ON u.id=cp2.user_id WHERE cp2.conversation_id=c.id AND cp2.user_id<>%s LIMIT 1) AS partner_name,
-               (SELECT cp2.user_id FROM conversation_participants cp2 WHERE cp2.conversation_id=c.id AND cp2.user_id<>%s LIMIT 1) AS partner_user_id,
-               COALESCE((SELECT COUNT(1) FROM messages m3 WHERE m3.conversation_id=c.id AND (p.last_read_message_id IS NULL OR m3.id > p.last_read_message_id)),0) AS unread_count
-        FROM conversations c
-        JOIN conversation_participants p ON p.conversation_id=c.id AND p.user_id=%s
-        WHERE 1=1 {clause}
-        ORDER BY last_message_id DESC
-        LIMIT 100
-        """, params, many=True
-    ) or []
+    after = int(after_message_id) if after_message_id and str(after_message_id).isdigit() else None
+    rows = _conversation_summaries(_user['id'], after_message_id=after, by_last_message=True)
     total_unread = sum(int(r.get('unread_count') or 0) for r in rows)
     return JsonResponse({'items': rows, 'total_unread': total_unread})
 
@@ -5739,37 +6094,31 @@ def dashboard(request: HttpRequest, _user=None):
         _ensure_notifications_table()
     except Exception:
         pass
-    # Notifications (unread count)
-    notif_row = query("SELECT COUNT(1) AS c FROM notifications WHERE user_id=%s AND read_at IS NULL", [uid]) or {'c':0}
-    # Blood direct open (global)
-    bdr_row = query("SELECT COUNT(1) AS c FROM blood_direct_requests WHERE status='open'") or {'c':0}
-    # Messaging
-    conv_count = query("SELECT COUNT(DISTINCT conversation_id) AS c FROM conversation_participants WHERE user_id=%s", [uid]) or {'c':0}
-    msg_total = query("SELECT COUNT(1) AS c FROM messages m JOIN conversation_participants cp ON cp.conversation_id=m.conversation_id AND cp.user_id=%s", [uid]) or {'c':0}
     # Fire service related: if user is fire_service show pending candidates, else pending requests created by user
-    fire_role = _user.get('role') == 'fire_service'
-    if fire_role:
-        dept = query("SELECT id FROM fire_departments WHERE user_id=%s", [uid])
-        fire_pending = query("SELECT COUNT(1) AS c FROM fire_request_candidates c JOIN fire_departments d ON d.id=c.department_id WHERE d.user_id=%s AND c.status='pending'", [uid]) if dept else {'c':0}
+    if _user.get('role') == 'fire_service':
+        fire_sql = "SELECT COUNT(1) FROM fire_request_candidates c JOIN fire_departments d ON d.id=c.department_id WHERE d.user_id=%s AND c.status='pending'"
     else:
-        fire_pending = query("SELECT COUNT(1) AS c FROM fire_service_requests WHERE requester_id=%s AND status='pending'", [uid]) or {'c':0}
-    # Unread messages aggregate
-    unread_row = query("""
-        SELECT COALESCE(SUM(unread_part.cnt),0) AS c
-        FROM (
-            SELECT cp.conversation_id,
-                   (SELECT COUNT(1) FROM messages m WHERE m.conversation_id=cp.conversation_id AND (cp.last_read_message_id IS NULL OR m.id > cp.last_read_message_id)) AS cnt
-            FROM conversation_participants cp
-            WHERE cp.user_id=%s
-        ) unread_part
-    """, [uid]) or {'c':0}
+        fire_sql = "SELECT COUNT(1) FROM fire_service_requests WHERE requester_id=%s AND status='pending'"
+    # All six counters are independent: fetch them as scalar subqueries in one round-trip
+    row = query(
+        f"""
+        SELECT
+            (SELECT COUNT(1) FROM notifications WHERE user_id=%s AND read_at IS NULL) AS notifications_unread,
+            (SELECT COUNT(1) FROM blood_direct_requests WHERE status='open') AS blood_direct_open,
+            (SELECT COUNT(DISTINCT conversation_id) FROM conversation_participants WHERE user_id=%s) AS conversations,
+            (SELECT COUNT(1) FROM messages m JOIN conversation_participants cp ON cp.conversation_id=m.conversation_id AND cp.user_id=%s) AS messages_total,
+            (SELECT COUNT(1) FROM messages m JOIN conversation_participants cp ON cp.conversation_id=m.conversation_id AND cp.user_id=%s
+              WHERE cp.last_read_message_id IS NULL OR m.id > cp.last_read_message_id) AS messages_unread,
+            ({fire_sql}) AS fire_pending
+        """, [uid, uid, uid, uid, uid]
+    ) or {}
     return JsonResponse({
-        'notifications_unread': int(notif_row['c']),
-        'blood_direct_open': int(bdr_row['c']),
-        'conversations': int(conv_count['c']),
-        'messages_total': int(msg_total['c']),
-        'messages_unread': int(unread_row['c']),
-        'fire_pending': int(fire_pending['c']),
+        'notifications_unread': int(row.get('notifications_unread') or 0),
+        'blood_direct_open': int(row.get('blood_direct_open') or 0),
+        'conversations': int(row.get('conversations') or 0),
+        'messages_total': int(row.get('messages_total') or 0),
+        'messages_unread': int(row.get('messages_unread') or 0),
+        'fire_pending': int(row.get('fire_pending') or 0),
     })
 
 # ---------------------------------------------------------------------------
@@ -5810,10 +6159,10 @@ def conversation_mark_read(request: HttpRequest, conversation_id: int, _user=Non
 
 @api_view(require_auth=True, methods=['POST'], csrf=False)
 def add_campaign_location(request: HttpRequest, campaign_id: int, _user=None):
-    camp = query("SELECT owner_user_id FROM campaigns WHERE id=%s", [campaign_id])
-    if not camp:
+    owner_id = _campaign_owner(campaign_id)
+    if owner_id is None:
         return JsonResponse({'error':'campaign_not_found'}, status=404)
-    if camp['owner_user_id'] != _user['id']:
+    if owner_id != _user['id']:
         return JsonResponse({'error':'forbidden'}, status=403)
     data = json.loads(request.body or '{}')
     lat = data.get('lat'); lng = data.get('lng'); label = (data.get('label') or '')[:255] or None
@@ -6491,14 +6840,13 @@ def incident_social_deploy(request: HttpRequest, incident_id: int, _user=None):
             if uid in seen: continue
             seen.add(uid)
             selection.append(uid)
-        _ensure_social_org_volunteers_table()
-        # fetch accepted volunteers for this org
+            # fetch accepted volunteers for this org
         allowed = query("SELECT user_id, role_label, status FROM social_org_volunteers WHERE org_id=%s AND status IN ('accepted','active')", [org_id], many=True) or []
         allowed_ids = {int(r['user_id']): (r.get('role_label') or None) for r in allowed}
         allowed_selection = [uid for uid in selection if uid in allowed_ids]
         if allowed_selection:
             # Remove volunteers already active in this incident for this org
-            placeholders = ','.join(['%s'] * len(allowed_selection))
+            placeholders = _in_placeholders(len(allowed_selection))
             try:
                 rows = query(
                     "SELECT m.user_id FROM incident_social_deployment_members m "
@@ -6560,7 +6908,7 @@ def incident_social_deploy(request: HttpRequest, incident_id: int, _user=None):
         try:
             if volunteer_user_ids and filtered_selection:
                 names = query(
-                    'SELECT full_name AS n FROM users WHERE id IN (' + ','.join(['%s']*min(len(filtered_selection),3)) + ')',
+                    'SELECT full_name AS n FROM users WHERE id IN (' + _in_placeholders(min(len(filtered_selection),3)) + ')',
                     filtered_selection[:3], many=True) or []
                 nan = [r.get('n') for r in names if r.get('n')]
                 if nan:
@@ -6603,7 +6951,7 @@ def list_incident_social_deployments(request: HttpRequest, incident_id: int, _us
         _ensure_incident_social_deployment_members()
         ids = [int(r['id']) for r in rows]
         # Build a single query for all members
-        placeholders = ','.join(['%s'] * len(ids))
+        placeholders = _in_placeholders(len(ids))
         try:
             mrows = query(
                 "SELECT m.deployment_id, m.user_id, m.role_label, u.full_name, u.email, u.avatar_url FROM incident_social_deployment_members m LEFT JOIN users u ON u.id=m.user_id WHERE m.deployment_id IN ("+placeholders+")",
@@ -6801,9 +7149,6 @@ def _is_fire_service(user):
     role = str((user or {}).get('role') or '').lower()
     return role in ('fire_service', 'fire_department', 'fd')
 
-def _my_fire_department_id(user_id: int):
-    return (query('SELECT id FROM fire_departments WHERE user_id=%s LIMIT 1', [user_id]) or {}).get('id')
-
 @api_view(require_auth=True, methods=['GET'], csrf=False)
 def fire_teams_mine(request: HttpRequest, _user=None):
     """List fire teams relevant to the current user.
@@ -7056,13 +7401,7 @@ def geo_stats(request: HttpRequest, _user=None):
     users_with_lastloc = 0
     users_total = _count("SELECT id FROM users")
     try:
-        col = query(
-            """
-            SELECT 1 AS ok FROM INFORMATION_SCHEMA.COLUMNS
-            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME='users' AND COLUMN_NAME='last_lat'
-            """
-        )
-        if col:
+        if _has_column('users', 'last_lat'):
             users_lastloc_supported = True
             users_with_lastloc = _count("SELECT id FROM users WHERE last_lat IS NOT NULL AND last_lng IS NOT NULL")
     except Exception:
@@ -7815,13 +8154,7 @@ def crisis_victims_list(request: HttpRequest, crisis_id: int, _user=None):
     # Detect if users.last_lat/last_lng columns exist; avoid referencing them if absent
     users_lastloc_supported = False
     try:
-        col = query(
-            """
-            SELECT 1 AS ok FROM INFORMATION_SCHEMA.COLUMNS
-            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME='users' AND COLUMN_NAME='last_lat'
-            """
-        )
-        if col:
+        if _has_column('users', 'last_lat'):
             users_lastloc_supported = True
     except Exception:
         users_lastloc_supported = False
@@ -7954,17 +8287,13 @@ def crisis_potential_victims(request: HttpRequest, crisis_id: int, _user=None):
     except Exception:
         # If geo table missing or query fails, degrade gracefully
         rows = []
-    def hav(a_lat, a_lng, b_lat, b_lng):
-        R = 6371.0
-        dlat = math.radians(b_lat - a_lat)
-        dlng = math.radians(b_lng - a_lng)
-        alat = math.radians(a_lat); blat = math.radians(b_lat)
-        h = math.sin(dlat/2)**2 + math.cos(alat)*math.cos(blat)*math.sin(dlng/2)**2
-        return 2 * R * math.asin(math.sqrt(h))
+    origin = geo.to_point(lat, lng)
+    h_max = geo.radius_h(radius_km + 1e-6)
     results = []
     for r in rows:
-        d = hav(lat, lng, float(r['lat']), float(r['lng']))
-        if d <= radius_km + 1e-6:
+        h = geo.haversine_h(origin, geo.to_point(r['lat'], r['lng']))
+        if h <= h_max:
+            d = geo.h_to_km(h)
             item = {'user_id': r['user_id'], 'lat': float(r['lat']), 'lng': float(r['lng']), 'distance_km': round(d, 2)}
             if with_users:
                 if 'user_name' in r: item['user_name'] = r.get('user_name')
@@ -8031,21 +8360,17 @@ def crises_nearby(request: HttpRequest, _user=None):
         """,
         [min_lat, max_lat, min_lng, max_lng], many=True
     ) or []
-    # Haversine precise filter and sorting
-    def hav(a_lat, a_lng, b_lat, b_lng):
-        R = 6371.0
-        dlat = math.radians(b_lat - a_lat)
-        dlng = math.radians(b_lng - a_lng)
-        alat = math.radians(a_lat); blat = math.radians(b_lat)
-        h = math.sin(dlat/2)**2 + math.cos(alat)*math.cos(blat)*math.sin(dlng/2)**2
-        return 2 * R * math.asin(math.sqrt(h))
+    # Haversine precise filter and sorting; distance is only computed for rows inside the radius
+    origin = geo.to_point(lat, lng)
+    h_max = geo.radius_h(radius_km + 1e-6)
     out = []
     for r in rows:
         try:
-            d = hav(lat, lng, float(r['lat']), float(r['lng']))
+            h = geo.haversine_h(origin, geo.to_point(r['lat'], r['lng']))
         except Exception:
             continue
-        if d <= radius_km + 1e-6:
+        if h <= h_max:
+            d = geo.h_to_km(h)
             out.append({
                 'crisis_id': int(r['crisis_id']),
                 'incident_id': int(r['incident_id']),
@@ -8201,7 +8526,7 @@ def crisis_blood_inventory_summary(request: HttpRequest, crisis_id: int, _user=N
     Visibility: Admins or users who are participants of the incident linked to the crisis.
     Output: results: [ { bank_user_id, bank_name, bank_email, inventory: { 'A+': n, ... } } ]
     """
-    _ensure_crisis_tables(); _ensure_blood_bank_tables()
+    _ensure_crisis_tables()
     ok, err = _require_crisis_open(crisis_id)
     if not ok:
         return err
@@ -8238,7 +8563,7 @@ def crisis_blood_inventory_summary(request: HttpRequest, crisis_id: int, _user=N
     ids = [int(b['bank_user_id']) for b in banks if b and b.get('bank_user_id')]
     if not ids:
         return JsonResponse({'results': result})
-    placeholders = ",".join(["%s"] * len(ids))
+    placeholders = _in_placeholders(len(ids))
     inv_rows = query(
         f"SELECT bank_user_id,blood_type,quantity_units FROM blood_inventory WHERE bank_user_id IN ({placeholders})",
         ids, many=True
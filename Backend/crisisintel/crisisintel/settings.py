@@ -39,6 +39,10 @@ ALLOW_UNAUTH_DEBUG = (
 # Tie it to ALLOW_UNAUTH_DEBUG so a single env controls both behaviors.
 DEV_OPEN = ALLOW_UNAUTH_DEBUG
 
+# Notifications are written/pushed on a background thread pool (api.utils._notify_async).
+# Set CRISISINTEL_NOTIFY_SYNC=1 to deliver inline, which is easier to debug.
+NOTIFY_ASYNC = os.getenv('CRISISINTEL_NOTIFY_SYNC', '0').lower() not in ('1','true','yes')
+
 
 # Application definition
 
@@ -96,9 +100,21 @@ DATABASES = {
     'PASSWORD': '1234',
     'HOST': 'localhost',
     'PORT': '3306',
+    # Keep each worker thread's connection open across requests instead of reconnecting
+    # (TCP + auth handshake) per request; health checks drop connections the server closed.
+    'CONN_MAX_AGE': int(os.getenv('CRISISINTEL_DB_CONN_MAX_AGE', '60')),
+    'CONN_HEALTH_CHECKS': True,
     }
 }
 
+# Optional read replica; list endpoints send their reads here via api.db.READ_ALIAS.
+if os.getenv('CRISISINTEL_DB_REPLICA_HOST'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'HOST': os.getenv('CRISISINTEL_DB_REPLICA_HOST'),
+        'PORT': os.getenv('CRISISINTEL_DB_REPLICA_PORT', DATABASES['default']['PORT']),
+    }
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
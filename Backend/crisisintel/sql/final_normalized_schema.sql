@@ -111,8 +111,14 @@ CREATE TABLE IF NOT EXISTS notifications (
   is_read TINYINT(1) NOT NULL DEFAULT 0,
   read_at DATETIME NULL,
   created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+  -- payload.crisis_id of proximity alerts, exposed so update_location's de-dupe can seek an index
+  payload_crisis_id BIGINT UNSIGNED GENERATED ALWAYS AS (
+    CASE WHEN type = 'potential_victim_detected'
+         THEN CAST(JSON_UNQUOTE(JSON_EXTRACT(payload, '$.crisis_id')) AS UNSIGNED) END
+  ) VIRTUAL,
   FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
-  INDEX idx_notif_user_created (user_id, created_at)
+  INDEX idx_notif_user_created (user_id, created_at),
+  INDEX idx_notif_crisis (user_id, type, payload_crisis_id, is_read, created_at)
 ) ENGINE=InnoDB;
 
 -- Removed unused: chat_messages (replaced by conversations/messages)
@@ -275,7 +281,9 @@ CREATE TABLE IF NOT EXISTS donor_profiles (
   created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
   updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
   FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
-  INDEX idx_donor_blood_type (blood_type)
+  INDEX idx_donor_blood_type (blood_type),
+  -- Covers donor_profiles_search (blood_type filter, newest first, projected columns)
+  INDEX idx_donor_bt_updated (blood_type, updated_at, user_id, last_donation_date, availability_text)
 ) ENGINE=InnoDB;
 
 CREATE TABLE IF NOT EXISTS blood_requests (
@@ -302,7 +310,8 @@ CREATE TABLE IF NOT EXISTS blood_direct_requests (
   updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
   FOREIGN KEY (requester_user_id) REFERENCES users(id) ON DELETE CASCADE,
   INDEX idx_bdr_blood_status (target_blood_type, status),
-  INDEX idx_bdr_requester (requester_user_id, created_at)
+  INDEX idx_bdr_requester (requester_user_id, created_at),
+  INDEX idx_bdr_status_created (status, created_at)
 ) ENGINE=InnoDB;
 
 CREATE TABLE IF NOT EXISTS blood_direct_request_responses (
@@ -315,7 +324,9 @@ CREATE TABLE IF NOT EXISTS blood_direct_request_responses (
   UNIQUE KEY uq_request_donor (request_id, donor_user_id),
   FOREIGN KEY (request_id) REFERENCES blood_direct_requests(id) ON DELETE CASCADE,
   FOREIGN KEY (donor_user_id) REFERENCES users(id) ON DELETE CASCADE,
-  INDEX idx_bdr_resp_status (status, created_at)
+  INDEX idx_bdr_resp_status (status, created_at),
+  -- Declining the other pending responses of a request on accept
+  INDEX idx_bdrr_req_status (request_id, status)
 ) ENGINE=InnoDB;
 
 CREATE TABLE IF NOT EXISTS blood_donor_recruit_posts (
@@ -333,7 +344,9 @@ CREATE TABLE IF NOT EXISTS blood_donor_recruit_posts (
   FOREIGN KEY (blood_request_id) REFERENCES blood_requests(id) ON DELETE SET NULL,
     -- Adding missing column 'campaign_type'
     campaign_type VARCHAR(50) NULL,
-  INDEX idx_owner (owner_user_id)
+  INDEX idx_owner (owner_user_id),
+  INDEX idx_recruit_list (status, target_blood_type, created_at),
+  INDEX idx_recruit_owner_created (owner_user_id, created_at)
 ) ENGINE=InnoDB;
 
 CREATE TABLE IF NOT EXISTS blood_donor_applications (
@@ -345,6 +358,7 @@ CREATE TABLE IF NOT EXISTS blood_donor_applications (
   status VARCHAR(16) NOT NULL DEFAULT 'pending',
   created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
   UNIQUE KEY uq_post_donor (recruit_post_id, donor_user_id),
+  INDEX idx_app_donor_created (donor_user_id, created_at),
   FOREIGN KEY (recruit_post_id) REFERENCES blood_donor_recruit_posts(id) ON DELETE CASCADE,
   FOREIGN KEY (donor_user_id) REFERENCES users(id) ON DELETE CASCADE
 ) ENGINE=InnoDB;
@@ -435,6 +449,9 @@ CREATE TABLE IF NOT EXISTS blood_donor_meeting_requests (
   updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
   INDEX idx_donor (donor_user_id),
   INDEX idx_requester (requester_user_id),
+  INDEX idx_bdmr_donor_created (donor_user_id, created_at),
+  INDEX idx_bdmr_requester_created (requester_user_id, created_at),
+  INDEX idx_bdmr_donor_status_updated (donor_user_id, status, updated_at),
   FOREIGN KEY (donor_user_id) REFERENCES users(id) ON DELETE CASCADE,
   FOREIGN KEY (requester_user_id) REFERENCES users(id) ON DELETE CASCADE
 ) ENGINE=InnoDB;
@@ -567,6 +584,14 @@ SET @has_inc_idx := (
 SET @sql_inc_idx := IF(@has_inc_idx = 0, 'CREATE INDEX idx_incident_status ON incidents(status, opened_at)', 'SELECT 1');
 PREPARE stmt_inc FROM @sql_inc_idx; EXECUTE stmt_inc; DEALLOCATE PREPARE stmt_inc;
 
+-- Active-crisis proximity lookups: status filter plus a lat/lng box
+SET @has_inc_geo := (
+  SELECT COUNT(1) FROM INFORMATION_SCHEMA.STATISTICS
+  WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'incidents' AND INDEX_NAME = 'idx_incidents_status_latlng'
+);
+SET @sql_inc_geo := IF(@has_inc_geo = 0, 'CREATE INDEX idx_incidents_status_latlng ON incidents(status, lat, lng)', 'SELECT 1');
+PREPARE stmt_inc_geo FROM @sql_inc_geo; EXECUTE stmt_inc_geo; DEALLOCATE PREPARE stmt_inc_geo;
+
 CREATE TABLE IF NOT EXISTS incident_events (
   id BIGINT PRIMARY KEY AUTO_INCREMENT,
   incident_id BIGINT NOT NULL,
@@ -680,7 +705,9 @@ CREATE TABLE IF NOT EXISTS campaigns (
   created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
   updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
   FOREIGN KEY (owner_user_id) REFERENCES users(id) ON DELETE CASCADE,
-  INDEX idx_campaigns_start (starts_at)
+  INDEX idx_campaigns_start (starts_at),
+  INDEX idx_campaigns_owner_created (owner_user_id, created_at),
+  FULLTEXT INDEX ft_campaigns_title (title)
 ) ENGINE=InnoDB;
 
 CREATE TABLE IF NOT EXISTS campaign_participants (
@@ -691,6 +718,9 @@ CREATE TABLE IF NOT EXISTS campaign_participants (
   status VARCHAR(20) NOT NULL DEFAULT 'accepted',
   joined_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
   UNIQUE KEY uq_campaign_user (campaign_id, user_id),
+  INDEX idx_cp_campaign_joined (campaign_id, joined_at),
+  INDEX idx_cp_campaign_status (campaign_id, status),
+  INDEX idx_cp_user_joined (user_id, joined_at),
   FOREIGN KEY (campaign_id) REFERENCES campaigns(id) ON DELETE CASCADE,
   FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
 ) ENGINE=InnoDB;
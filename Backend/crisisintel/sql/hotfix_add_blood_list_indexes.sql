@@ -0,0 +1,47 @@
+-- Hotfix: composite indexes for blood list endpoints (filter columns + created_at ordering)
+-- so MySQL can walk the index for ORDER BY ... LIMIT instead of filesorting.
+-- Idempotent: each index is created only if its table exists and the index does not.
+
+USE crisisintel;
+
+-- list_recruit_posts: status/blood-type filter ordered by created_at
+SET @has_tbl := (SELECT COUNT(1) FROM INFORMATION_SCHEMA.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'blood_donor_recruit_posts');
+SET @has_idx := (SELECT COUNT(1) FROM INFORMATION_SCHEMA.STATISTICS WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'blood_donor_recruit_posts' AND INDEX_NAME = 'idx_recruit_list');
+SET @sql := IF(@has_tbl = 1 AND @has_idx = 0, 'CREATE INDEX idx_recruit_list ON blood_donor_recruit_posts(status, target_blood_type, created_at)', 'SELECT 1');
+PREPARE stmt1 FROM @sql; EXECUTE stmt1; DEALLOCATE PREPARE stmt1;
+
+-- list_recruit_posts?owner_user_id=...
+SET @has_tbl := (SELECT COUNT(1) FROM INFORMATION_SCHEMA.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'blood_donor_recruit_posts');
+SET @has_idx := (SELECT COUNT(1) FROM INFORMATION_SCHEMA.STATISTICS WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'blood_donor_recruit_posts' AND INDEX_NAME = 'idx_recruit_owner_created');
+SET @sql := IF(@has_tbl = 1 AND @has_idx = 0, 'CREATE INDEX idx_recruit_owner_created ON blood_donor_recruit_posts(owner_user_id, created_at)', 'SELECT 1');
+PREPARE stmt2 FROM @sql; EXECUTE stmt2; DEALLOCATE PREPARE stmt2;
+
+-- list_blood_direct_requests?status=...
+SET @has_tbl := (SELECT COUNT(1) FROM INFORMATION_SCHEMA.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'blood_direct_requests');
+SET @has_idx := (SELECT COUNT(1) FROM INFORMATION_SCHEMA.STATISTICS WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'blood_direct_requests' AND INDEX_NAME = 'idx_bdr_status_created');
+SET @sql := IF(@has_tbl = 1 AND @has_idx = 0, 'CREATE INDEX idx_bdr_status_created ON blood_direct_requests(status, created_at)', 'SELECT 1');
+PREPARE stmt3 FROM @sql; EXECUTE stmt3; DEALLOCATE PREPARE stmt3;
+
+-- my_applications
+SET @has_tbl := (SELECT COUNT(1) FROM INFORMATION_SCHEMA.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'blood_donor_applications');
+SET @has_idx := (SELECT COUNT(1) FROM INFORMATION_SCHEMA.STATISTICS WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'blood_donor_applications' AND INDEX_NAME = 'idx_app_donor_created');
+SET @sql := IF(@has_tbl = 1 AND @has_idx = 0, 'CREATE INDEX idx_app_donor_created ON blood_donor_applications(donor_user_id, created_at)', 'SELECT 1');
+PREPARE stmt4 FROM @sql; EXECUTE stmt4; DEALLOCATE PREPARE stmt4;
+
+-- list_donor_meeting_requests?donor_user_id=...
+SET @has_tbl := (SELECT COUNT(1) FROM INFORMATION_SCHEMA.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'blood_donor_meeting_requests');
+SET @has_idx := (SELECT COUNT(1) FROM INFORMATION_SCHEMA.STATISTICS WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'blood_donor_meeting_requests' AND INDEX_NAME = 'idx_bdmr_donor_created');
+SET @sql := IF(@has_tbl = 1 AND @has_idx = 0, 'CREATE INDEX idx_bdmr_donor_created ON blood_donor_meeting_requests(donor_user_id, created_at)', 'SELECT 1');
+PREPARE stmt5 FROM @sql; EXECUTE stmt5; DEALLOCATE PREPARE stmt5;
+
+-- list_donor_meeting_requests?requester_user_id=...
+SET @has_tbl := (SELECT COUNT(1) FROM INFORMATION_SCHEMA.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'blood_donor_meeting_requests');
+SET @has_idx := (SELECT COUNT(1) FROM INFORMATION_SCHEMA.STATISTICS WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'blood_donor_meeting_requests' AND INDEX_NAME = 'idx_bdmr_requester_created');
+SET @sql := IF(@has_tbl = 1 AND @has_idx = 0, 'CREATE INDEX idx_bdmr_requester_created ON blood_donor_meeting_requests(requester_user_id, created_at)', 'SELECT 1');
+PREPARE stmt6 FROM @sql; EXECUTE stmt6; DEALLOCATE PREPARE stmt6;
+
+-- donor cooldown lookup (latest completed request per donor)
+SET @has_tbl := (SELECT COUNT(1) FROM INFORMATION_SCHEMA.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'blood_donor_meeting_requests');
+SET @has_idx := (SELECT COUNT(1) FROM INFORMATION_SCHEMA.STATISTICS WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'blood_donor_meeting_requests' AND INDEX_NAME = 'idx_bdmr_donor_status_updated');
+SET @sql := IF(@has_tbl = 1 AND @has_idx = 0, 'CREATE INDEX idx_bdmr_donor_status_updated ON blood_donor_meeting_requests(donor_user_id, status, updated_at)', 'SELECT 1');
+PREPARE stmt7 FROM @sql; EXECUTE stmt7; DEALLOCATE PREPARE stmt7;
@@ -0,0 +1,19 @@
+-- Hotfix: composite indexes for campaign lookups
+--   idx_cp_campaign_status       campaign_participants(campaign_id, status): accepted-participant
+--                                listings/counts per campaign
+--   idx_campaigns_owner_created  campaigns(owner_user_id, created_at): my_campaigns
+--                                (WHERE owner_user_id=? ORDER BY created_at DESC)
+-- (campaign_id, user_id) lookups are already served by UNIQUE uq_campaign_user.
+-- Idempotent: each index is created only if the table exists and the index does not.
+
+USE crisisintel;
+
+SET @has_tbl := (SELECT COUNT(1) FROM INFORMATION_SCHEMA.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'campaign_participants');
+SET @has_idx := (SELECT COUNT(1) FROM INFORMATION_SCHEMA.STATISTICS WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'campaign_participants' AND INDEX_NAME = 'idx_cp_campaign_status');
+SET @sql := IF(@has_tbl = 1 AND @has_idx = 0, 'CREATE INDEX idx_cp_campaign_status ON campaign_participants(campaign_id, status)', 'SELECT 1');
+PREPARE stmt1 FROM @sql; EXECUTE stmt1; DEALLOCATE PREPARE stmt1;
+
+SET @has_tbl := (SELECT COUNT(1) FROM INFORMATION_SCHEMA.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'campaigns');
+SET @has_idx := (SELECT COUNT(1) FROM INFORMATION_SCHEMA.STATISTICS WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'campaigns' AND INDEX_NAME = 'idx_campaigns_owner_created');
+SET @sql := IF(@has_tbl = 1 AND @has_idx = 0, 'CREATE INDEX idx_campaigns_owner_created ON campaigns(owner_user_id, created_at)', 'SELECT 1');
+PREPARE stmt2 FROM @sql; EXECUTE stmt2; DEALLOCATE PREPARE stmt2;
@@ -0,0 +1,11 @@
+-- Hotfix: indexes for campaign_participants listings
+-- idx_cp_campaign_joined serves list_campaign_participants
+-- (WHERE campaign_id=? ORDER BY joined_at), read in index order without a filesort.
+-- Idempotent: each index is created only if the table exists and the index does not.
+
+USE crisisintel;
+
+SET @has_tbl := (SELECT COUNT(1) FROM INFORMATION_SCHEMA.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'campaign_participants');
+SET @has_idx := (SELECT COUNT(1) FROM INFORMATION_SCHEMA.STATISTICS WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'campaign_participants' AND INDEX_NAME = 'idx_cp_campaign_joined');
+SET @sql := IF(@has_tbl = 1 AND @has_idx = 0, 'CREATE INDEX idx_cp_campaign_joined ON campaign_participants(campaign_id, joined_at)', 'SELECT 1');
+PREPARE stmt1 FROM @sql; EXECUTE stmt1; DEALLOCATE PREPARE stmt1;
@@ -0,0 +1,12 @@
+-- Hotfix: per-user index for campaign_participants
+-- idx_cp_user_joined serves my_campaign_participations
+-- (WHERE user_id=? ORDER BY joined_at DESC), read backwards in index order without a filesort.
+-- It also covers the user_id foreign key, so InnoDB needs no separate index for it.
+-- Idempotent: the index is created only if the table exists and the index does not.
+
+USE crisisintel;
+
+SET @has_tbl := (SELECT COUNT(1) FROM INFORMATION_SCHEMA.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'campaign_participants');
+SET @has_idx := (SELECT COUNT(1) FROM INFORMATION_SCHEMA.STATISTICS WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'campaign_participants' AND INDEX_NAME = 'idx_cp_user_joined');
+SET @sql := IF(@has_tbl = 1 AND @has_idx = 0, 'CREATE INDEX idx_cp_user_joined ON campaign_participants(user_id, joined_at)', 'SELECT 1');
+PREPARE stmt1 FROM @sql; EXECUTE stmt1; DEALLOCATE PREPARE stmt1;
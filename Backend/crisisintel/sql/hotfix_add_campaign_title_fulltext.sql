@@ -0,0 +1,10 @@
+-- Hotfix: FULLTEXT index for list_campaigns title search (?q=). Word-prefix matching via
+-- MATCH(title) AGAINST('+term*' IN BOOLEAN MODE) replaces the unindexable LIKE '%q%' scan.
+-- Idempotent: the index is created only if the table exists and the index does not.
+
+USE crisisintel;
+
+SET @has_tbl := (SELECT COUNT(1) FROM INFORMATION_SCHEMA.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'campaigns');
+SET @has_idx := (SELECT COUNT(1) FROM INFORMATION_SCHEMA.STATISTICS WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'campaigns' AND INDEX_NAME = 'ft_campaigns_title');
+SET @sql := IF(@has_tbl = 1 AND @has_idx = 0, 'CREATE FULLTEXT INDEX ft_campaigns_title ON campaigns(title)', 'SELECT 1');
+PREPARE stmt1 FROM @sql; EXECUTE stmt1; DEALLOCATE PREPARE stmt1;
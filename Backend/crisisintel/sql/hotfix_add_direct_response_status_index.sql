@@ -0,0 +1,12 @@
+-- Hotfix: (request_id, status) index on blood_direct_request_responses so accepting a
+-- response can decline the request's other pending responses
+-- (WHERE request_id=? AND status='pending' AND id<>?) with an index seek
+-- instead of walking every response of the request through uq_request_donor.
+-- Idempotent: the index is created only if the table exists and the index does not.
+
+USE crisisintel;
+
+SET @has_tbl := (SELECT COUNT(1) FROM INFORMATION_SCHEMA.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'blood_direct_request_responses');
+SET @has_idx := (SELECT COUNT(1) FROM INFORMATION_SCHEMA.STATISTICS WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'blood_direct_request_responses' AND INDEX_NAME = 'idx_bdrr_req_status');
+SET @sql := IF(@has_tbl = 1 AND @has_idx = 0, 'CREATE INDEX idx_bdrr_req_status ON blood_direct_request_responses(request_id, status)', 'SELECT 1');
+PREPARE stmt1 FROM @sql; EXECUTE stmt1; DEALLOCATE PREPARE stmt1;
@@ -0,0 +1,12 @@
+-- Hotfix: covering index for donor_profiles_search
+-- (WHERE blood_type=? ORDER BY updated_at DESC LIMIT n, projecting user_id, blood_type,
+-- availability_text, last_donation_date). MySQL reads the index backwards and stops at n
+-- rows without a filesort or a visit to the clustered row.
+-- Idempotent: the index is created only if the table exists and the index does not.
+
+USE crisisintel;
+
+SET @has_tbl := (SELECT COUNT(1) FROM INFORMATION_SCHEMA.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'donor_profiles');
+SET @has_idx := (SELECT COUNT(1) FROM INFORMATION_SCHEMA.STATISTICS WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'donor_profiles' AND INDEX_NAME = 'idx_donor_bt_updated');
+SET @sql := IF(@has_tbl = 1 AND @has_idx = 0, 'CREATE INDEX idx_donor_bt_updated ON donor_profiles(blood_type, updated_at, user_id, last_donation_date, availability_text)', 'SELECT 1');
+PREPARE stmt1 FROM @sql; EXECUTE stmt1; DEALLOCATE PREPARE stmt1;
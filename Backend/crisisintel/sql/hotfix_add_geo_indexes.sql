@@ -0,0 +1,12 @@
+-- Hotfix: index backing the active-crisis proximity lookups (update_location, crises nearby).
+-- Those filter incidents by status IN ('open','monitoring') plus a lat/lng box; with
+-- (status, lat, lng) MySQL can range-scan instead of reading every incident.
+-- user_locations already carries idx_userloc_lat_lng / idx_userloc_user_time.
+-- Idempotent: the index is created only if the table exists and the index does not.
+
+USE crisisintel;
+
+SET @has_tbl := (SELECT COUNT(1) FROM INFORMATION_SCHEMA.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'incidents');
+SET @has_idx := (SELECT COUNT(1) FROM INFORMATION_SCHEMA.STATISTICS WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'incidents' AND INDEX_NAME = 'idx_incidents_status_latlng');
+SET @sql := IF(@has_tbl = 1 AND @has_idx = 0, 'CREATE INDEX idx_incidents_status_latlng ON incidents(status, lat, lng)', 'SELECT 1');
+PREPARE stmt1 FROM @sql; EXECUTE stmt1; DEALLOCATE PREPARE stmt1;
@@ -0,0 +1,18 @@
+-- Hotfix: make the update_location proximity-alert de-dupe sargable.
+-- Adds a VIRTUAL generated column with payload.crisis_id for 'potential_victim_detected'
+-- notifications plus an index that seeks on (user_id, type, payload_crisis_id, is_read, created_at)
+-- instead of evaluating JSON_EXTRACT over every notification of the user.
+-- Idempotent: each step runs only if the table exists and the column/index does not.
+
+USE crisisintel;
+
+SET @has_tbl := (SELECT COUNT(1) FROM INFORMATION_SCHEMA.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'notifications');
+SET @has_col := (SELECT COUNT(1) FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'notifications' AND COLUMN_NAME = 'payload_crisis_id');
+SET @sql := IF(@has_tbl = 1 AND @has_col = 0,
+  'ALTER TABLE notifications ADD COLUMN payload_crisis_id BIGINT UNSIGNED GENERATED ALWAYS AS (CASE WHEN type = ''potential_victim_detected'' THEN CAST(JSON_UNQUOTE(JSON_EXTRACT(payload, ''$.crisis_id'')) AS UNSIGNED) END) VIRTUAL',
+  'SELECT 1');
+PREPARE stmt1 FROM @sql; EXECUTE stmt1; DEALLOCATE PREPARE stmt1;
+
+SET @has_idx := (SELECT COUNT(1) FROM INFORMATION_SCHEMA.STATISTICS WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'notifications' AND INDEX_NAME = 'idx_notif_crisis');
+SET @sql := IF(@has_tbl = 1 AND @has_idx = 0, 'CREATE INDEX idx_notif_crisis ON notifications(user_id, type, payload_crisis_id, is_read, created_at)', 'SELECT 1');
+PREPARE stmt2 FROM @sql; EXECUTE stmt2; DEALLOCATE PREPARE stmt2;